@@ -1,4 +1,8 @@
+from datetime import timedelta
+
 from django.db import models
+from ydb_backend.models.constraints import YDBTTL
+from ydb_backend.models.constraints import YDBTableOptions
 
 
 class Person(models.Model):
@@ -136,3 +140,56 @@ class ModelWithIndexes(models.Model):
             f"{self.non_idx_first_field}"
             f"{self.non_idx_second_field}"
         )
+
+
+class PartitionedModel(models.Model):
+    key = models.IntegerField(primary_key=True)
+    value = models.TextField()
+
+    class Meta:
+        constraints = [
+            YDBTableOptions(
+                name="partitioned_settings",
+                auto_partitioning_by_load=True,
+                min_partitions_count=4,
+                partition_at_keys=[100, 200, 300],
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+class ColumnEvent(models.Model):
+    key = models.IntegerField(primary_key=True)
+    device = models.IntegerField(db_index=True)
+    value = models.FloatField()
+
+    class Meta:
+        constraints = [
+            YDBTableOptions(
+                name="column_event_store",
+                store="column",
+                partition_by=["key"],
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+class ExpiringToken(models.Model):
+    key = models.CharField(max_length=40, primary_key=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            YDBTTL(
+                name="token_ttl",
+                field="expires_at",
+                expire_after=timedelta(hours=1),
+            ),
+        ]
+
+    def __str__(self):
+        return self.key
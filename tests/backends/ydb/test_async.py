@@ -0,0 +1,142 @@
+"""
+Tests for the native async ORM path (ydb_backend.backend.aio).
+
+The async connection is replaced with a stand-in that records statements and
+returns canned rows, so these run without a database.
+"""
+from decimal import Decimal
+from unittest import mock
+
+from django.db import NotSupportedError
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend.backend import aio
+from ydb_backend.backend.base import DatabaseWrapper
+from ydb_backend.models.query import YDBQuerySet
+
+from type.models import DecimalPrecisionModel
+
+from ..models import Square
+
+
+class NativeAsyncTestCase(SimpleTestCase):
+    def setUp(self):
+        self.statements = []
+        self.rows = []
+        patcher = mock.patch.object(aio, "native_enabled", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(aio, "_fetch", side_effect=self._fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _fetch(self, alias, sql, params):
+        self.statements.append((alias, sql, params))
+        return self.rows.pop(0)
+
+    def squares(self):
+        return YDBQuerySet(Square)
+
+
+class TestNativeReads(NativeAsyncTestCase):
+    async def test_aget_runs_the_sync_statement(self):
+        self.rows = [[(7, 3, 9)]]
+        square = await self.squares().aget(root=3)
+        self.assertEqual((square.pk, square.root, square.square), (7, 3, 9))
+        self.assertEqual(square._state.db, "default")
+        ((alias, sql, params),) = self.statements
+        expected = (
+            self.squares().filter(root=3)[:21].query.get_compiler("default").as_sql()
+        )
+        self.assertEqual(alias, "default")
+        self.assertEqual((sql, params), expected)
+
+    async def test_aget_does_not_exist(self):
+        self.rows = [[]]
+        with self.assertRaises(Square.DoesNotExist):
+            await self.squares().aget(root=3)
+
+    async def test_async_for_and_aiterator(self):
+        self.rows = [[(1, 1, 1), (2, 2, 4)], [(3, 3, 9)]]
+        self.assertEqual(
+            [s.square async for s in self.squares().order_by("root")], [1, 4]
+        )
+        self.assertEqual(
+            [s.square async for s in self.squares().aiterator()], [9]
+        )
+
+    async def test_values_list(self):
+        self.rows = [[(1,), (2,)]]
+        roots = [
+            root async for root in self.squares().values_list("root", flat=True)
+        ]
+        self.assertEqual(roots, [1, 2])
+
+    async def test_acount_and_aexists(self):
+        self.rows = [[(5,)], [(1,)]]
+        self.assertEqual(await self.squares().acount(), 5)
+        self.assertTrue(await self.squares().filter(root=1).aexists())
+        self.assertIn("COUNT(*)", self.statements[0][1])
+
+    async def test_in_filter_is_executed_once(self):
+        self.rows = [[(7, 3, 9)]]
+        square = await self.squares().aget(root__in=[3, 4])
+        self.assertEqual(square.pk, 7)
+        self.assertEqual(len(self.statements), 1)
+
+    async def test_decimal_filter_is_executed_once(self):
+        self.rows = [[(1,)]]
+        models = YDBQuerySet(DecimalPrecisionModel)
+        self.assertTrue(await models.filter(wide=Decimal("1.50")).aexists())
+        self.assertEqual(len(self.statements), 1)
+
+    def test_statement_key_ignores_type_identity(self):
+        def compile_in():
+            query = self.squares().filter(root__in=[3, 4]).query
+            return query.get_compiler("default").as_sql()
+
+        self.assertEqual(
+            aio._statement_key(*compile_in()), aio._statement_key(*compile_in())
+        )
+
+    async def test_empty_result_needs_no_statement(self):
+        self.assertFalse(await self.squares().filter(pk__in=[]).aexists())
+        self.assertEqual(await self.squares().filter(pk__in=[]).acount(), 0)
+        self.assertEqual(self.statements, [])
+
+    async def test_writes_are_not_routed(self):
+        with self.assertRaises(NotSupportedError):
+            aio.execute_sql(mock.Mock(), "cursor")
+
+
+class TestFallback(SimpleTestCase):
+    async def test_disabled_alias_uses_sync_to_async(self):
+        sync_to_async = mock.Mock(return_value=mock.AsyncMock(return_value=3))
+        with mock.patch.object(aio, "sync_to_async", sync_to_async):
+            self.assertEqual(await YDBQuerySet(Square).acount(), 3)
+        sync_to_async.assert_called_once()
+
+    def test_option_not_forwarded(self):
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, "OPTIONS": {"async_native": True}}
+        )
+        self.assertNotIn("async_native", wrapper.get_connection_params())
+
+
+class NativeAsyncDatabaseTest(TransactionTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        Square.objects.bulk_create(Square(root=i, square=i * i) for i in range(5))
+
+    async def test_reads_through_the_async_connection(self):
+        with mock.patch.object(aio, "native_enabled", return_value=True):
+            try:
+                squares = YDBQuerySet(Square)
+                self.assertEqual(await squares.acount(), 5)
+                self.assertEqual((await squares.aget(root=3)).square, 9)
+                tail = squares.filter(root__gte=3).order_by("root")
+                self.assertEqual([s.root async for s in tail], [3, 4])
+            finally:
+                await aio.aclose_connections()
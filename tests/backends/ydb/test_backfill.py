@@ -0,0 +1,234 @@
+"""
+Tests for the backfill of a new column's default.
+
+The database is replaced with a stand-in that answers the backfill's
+statements, so these run without a server.
+"""
+from unittest import mock
+
+from django.db import NotSupportedError
+from django.db import connection
+from django.db.models import IntegerField
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend.models.sql.query import BatchUpdateQuery
+
+from ..models import MyModel
+
+_SCHEMA_LOGGER = "django_ydb_backend.ydb_backend.backend.schema"
+
+
+class _Table:
+    """``backends_mymodel`` with ``keys`` and the backfill checkpoint table."""
+
+    def __init__(self, keys, checkpoint=None, other_checkpoints=False):
+        self.keys = keys
+        self.checkpoint = checkpoint
+        self.other_checkpoints = other_checkpoints
+        self.statements = []
+
+    def cursor(self, name=None):
+        return _Cursor(self)
+
+
+class _Cursor:
+    def __init__(self, table):
+        self.table = table
+        self.description = None
+        self.rows = []
+        self.rowcount = -1
+
+    def execute_scheme(self, sql, params=None):
+        self.table.statements.append(sql)
+
+    def execute(self, sql, params=None):
+        self.table.statements.append(sql)
+        params = params or {}
+        self.rows = []
+        if sql.startswith("SELECT `last_key`"):
+            if self.table.checkpoint is not None:
+                self.rows = [self.table.checkpoint]
+        elif sql.startswith("SELECT 1 FROM `django_ydb_backfill`"):
+            if self.table.other_checkpoints:
+                self.rows = [(1,)]
+        elif sql.startswith("SELECT"):
+            lower = next((value for value, _ in params.values()), None)
+            keys = [key for key in self.table.keys if lower is None or key > lower]
+            offset = int(sql.rsplit("OFFSET ", 1)[1])
+            self.rows = [(key,) for key in keys[offset : offset + 1]]
+        elif sql.startswith("UPDATE"):
+            self.rows = [(1,)]
+        self.description = [("col",)] if self.rows else None
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchmany(self, size=1):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+def _field():
+    field = IntegerField(null=True, default=7)
+    field.set_attributes_from_name("rank")
+    field.model = MyModel
+    return field
+
+
+class BackfillTests(SimpleTestCase):
+    databases = {"default"}
+
+    def _add_field(self, table, **options):
+        describe = mock.Mock()
+        describe.columns = [mock.Mock()]
+        describe.columns[0].name = "rank"
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", table),
+            mock.patch.object(connection, "create_cursor", table.cursor),
+            mock.patch.object(connection, "get_describe", return_value=describe),
+            mock.patch.object(connection, "backfill_batch_size", 2),
+            *(
+                mock.patch.object(connection, name, value)
+                for name, value in options.items()
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        with (
+            self.assertLogs(_SCHEMA_LOGGER, level="INFO") as logs,
+            connection.schema_editor() as editor,
+        ):
+            editor.add_field(MyModel, _field())
+        return logs.output
+
+    def _updates(self, table):
+        return [sql for sql in table.statements if "UPDATE" in sql]
+
+    def test_batches_in_key_order(self):
+        table = _Table([1, 2, 3, 4, 5])
+        self._add_field(table)
+        updates = self._updates(table)
+        self.assertEqual(len(updates), 3)
+        self.assertIn("`backends_mymodel`.`id` <=", updates[0])
+        self.assertNotIn("`backends_mymodel`.`id` >", updates[0])
+        self.assertIn("`backends_mymodel`.`id` >", updates[2])
+        self.assertIn("`rank` IS NULL", updates[2])
+        self.assertTrue(
+            any(
+                "ALTER TABLE `backends_mymodel` ADD COLUMN `rank`" in sql
+                for sql in table.statements
+            )
+        )
+        checkpoints = [sql for sql in table.statements if sql.startswith("UPSERT")]
+        self.assertEqual(
+            [sql.rsplit(", ", 1)[1] for sql in checkpoints],
+            ["NULL);", "'2'u);", "'4'u);"],
+        )
+        self.assertTrue(table.statements[-3].startswith("DELETE FROM"))
+        self.assertEqual(table.statements[-1], "DROP TABLE `django_ydb_backfill`;")
+
+    def test_table_kept_for_other_backfills(self):
+        table = _Table([1, 2, 3], other_checkpoints=True)
+        self._add_field(table)
+        self.assertFalse(any("DROP TABLE" in sql for sql in table.statements))
+
+    def test_resume_after_checkpoint(self):
+        table = _Table([1, 2, 3, 4, 5], checkpoint=("4",))
+        logs = self._add_field(table)
+        self.assertIn("Resuming the backfill", logs[0])
+        # The column already exists: it is not added again.
+        self.assertFalse(any("ADD COLUMN" in sql for sql in table.statements))
+        self.assertEqual(len(self._updates(table)), 1)
+
+    def test_throttle(self):
+        table = _Table([1, 2, 3, 4, 5])
+        with mock.patch("ydb_backend.backend.schema.sleep") as sleep:
+            self._add_field(table, backfill_rows_per_second=1)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertGreater(sleep.call_args_list[-1].args[0], 3)
+
+    def test_batch_update(self):
+        table = _Table([1, 2, 3])
+        self._add_field(table, backfill_batch_update=True)
+        (update,) = self._updates(table)
+        self.assertTrue(update.startswith("BATCH UPDATE `backends_mymodel` SET"))
+        self.assertNotIn("RETURNING", update)
+
+    def test_batch_update_in_atomic(self):
+        table = _Table([1, 2, 3])
+        with (
+            mock.patch.object(connection, "in_atomic_block", True),
+            self.assertRaisesMessage(
+                NotSupportedError, 'OPTIONS["backfill_batch_update"]'
+            ),
+        ):
+            self._add_field(table, backfill_batch_update=True)
+        self.assertEqual(table.statements, [])
+
+
+class BackfillSQLTests(SimpleTestCase):
+    def test_collected_sql(self):
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.add_field(MyModel, _field())
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                "ALTER TABLE `backends_mymodel` ADD COLUMN `rank` "
+                "Optional<Int32>;",
+                "-- Run in batches of 5000 rows in primary key order.",
+                "UPDATE `backends_mymodel` SET `rank` = '7' WHERE `rank` IS NULL;",
+            ],
+        )
+
+    def test_collected_batch_update(self):
+        with (
+            mock.patch.object(connection, "backfill_batch_update", True),
+            connection.schema_editor(collect_sql=True) as editor,
+        ):
+            editor.add_field(MyModel, _field())
+        self.assertEqual(
+            editor.collected_sql[1:],
+            [
+                "BATCH UPDATE `backends_mymodel` SET `rank` = '7' "
+                "WHERE `rank` IS NULL;",
+            ],
+        )
+
+    def test_batch_update_outside_transactions(self):
+        with (
+            mock.patch.object(connection, "in_atomic_block", True),
+            self.assertRaises(NotSupportedError),
+        ):
+            query = BatchUpdateQuery(MyModel)
+            query.add_update_values({"name": "x"})
+            query.get_compiler("default").execute_sql()
+
+
+class BackfillDatabaseTests(TransactionTestCase):
+    databases = {"default"}
+
+    def test_existing_rows_get_the_default(self):
+        MyModel.objects.bulk_create(MyModel(id=i, name="n") for i in range(1, 6))
+        field = _field()
+        with (
+            mock.patch.object(connection, "backfill_batch_size", 2),
+            connection.schema_editor() as editor,
+        ):
+            editor.add_field(MyModel, field)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM `backends_mymodel` WHERE `rank` = 7;"
+                )
+                self.assertEqual(cursor.fetchone()[0], 5)
+        finally:
+            with connection.schema_editor() as editor:
+                editor.remove_field(MyModel, field)
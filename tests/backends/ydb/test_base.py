@@ -1,7 +1,11 @@
+import threading
 from types import SimpleNamespace
+from unittest import mock
 
+import ydb
 from django.core.exceptions import ImproperlyConfigured
 from django.db import connection
+from django.db.utils import DatabaseError
 from django.db.utils import NotSupportedError
 from django.test import SimpleTestCase
 from ydb_backend.backend import base
@@ -72,6 +76,24 @@ class TestConnectionParams(SimpleTestCase):
         self.assertEqual(params["credentials"], "token")
         self.assertEqual(params["root_certificates_path"], "/certs/ca.pem")
 
+    def test_statement_cache_size_not_forwarded(self):
+        params = self.params(
+            HOST="localhost",
+            PORT="2136",
+            DATABASE="/local",
+            OPTIONS={"statement_cache_size": 128},
+        )
+        self.assertNotIn("statement_cache_size", params)
+
+    def test_bulk_batch_bytes_not_forwarded(self):
+        params = self.params(
+            HOST="localhost",
+            PORT="2136",
+            DATABASE="/local",
+            OPTIONS={"bulk_batch_bytes": 1024},
+        )
+        self.assertNotIn("bulk_batch_bytes", params)
+
     def test_no_isolation_level_by_default(self):
         params = self.params(HOST="localhost", PORT="2136", DATABASE="/local")
         self.assertNotIn("isolation_level", params)
@@ -149,7 +171,9 @@ class TestNewConnectionIsolationLevel(SimpleTestCase):
         original_connect = base.Database.connect
         base.Database.connect = fake_connect
         try:
-            DatabaseWrapper.get_new_connection(SimpleNamespace(), conn_params)
+            DatabaseWrapper.get_new_connection(
+                SimpleNamespace(shared_pool=False), conn_params
+            )
         finally:
             base.Database.connect = original_connect
 
@@ -157,6 +181,134 @@ class TestNewConnectionIsolationLevel(SimpleTestCase):
         self.assertNotIn("isolation_level", recorded["connect_kwargs"])
 
 
+def _fake_connection(stopped=False, pool_stopped=False, endpoints=1):
+    should_stop = threading.Event()
+    if pool_stopped:
+        should_stop.set()
+    return SimpleNamespace(
+        _driver=SimpleNamespace(
+            _stopped=stopped, _store=SimpleNamespace(size=endpoints)
+        ),
+        _session_pool=SimpleNamespace(_should_stop=should_stop),
+    )
+
+
+class TestHealthCheck(SimpleTestCase):
+    def wrapper(self, ydb_connection, **options):
+        wrapper = DatabaseWrapper({**connection.settings_dict, "OPTIONS": options})
+        ydb_connection.cursor = mock.MagicMock()
+        wrapper.connection = ydb_connection
+        self.cursor = ydb_connection.cursor.return_value.__enter__.return_value
+        self.cursor.rowcount = 1
+        return wrapper
+
+    def test_decided_by_driver_state_without_a_query(self):
+        for ydb_connection, expected in (
+            (_fake_connection(), True),
+            (_fake_connection(stopped=True), False),
+            (_fake_connection(pool_stopped=True), False),
+        ):
+            wrapper = self.wrapper(ydb_connection)
+            self.assertIs(wrapper.is_usable(), expected)
+            ydb_connection.cursor.assert_not_called()
+
+    def test_probes_when_no_endpoint_is_known(self):
+        wrapper = self.wrapper(_fake_connection(endpoints=0))
+        self.assertTrue(wrapper.is_usable())
+        self.assertTrue(wrapper.is_usable())
+        self.assertEqual(self.cursor.execute.call_count, 2)
+
+    def test_passing_probe_is_cached_for_the_interval(self):
+        wrapper = self.wrapper(
+            _fake_connection(endpoints=0), health_check_interval=30
+        )
+        self.assertTrue(wrapper.is_usable())
+        self.assertTrue(wrapper.is_usable())
+        self.assertEqual(self.cursor.execute.call_count, 1)
+        # A stopped driver is noticed regardless of the cached probe.
+        wrapper.connection._driver._stopped = True
+        self.assertFalse(wrapper.is_usable())
+
+    def test_failed_probe(self):
+        wrapper = self.wrapper(_fake_connection(endpoints=0))
+        wrapper.connection.cursor.side_effect = DatabaseError("down")
+        self.assertFalse(wrapper.is_usable())
+
+    def test_probes_after_an_error(self):
+        # Neither the driver's state nor a cached probe vouches for a
+        # connection that has failed since.
+        wrapper = self.wrapper(_fake_connection(), health_check_interval=30)
+        wrapper.errors_occurred = True
+        self.assertTrue(wrapper.is_usable())
+        self.assertTrue(wrapper.is_usable())
+        self.assertEqual(self.cursor.execute.call_count, 2)
+        wrapper.errors_occurred = False
+        self.assertTrue(wrapper.is_usable())
+        self.assertEqual(self.cursor.execute.call_count, 2)
+
+    def test_probe_leaves_buffered_writes(self):
+        wrapper = self.wrapper(_fake_connection(endpoints=0))
+        wrapper._write_buffer = [("UPSERT INTO t (id) VALUES (1)", {})]
+        with mock.patch.object(wrapper, "flush_writes") as flush_writes:
+            self.assertTrue(wrapper.is_usable())
+        flush_writes.assert_not_called()
+        self.assertEqual(len(wrapper._write_buffer), 1)
+
+    def test_option_not_forwarded(self):
+        params = TestConnectionParams.params(
+            HOST="localhost",
+            PORT="2136",
+            DATABASE="/local",
+            OPTIONS={"health_check_interval": 5},
+        )
+        self.assertNotIn("health_check_interval", params)
+
+
+class TestPipeline(SimpleTestCase):
+    def wrapper(self, *result_sets):
+        wrapper = DatabaseWrapper(connection.settings_dict)
+        wrapper.connection = mock.MagicMock(table_path_prefix="", pyformat=False)
+        wrapper.connection._tx_context.execute.return_value = iter(result_sets)
+        wrapper.ensure_connection = mock.Mock()
+        return wrapper
+
+    @staticmethod
+    def result_set(index, *rows):
+        return ydb.convert.ResultSet([], list(rows), truncated=False, index=index)
+
+    def test_rows_of_each_statement(self):
+        wrapper = self.wrapper(
+            self.result_set(0, (1,)),
+            self.result_set(1, (2,)),
+            self.result_set(1, (3,)),
+            self.result_set(2),
+        )
+        rows = wrapper.execute_pipeline(
+            [
+                ("DELETE FROM a WHERE id = $element_1 RETURNING id", {"$element_1": 1}),
+                ("DELETE FROM b WHERE id = $element_1 RETURNING id", {"$element_1": 2}),
+                ("DELETE FROM c RETURNING id", ()),
+            ]
+        )
+        self.assertEqual(rows, [[(1,)], [(2,), (3,)], []])
+        (call,) = wrapper.connection._tx_context.execute.call_args_list
+        self.assertEqual(
+            call.kwargs["parameters"], {"$s0_element_1": 1, "$s1_element_1": 2}
+        )
+        self.assertIs(call.kwargs["commit_tx"], False)
+
+    def test_buffered_writes_go_first(self):
+        wrapper = self.wrapper(self.result_set(0, (1,)))
+        wrapper._write_buffer = [("INSERT INTO a (id) VALUES (1)", {})]
+        rows = wrapper.execute_pipeline([("SELECT 1", {})])
+        self.assertEqual(rows, [[(1,)]])
+        self.assertEqual(wrapper._write_buffer, [])
+        (call,) = wrapper.connection._tx_context.execute.call_args_list
+        self.assertEqual(
+            call.kwargs["query"], "INSERT INTO a (id) VALUES (1);\nSELECT 1;"
+        )
+
+
 class TestDatabaseVersion(SimpleTestCase):
     def test_parse_numeric_database_version(self):
         version = DatabaseWrapper._parse_database_version(b"23.4.11-ydb")
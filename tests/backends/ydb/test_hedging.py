@@ -0,0 +1,181 @@
+"""
+Tests for hedged reads.
+
+Sessions are replaced with stand-ins whose answers take a set time, so these
+run without a database.
+"""
+import threading
+import time
+from unittest import mock
+
+import ydb
+from django.db import connection
+from django.test import SimpleTestCase
+from ydb_backend.backend import hedging
+from ydb_backend.backend.base import DatabaseWrapper
+from ydb_dbapi import OperationalError
+
+from ..models import Square
+
+
+class _Stream:
+    """An answer that arrives after ``delay`` seconds unless cancelled."""
+
+    def __init__(self, delay, answer):
+        self.delay = delay
+        self.answer = answer
+        self.cancelled = threading.Event()
+
+    def __iter__(self):
+        if self.cancelled.wait(self.delay):
+            raise ydb.issues.Cancelled("cancelled")
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        yield self.answer
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class _Pool:
+    """
+    Hands each request the next stream, as a session of its own would, after
+    ``acquire_delay`` seconds of waiting for the session.
+    """
+
+    def __init__(self, *streams, acquire_delay=0):
+        self.streams = list(streams)
+        self.acquire_delay = acquire_delay
+        self.threads = []
+        self._lock = threading.Lock()
+
+    def retry_operation_sync(self, callee, retry_settings=None):
+        time.sleep(self.acquire_delay)
+        with self._lock:
+            stream = self.streams.pop(0)
+            self.threads.append(threading.current_thread())
+        session = mock.Mock()
+        session.transaction.return_value.execute.return_value = stream
+        return callee(session)
+
+
+def _cursor(pool, hedge_after=0.05):
+    cursor = hedging.HedgedCursor(
+        connection=mock.Mock(),
+        session_pool=pool,
+        tx_mode=ydb.QueryStaleReadOnly(),
+        request_settings=ydb.BaseRequestSettings(),
+        retry_settings=ydb.RetrySettings(),
+    )
+    cursor.hedge_after = hedge_after
+    cursor.stats = hedging.HedgeStats()
+    return cursor
+
+
+class HedgedCursorTests(SimpleTestCase):
+    def test_fast_read_is_not_hedged(self):
+        pool = _Pool(_Stream(0, "first"))
+        cursor = _cursor(pool)
+        self.assertEqual(cursor._execute_session_query("SELECT 1"), ["first"])
+        self.assertEqual((cursor.stats.reads, cursor.stats.hedged), (1, 0))
+
+    def test_first_request_runs_on_the_calling_thread(self):
+        pool = _Pool(_Stream(0, "first"))
+        with mock.patch.object(hedging, "_executor") as executor:
+            _cursor(pool)._execute_session_query("SELECT 1")
+        self.assertEqual(pool.threads, [threading.current_thread()])
+        executor.submit.assert_not_called()
+
+    def test_timer_starts_when_the_request_is_sent(self):
+        # Waiting for a session does not count toward hedge_after.
+        pool = _Pool(_Stream(0, "first"), acquire_delay=0.1)
+        cursor = _cursor(pool)
+        self.assertEqual(cursor._execute_session_query("SELECT 1"), ["first"])
+        self.assertEqual(cursor.stats.hedged, 0)
+
+    def test_slow_read_is_hedged_and_cancelled(self):
+        slow = _Stream(5, "first")
+        pool = _Pool(slow, _Stream(0, "hedge"))
+        cursor = _cursor(pool)
+        self.assertEqual(cursor._execute_session_query("SELECT 1"), ["hedge"])
+        self.assertTrue(slow.cancelled.is_set())
+        self.assertEqual(cursor.stats.hedge_rate, 1.0)
+        self.assertEqual(cursor.stats.win_rate, 1.0)
+
+    def test_first_answer_may_still_win(self):
+        hedge = _Stream(5, "hedge")
+        pool = _Pool(_Stream(0.1, "first"), hedge)
+        cursor = _cursor(pool)
+        self.assertEqual(cursor._execute_session_query("SELECT 1"), ["first"])
+        self.assertTrue(hedge.cancelled.is_set())
+        self.assertEqual((cursor.stats.hedged, cursor.stats.won), (1, 0))
+
+    def test_failed_request_leaves_the_answer_to_the_other(self):
+        pool = _Pool(
+            _Stream(0.1, ydb.issues.Unavailable("node down")), _Stream(0.2, "hedge")
+        )
+        cursor = _cursor(pool)
+        self.assertEqual(cursor._execute_session_query("SELECT 1"), ["hedge"])
+
+    def test_error_of_an_unhedged_read(self):
+        pool = _Pool(_Stream(0, ydb.issues.Unavailable("node down")))
+        with self.assertRaises(OperationalError):
+            _cursor(pool)._execute_session_query("SELECT 1")
+
+
+class HedgedReadsTests(SimpleTestCase):
+    """Which statements the compilers hedge."""
+
+    databases = {"default"}
+
+    def setUp(self):
+        self.hedging = []
+
+        def create_cursor(name=None):
+            self.hedging.append(connection._hedging)
+            cursor = mock.MagicMock(description=None)
+            cursor.fetchmany.return_value = []
+            cursor.fetchone.return_value = (0,)
+            return cursor
+
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", mock.MagicMock()),
+            mock.patch.object(connection, "create_cursor", create_cursor),
+            mock.patch.object(connection, "hedge_after", 0.05),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_selects_are_hedged(self):
+        list(Square.objects.filter(root=1))
+        Square.objects.filter(root=1).first()
+        Square.objects.count()
+        self.assertEqual(self.hedging, [True, True, True])
+        self.assertFalse(connection._hedging)
+
+    def test_writes_are_not_hedged(self):
+        Square.objects.filter(root=1).update(square=2)
+        self.assertEqual(self.hedging, [False])
+
+    def test_disabled_by_default(self):
+        with mock.patch.object(connection, "hedge_after", None):
+            list(Square.objects.all())
+        self.assertEqual(self.hedging, [False])
+
+
+class HedgeOptionTests(SimpleTestCase):
+    def test_option_not_forwarded(self):
+        wrapper = DatabaseWrapper(
+            {
+                "ENGINE": "ydb_backend.backend",
+                "HOST": "localhost",
+                "PORT": "2136",
+                "DATABASE": "/local",
+                "OPTIONS": {"hedge_after_ms": 20},
+            },
+            alias="hedged",
+        )
+        self.assertEqual(wrapper.hedge_after, 0.02)
+        self.assertIs(wrapper.hedge_stats, hedging.get_hedge_stats("hedged"))
+        self.assertNotIn("hedge_after_ms", wrapper.get_connection_params())
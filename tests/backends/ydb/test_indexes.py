@@ -1,8 +1,19 @@
+import threading
+import time
+from unittest import mock
+
+import ydb
 from django.db import connection
 from django.db import models
 from django.db.models import Index
 from django.test import SimpleTestCase
 from django.test import TransactionTestCase
+from ydb import _apis
+from ydb_backend.backend.base import _index_descriptions
+from ydb_backend.backend.introspection import IndexDescription
+from ydb_backend.models.indexes import YDBIndex
+
+_SCHEMA_LOGGER = "django_ydb_backend.ydb_backend.backend.schema"
 
 
 class IndexTestBook(models.Model):
@@ -94,6 +105,32 @@ class TestIndexSQLGeneration(SimpleTestCase):
             f" GLOBAL ON (`title`) COVER (`author`, `year`);",
         )
 
+    def test_async_index(self):
+        idx = YDBIndex(fields=["author"], name="t_async_idx", sync=False)
+        self.assertEqual(
+            self._sql(lambda ed: ed.add_index(IndexTestBook, idx)),
+            f"ALTER TABLE {_TABLE} ADD INDEX `t_async_idx`"
+            f" GLOBAL ASYNC ON (`author`);",
+        )
+
+    def test_async_covering_index(self):
+        idx = YDBIndex(
+            fields=["author"], name="t_async_cover_idx", sync=False, cover=["title"]
+        )
+        self.assertEqual(
+            self._sql(lambda ed: ed.add_index(IndexTestBook, idx)),
+            f"ALTER TABLE {_TABLE} ADD INDEX `t_async_cover_idx`"
+            f" GLOBAL ASYNC ON (`author`) COVER (`title`);",
+        )
+
+    def test_sync_ydb_index(self):
+        idx = YDBIndex(fields=["title"], name="t_sync_idx", cover=["year"])
+        self.assertEqual(
+            self._sql(lambda ed: ed.add_index(IndexTestBook, idx)),
+            f"ALTER TABLE {_TABLE} ADD INDEX `t_sync_idx`"
+            f" GLOBAL ON (`title`) COVER (`year`);",
+        )
+
     # --- RENAME INDEX ---
 
     def test_rename_index(self):
@@ -114,6 +151,139 @@ class TestIndexSQLGeneration(SimpleTestCase):
         )
 
 
+class TestYDBIndex(SimpleTestCase):
+    def test_deconstruct(self):
+        idx = YDBIndex(fields=["author"], name="i", sync=False, cover=["title"])
+        path, args, kwargs = idx.deconstruct()
+        self.assertEqual(path, "ydb_backend.models.indexes.YDBIndex")
+        self.assertEqual(
+            kwargs,
+            {"name": "i", "fields": ["author"], "cover": ("title",), "sync": False},
+        )
+        self.assertEqual(YDBIndex(*args, **kwargs), idx)
+        self.assertNotEqual(YDBIndex(fields=["author"], name="i"), idx)
+
+    def test_cover_or_include(self):
+        with self.assertRaises(ValueError):
+            YDBIndex(fields=["a"], name="i", cover=["b"], include=["c"])
+
+    def test_index_descriptions(self):
+        result = _apis.ydb_table.DescribeTableResult(
+            indexes=[
+                _apis.ydb_table.TableIndexDescription(
+                    name="i_sync", index_columns=["title"], global_index={}
+                ),
+                _apis.ydb_table.TableIndexDescription(
+                    name="i_async",
+                    index_columns=["author"],
+                    data_columns=["title", "year"],
+                    global_async_index={},
+                ),
+            ]
+        )
+        response = mock.Mock()
+        response.operation.status = ydb.StatusCode.SUCCESS
+        response.operation.result.Unpack.side_effect = lambda message: (
+            message.MergeFrom(result)
+        )
+        self.assertEqual(
+            _index_descriptions(None, response),
+            [
+                IndexDescription("i_sync", ["title"], "global", []),
+                IndexDescription("i_async", ["author"], "global_async", [
+                    "title",
+                    "year",
+                ]),
+            ],
+        )
+
+    def test_index_descriptions_without_sdk_internals(self):
+        index = ydb.TableIndex("i").with_index_columns("author")
+        driver_connection = mock.Mock(database="/local", table_path_prefix="")
+        driver_connection._driver.table_client = object()
+        driver_connection.describe.return_value.indexes = [index]
+        with (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", driver_connection),
+        ):
+            descriptions = connection.get_index_descriptions("t")
+        self.assertEqual(
+            descriptions, [IndexDescription("i", ["author"], "global", [])]
+        )
+
+    def test_introspection(self):
+        descriptions = [
+            IndexDescription("i_sync", ["title"], "global", []),
+            IndexDescription("i_async", ["author"], "global_async", [
+                "title",
+                "year",
+            ]),
+        ]
+        entry = mock.Mock(primary_key=[], ttl_settings=None)
+        with (
+            mock.patch.object(connection, "get_describe", return_value=entry),
+            mock.patch.object(
+                connection, "get_index_descriptions", return_value=descriptions
+            ),
+        ):
+            constraints = connection.introspection.get_constraints(None, "t")
+        self.assertEqual(
+            (constraints["i_sync"]["type"], constraints["i_sync"]["cover"]),
+            ("global", []),
+        )
+        self.assertEqual(
+            (constraints["i_async"]["type"], constraints["i_async"]["cover"]),
+            ("global_async", ["title", "year"]),
+        )
+
+    def test_add_index_polls_the_build(self):
+        index = ydb.TableIndex("i_poll").with_index_columns("author")
+        index.status = ydb.IndexStatus.BUILDING
+        driver_connection = mock.Mock(database="/local", table_path_prefix="")
+        describe_table = driver_connection._driver.table_client.describe_table
+        describe_table.return_value.indexes = [index]
+        idx = YDBIndex(fields=["author"], name="i_poll", sync=False)
+
+        def build(sql, params=()):
+            time.sleep(0.1)
+
+        with (
+            mock.patch.object(connection, "connection", driver_connection),
+            connection.schema_editor() as editor,
+            mock.patch.object(editor, "index_build_poll_interval", 0.01),
+            mock.patch.object(editor, "execute", side_effect=build),
+            self.assertLogs(_SCHEMA_LOGGER, level="INFO") as logs,
+        ):
+            editor.add_index(IndexTestBook, idx)
+        describe_table.assert_called_with("/local/ydb_idx_test_book", settings=mock.ANY)
+        self.assertEqual(describe_table.call_args.kwargs["settings"].timeout, 10)
+        self.assertIn("'i_poll' on 'ydb_idx_test_book': building", logs.output[0])
+        self.assertIn("built in", logs.output[-1])
+
+    def test_hanging_poll_does_not_block_add_index(self):
+        hang = threading.Event()
+        self.addCleanup(hang.set)
+        driver_connection = mock.Mock(database="/local", table_path_prefix="")
+        describe_table = driver_connection._driver.table_client.describe_table
+        describe_table.side_effect = lambda *args, **kwargs: hang.wait()
+        idx = YDBIndex(fields=["author"], name="i_hang", sync=False)
+
+        def build(sql, params=()):
+            time.sleep(0.05)
+
+        started = time.monotonic()
+        with (
+            mock.patch.object(connection, "connection", driver_connection),
+            connection.schema_editor() as editor,
+            mock.patch.object(editor, "index_build_poll_interval", 0.01),
+            mock.patch.object(editor, "index_build_poll_timeout", 0.1),
+            mock.patch.object(editor, "execute", side_effect=build),
+        ):
+            editor.add_index(IndexTestBook, idx)
+        describe_table.assert_called()
+        self.assertLess(time.monotonic() - started, 1)
+
+
 # ---------------------------------------------------------------------------
 # Integration tests (require live YDB)
 # ---------------------------------------------------------------------------
@@ -197,6 +367,16 @@ class TestIndexIntegration(TransactionTestCase):
         self._add_index(idx)
         self.assertIn("i_cover_idx", self._get_indexes())
 
+    def test_async_covering_index_round_trips(self):
+        idx = YDBIndex(
+            fields=["author"], name="i_async_idx", sync=False, cover=["title"]
+        )
+        self._add_index(idx)
+        index = self._get_indexes()["i_async_idx"]
+        self.assertEqual(index["type"], "global_async")
+        self.assertEqual(index["columns"], ["author"])
+        self.assertEqual(index["cover"], ["title"])
+
     def test_create_multiple_indexes_all_appear(self):
         self._add_index(Index(fields=["title"], name="i_multi_title"))
         self._add_index(Index(fields=["author"], name="i_multi_author"))
@@ -0,0 +1,150 @@
+"""
+Tests for the process-wide shared driver and session pool.
+
+Driver start-up is replaced with stand-ins, so these run without a database.
+"""
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase
+from ydb_backend.backend import base
+from ydb_backend.backend import pool
+from ydb_backend.backend.base import DatabaseWrapper
+from ydb_dbapi import IsolationLevel
+
+PARAMS = {"host": "localhost", "port": "2136", "database": "/local"}
+
+
+def _fake_start(driver_params, size):
+    return mock.Mock(name="driver"), mock.Mock(name="pool")
+
+
+class SharedPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(pool, "_start", side_effect=_fake_start)
+        self.start = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(pool._pools.clear)
+
+
+class TestRegistry(SharedPoolTestCase):
+    def test_same_settings_share_one_driver(self):
+        key, first = pool.acquire(dict(PARAMS))
+        other_key, second = pool.acquire(dict(PARAMS))
+        self.assertEqual(key, other_key)
+        self.assertIs(first, second)
+        self.assertEqual(self.start.call_count, 1)
+
+    def test_different_settings_get_their_own_driver(self):
+        _, first = pool.acquire(dict(PARAMS))
+        _, second = pool.acquire({**PARAMS, "database": "/other"})
+        _, third = pool.acquire({**PARAMS, "credentials": {"token": "t"}})
+        _, fourth = pool.acquire(dict(PARAMS), size=10)
+        self.assertEqual(len({id(first), id(second), id(third), id(fourth)}), 4)
+
+    def test_stopped_with_last_release(self):
+        key, session_pool = pool.acquire(dict(PARAMS))
+        pool.acquire(dict(PARAMS))
+        driver = pool._pools[key].driver
+        pool.release(key)
+        session_pool.stop.assert_not_called()
+        pool.release(key)
+        session_pool.stop.assert_called_once_with()
+        driver.stop.assert_called_once_with()
+        self.assertNotIn(key, pool._pools)
+        pool.release(key)
+
+    def test_start_does_not_hold_up_other_keys(self):
+        started, proceed = threading.Event(), threading.Event()
+
+        def slow_start(driver_params, size):
+            started.set()
+            proceed.wait(5)
+            return _fake_start(driver_params, size)
+
+        self.start.side_effect = slow_start
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(pool.acquire(dict(PARAMS))))
+            for _ in range(2)
+        ]
+        threads[0].start()
+        started.wait(5)
+        threads[1].start()
+        self.start.side_effect = _fake_start
+        # Another key starts while the first is still waiting for discovery.
+        pool.acquire({**PARAMS, "database": "/other"})
+        proceed.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(self.start.call_count, 2)
+        self.assertIs(results[0][1], results[1][1])
+        self.assertEqual(pool._pools[results[0][0]].refs, 2)
+
+    def test_failed_start_is_not_registered(self):
+        self.start.side_effect = pool.ydb_dbapi.InterfaceError("down")
+        with self.assertRaises(pool.ydb_dbapi.InterfaceError):
+            pool.acquire(dict(PARAMS))
+        self.assertEqual(pool._pools, {})
+        self.start.side_effect = _fake_start
+        pool.acquire(dict(PARAMS))
+        self.assertEqual(self.start.call_count, 2)
+
+    def test_unhashable_option_values(self):
+        key, _ = pool.acquire({**PARAMS, "credentials": {"scopes": ["a", "b"]}})
+        self.assertEqual(
+            key, pool.pool_key({**PARAMS, "credentials": {"scopes": ["a", "b"]}})
+        )
+
+
+class TestWrapperSharedPool(SharedPoolTestCase):
+    def _wrapper(self, alias, **options):
+        settings = {
+            **connection.settings_dict,
+            "HOST": "localhost",
+            "PORT": "2136",
+            "DATABASE": "/local",
+            "OPTIONS": {"shared_pool": True, **options},
+        }
+        return DatabaseWrapper(settings, alias=alias)
+
+    def test_aliases_share_the_pool_and_keep_their_tx_modes(self):
+        connect = mock.Mock(side_effect=lambda **kwargs: mock.Mock(kwargs=kwargs))
+        writer = self._wrapper("writer")
+        reader = self._wrapper("reader", isolation_level="snapshot readonly")
+        with mock.patch.object(base.Database, "connect", connect):
+            writer_conn = writer.get_new_connection(writer.get_connection_params())
+            reader_conn = reader.get_new_connection(reader.get_connection_params())
+        self.assertEqual(self.start.call_count, 1)
+        self.assertIs(
+            writer_conn.kwargs["ydb_session_pool"],
+            reader_conn.kwargs["ydb_session_pool"],
+        )
+        self.assertNotIn("host", writer_conn.kwargs)
+        writer_conn.set_isolation_level.assert_not_called()
+        reader_conn.set_isolation_level.assert_called_once_with(
+            IsolationLevel.SNAPSHOT_READONLY
+        )
+
+        writer.connection, reader.connection = writer_conn, reader_conn
+        (key,) = pool._pools
+        writer._close()
+        self.assertEqual(pool._pools[key].refs, 1)
+        reader._close()
+        self.assertEqual(pool._pools, {})
+
+    def test_options_not_forwarded(self):
+        params = self._wrapper("w", pool_size=8).get_connection_params()
+        self.assertNotIn("shared_pool", params)
+        self.assertNotIn("pool_size", params)
+
+    def test_failed_connect_releases_the_pool(self):
+        wrapper = self._wrapper("w")
+        connect = mock.Mock(side_effect=base.Database.InterfaceError("down"))
+        with (
+            mock.patch.object(base.Database, "connect", connect),
+            self.assertRaises(base.Database.InterfaceError),
+        ):
+            wrapper.get_new_connection(wrapper.get_connection_params())
+        self.assertEqual(pool._pools, {})
@@ -6,10 +6,17 @@ SDK-retriable issues (e.g. Aborted/Overloaded) are retried, non-retriable ones
 without this module hard-coding any of those rules. No database is needed.
 """
 
+from unittest import mock
+
 import ydb
 from django.db import OperationalError
 from django.db import ProgrammingError
 from django.test import SimpleTestCase
+from ydb_backend.retry import CircuitBreaker
+from ydb_backend.retry import CircuitOpenError
+from ydb_backend.retry import RetryBudget
+from ydb_backend.retry import aretry_ydb_errors
+from ydb_backend.retry import aretry_ydb_operation
 from ydb_backend.retry import retry_ydb_errors
 from ydb_backend.retry import retry_ydb_operation
 from ydb_backend.retry import unwrap_ydb_error
@@ -140,3 +147,222 @@ class RetryOperationTests(SimpleTestCase):
 
         self.assertEqual(op(), 42)
         self.assertEqual(calls["n"], 2)
+
+
+def _failing(issue_cls, calls):
+    def op():
+        calls.append(1)
+        raise _wrapped(OperationalError, issue_cls("down"))
+
+    return op
+
+
+class RetryBudgetTests(SimpleTestCase):
+    def test_empty_budget_stops_retrying(self):
+        budget = RetryBudget(ratio=0.5, capacity=2)
+        calls = []
+        with self.assertRaises(OperationalError):
+            retry_ydb_operation(
+                _failing(ydb.issues.Aborted, calls),
+                retry_settings=_settings(5),
+                budget=budget,
+            )
+        # First attempt + the two retries the bucket held.
+        self.assertEqual(len(calls), 3)
+        self.assertEqual((budget.attempts, budget.retries, budget.rejected), (3, 2, 1))
+
+        calls.clear()
+        with self.assertRaises(OperationalError):
+            retry_ydb_operation(
+                _failing(ydb.issues.Aborted, calls),
+                retry_settings=_settings(5),
+                budget=budget,
+            )
+        self.assertEqual(len(calls), 1)
+
+    def test_successes_refill_the_budget(self):
+        budget = RetryBudget(ratio=0.5, capacity=2)
+        for _ in range(2):
+            self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        for _ in range(2):
+            retry_ydb_operation(lambda: "ok", using=None, budget=budget)
+        self.assertEqual(budget.tokens, 1)
+        self.assertTrue(budget.withdraw())
+
+    def test_last_attempt_does_not_spend_a_token(self):
+        budget = RetryBudget(capacity=5)
+        calls = []
+        with self.assertRaises(OperationalError):
+            retry_ydb_operation(
+                _failing(ydb.issues.Aborted, calls),
+                retry_settings=_settings(2),
+                budget=budget,
+            )
+        self.assertEqual(len(calls), 3)
+        self.assertEqual((budget.tokens, budget.retries, budget.rejected), (3, 2, 0))
+
+    def test_non_retriable_errors_do_not_spend_tokens(self):
+        budget = RetryBudget(capacity=1)
+
+        def op():
+            raise _wrapped(ProgrammingError, ydb.issues.BadRequest("bad sql"))
+
+        with self.assertRaises(ProgrammingError):
+            retry_ydb_operation(op, retry_settings=_settings(5), budget=budget)
+        self.assertEqual((budget.tokens, budget.rejected), (1, 0))
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_after_consecutive_outage_errors(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        calls = []
+        with self.assertRaises(CircuitOpenError):
+            retry_ydb_operation(
+                _failing(ydb.issues.Unavailable, calls),
+                retry_settings=_settings(5),
+                breaker=breaker,
+            )
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(breaker.states(), {ydb.issues.Unavailable: "open"})
+        with self.assertRaises(CircuitOpenError):
+            retry_ydb_operation(lambda: "ok", using=None, breaker=breaker)
+        self.assertEqual(breaker.rejected, 2)
+
+    def test_conflicts_do_not_trip_the_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        with self.assertRaises(OperationalError):
+            retry_ydb_operation(
+                _failing(ydb.issues.Aborted, []),
+                retry_settings=_settings(3),
+                breaker=breaker,
+            )
+        self.assertEqual(breaker.states(), {})
+        self.assertTrue(breaker.allow())
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure(ydb.issues.Overloaded("busy"))
+        self.assertEqual(breaker.states(), {ydb.issues.Overloaded: "half-open"})
+        breaker.reset_timeout = 60
+        # Still half-open: opened_at is older than the timeout it had.
+        breaker._circuits[ydb.issues.Overloaded][1] -= 60
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # one trial at a time
+        breaker.record_success()
+        self.assertEqual(breaker.states(), {ydb.issues.Overloaded: "closed"})
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure(ydb.issues.Unavailable("down"))
+        breaker._circuits[ydb.issues.Unavailable][1] -= 60
+        self.assertTrue(breaker.allow())
+        breaker.record_failure(ydb.issues.Unavailable("down"))
+        self.assertEqual(breaker.states(), {ydb.issues.Unavailable: "open"})
+
+    def test_decorator(self):
+        budget = RetryBudget(capacity=1)
+        breaker = CircuitBreaker()
+        calls = []
+
+        @retry_ydb_errors(retry_settings=_settings(5), budget=budget, breaker=breaker)
+        def op():
+            calls.append(1)
+            if len(calls) < 2:
+                raise _wrapped(OperationalError, ydb.issues.Overloaded("busy"))
+            return 42
+
+        self.assertEqual(op(), 42)
+        self.assertEqual((budget.attempts, budget.retries), (2, 1))
+        self.assertEqual(breaker.states(), {ydb.issues.Overloaded: "closed"})
+
+
+class AsyncRetryOperationTests(SimpleTestCase):
+    async def test_retries_retriable_then_succeeds(self):
+        calls = []
+
+        async def op():
+            calls.append(1)
+            if len(calls) < 3:
+                raise _wrapped(OperationalError, ydb.issues.Aborted("tli"))
+            return "ok"
+
+        result = await aretry_ydb_operation(op, retry_settings=_settings(5))
+        self.assertEqual(result, "ok")
+        self.assertEqual(len(calls), 3)
+
+    async def test_exhaustion_raises_original_django_exception(self):
+        async def op():
+            raise _wrapped(OperationalError, ydb.issues.Overloaded("busy"))
+
+        with self.assertRaises(OperationalError):
+            await aretry_ydb_operation(op, retry_settings=_settings(2))
+
+    async def test_non_retriable_is_not_retried(self):
+        calls = []
+
+        async def op():
+            calls.append(1)
+            raise _wrapped(ProgrammingError, ydb.issues.BadRequest("bad sql"))
+
+        with self.assertRaises(ProgrammingError):
+            await aretry_ydb_operation(op, retry_settings=_settings(5))
+        self.assertEqual(len(calls), 1)
+
+    async def test_backoff_does_not_block_the_loop(self):
+        calls = []
+
+        async def op():
+            calls.append(1)
+            if len(calls) < 2:
+                raise _wrapped(OperationalError, ydb.issues.Unavailable("down"))
+            return "ok"
+
+        with (
+            mock.patch("asyncio.sleep", wraps=mock.AsyncMock()) as asleep,
+            mock.patch("time.sleep") as sleep,
+        ):
+            await aretry_ydb_operation(op, retry_settings=ydb.RetrySettings())
+        asleep.assert_called_once()
+        sleep.assert_not_called()
+
+    async def test_budget_and_breaker(self):
+        budget = RetryBudget(capacity=1)
+        breaker = CircuitBreaker(failure_threshold=2)
+        calls = []
+
+        async def op():
+            calls.append(1)
+            raise _wrapped(OperationalError, ydb.issues.Unavailable("down"))
+
+        with self.assertRaises(OperationalError):
+            await aretry_ydb_operation(
+                op, retry_settings=_settings(5), budget=budget, breaker=breaker
+            )
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(budget.rejected, 1)
+        self.assertEqual(breaker.states(), {ydb.issues.Unavailable: "open"})
+
+    async def test_decorators(self):
+        calls = []
+
+        @aretry_ydb_errors(retry_settings=_settings(5))
+        async def op():
+            calls.append(1)
+            if len(calls) < 2:
+                raise _wrapped(OperationalError, ydb.issues.Aborted("tli"))
+            return 42
+
+        @retry_ydb_errors(retry_settings=_settings(5))
+        async def same():
+            return await op()
+
+        self.assertEqual(await op(), 42)
+        self.assertEqual(await same(), 42)
+        self.assertEqual(len(calls), 3)
+
+    def test_async_decorator_needs_a_coroutine_function(self):
+        with self.assertRaises(TypeError):
+            aretry_ydb_errors()(lambda: None)
@@ -0,0 +1,175 @@
+import contextvars
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from ydb_backend import routers
+from ydb_backend.routers import ReadReplicaMiddleware
+from ydb_backend.routers import ReadReplicaRouter
+from ydb_backend.routers import discover_replicas
+from ydb_backend.routers import read_consistency
+from ydb_backend.routers import read_your_writes
+
+from ..models import Square
+
+PRIMARY = {
+    "ENGINE": "ydb_backend.backend",
+    "HOST": "localhost",
+    "PORT": "2136",
+    "DATABASE": "/local",
+}
+
+
+def _replica(isolation_level, **settings):
+    return {**PRIMARY, **settings, "OPTIONS": {"isolation_level": isolation_level}}
+
+
+class TestDiscoverReplicas(SimpleTestCase):
+    def test_read_only_aliases_of_the_same_database(self):
+        databases = {
+            "default": PRIMARY,
+            "stale": _replica("stale readonly"),
+            "online": _replica("ONLINE_READONLY"),
+            "snapshot": _replica("snapshot readonly"),
+            "elsewhere": _replica("stale readonly", DATABASE="/other"),
+            "plain": dict(PRIMARY),
+        }
+        self.assertEqual(
+            discover_replicas(databases), {"stale": "stale", "online": "online"}
+        )
+
+
+class RouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+        self.router.replicas = {"stale": "stale", "online": "online"}
+        # Each test starts without a tracked write, like a new request.
+        self.context = contextvars.copy_context()
+        self.context.run(routers._written_aliases.set, set())
+
+    def run_in_context(self, func, *args):
+        return self.context.run(func, *args)
+
+
+class TestReadReplicaRouter(RouterTestCase):
+    def test_reads_go_to_the_default_consistency_alias(self):
+        self.assertEqual(self.run_in_context(self.router.db_for_read, Square), "stale")
+
+    def test_read_your_writes(self):
+        def scenario():
+            self.assertEqual(self.router.db_for_write(Square), "default")
+            # Being asked where to write is not a write.
+            self.assertEqual(self.router.db_for_read(Square), "stale")
+            connection.note_write()
+            return self.router.db_for_read(Square)
+
+        self.assertEqual(self.run_in_context(scenario), "default")
+
+    def test_writes_elsewhere_do_not_count(self):
+        def scenario():
+            routers.written_aliases().add("other")
+            return self.router.db_for_read(Square)
+
+        self.assertEqual(self.run_in_context(scenario), "stale")
+
+    def test_atomic_block_reads_from_primary(self):
+        with mock.patch.object(connection, "in_atomic_block", True):
+            self.assertEqual(
+                self.run_in_context(self.router.db_for_read, Square), "default"
+            )
+
+    def test_consistency_levels_and_fallback(self):
+        def read(level):
+            with read_consistency(level):
+                return self.router.db_for_read(Square)
+
+        self.assertEqual(self.run_in_context(read, "strong"), "default")
+        self.assertEqual(self.run_in_context(read, "online"), "online")
+        del self.router.replicas["stale"]
+        self.assertEqual(self.run_in_context(read, "stale"), "online")
+        self.router.replicas.clear()
+        self.assertEqual(self.run_in_context(read, "stale"), "default")
+
+    def test_unknown_level(self):
+        with self.assertRaises(ValueError):
+            read_consistency("eventual")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(self.router.allow_migrate("stale", "app"), False)
+        self.assertIsNone(self.router.allow_migrate("default", "app"))
+
+    def test_relations_across_replicas(self):
+        def obj(db):
+            return SimpleNamespace(_state=SimpleNamespace(db=db))
+
+        self.assertTrue(self.router.allow_relation(obj("stale"), obj("default")))
+        self.assertIsNone(self.router.allow_relation(obj("other"), obj("default")))
+
+
+class TestWritesNoted(RouterTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        super().setUp()
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", mock.MagicMock()),
+            mock.patch.object(connection, "create_cursor", mock.MagicMock()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_orm_write(self):
+        def scenario():
+            Square.objects.filter(root=1).update(square=2)
+            return self.router.db_for_read(Square)
+
+        self.assertEqual(self.run_in_context(scenario), "default")
+
+
+class TestViewsAndMiddleware(RouterTestCase):
+    def test_decorated_views(self):
+        @read_consistency("strong")
+        def view(request):
+            return self.router.db_for_read(Square)
+
+        @read_consistency("online")
+        async def async_view(request):
+            return self.router.db_for_read(Square)
+
+        self.assertEqual(self.run_in_context(view, None), "default")
+        self.assertEqual(
+            self.run_in_context(async_to_sync(async_view), None), "online"
+        )
+
+    def test_middleware_scopes_writes_to_a_request(self):
+        def writing_view(request):
+            connection.note_write()
+            return self.router.db_for_read(Square)
+
+        def reading_view(request):
+            return self.router.db_for_read(Square)
+
+        request = RequestFactory().get("/")
+        self.assertEqual(ReadReplicaMiddleware(writing_view)(request), "default")
+        self.assertEqual(ReadReplicaMiddleware(reading_view)(request), "stale")
+
+    def test_read_your_writes_outside_requests(self):
+        @read_your_writes()
+        def task():
+            connection.note_write()
+            return self.router.db_for_read(Square)
+
+        def scenario():
+            self.assertEqual(task(), "default")
+            # The tracking around the task is restored.
+            self.assertEqual(self.router.db_for_read(Square), "stale")
+            connection.note_write()
+            with read_your_writes():
+                self.assertEqual(self.router.db_for_read(Square), "stale")
+            return self.router.db_for_read(Square)
+
+        self.assertEqual(self.run_in_context(scenario), "default")
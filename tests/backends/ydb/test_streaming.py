@@ -0,0 +1,119 @@
+"""
+Tests for the streaming cursor behind QuerySet.iterator().
+
+StreamingCursorTest drives the cursor against a stand-in session pool, so it
+runs without a database; StreamingIteratorTest reads through a real one.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection
+from django.db import transaction
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend.backend.base import StreamingCursor
+
+from ..models import Square
+
+
+class _Stream:
+    """A query result stream that records how far it has been read."""
+
+    def __init__(self, parts):
+        self.parts = iter(parts)
+        self.read = 0
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        part = next(self.parts)
+        self.read += 1
+        return part
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def _part(*rows):
+    return SimpleNamespace(rows=list(rows), columns=[])
+
+
+class StreamingCursorTest(SimpleTestCase):
+    def setUp(self):
+        self.stream = _Stream([_part((1,), (2,)), _part((3,)), _part((4,))])
+        self.session = mock.Mock()
+        self.session.transaction.return_value.execute.return_value = self.stream
+        self.pool = mock.Mock()
+        self.pool.acquire.return_value = self.session
+        self.cursor = StreamingCursor(
+            connection=mock.Mock(),
+            session_pool=self.pool,
+            tx_mode=mock.Mock(),
+            request_settings=mock.Mock(),
+            retry_settings=mock.Mock(),
+        )
+
+    def test_parts_are_read_as_rows_are_fetched(self):
+        self.cursor.execute("SELECT x FROM t")
+        self.assertEqual(self.stream.read, 1)
+        self.assertEqual(self.cursor.fetchmany(2), [(1,), (2,)])
+        self.assertEqual(self.stream.read, 1)
+        self.assertEqual(self.cursor.fetchmany(2), [(3,), (4,)])
+        self.assertEqual(self.stream.read, 3)
+        self.pool.release.assert_not_called()
+
+    def test_session_is_released_when_exhausted(self):
+        self.cursor.execute("SELECT x FROM t")
+        self.assertEqual(self.cursor.fetchall(), [(1,), (2,), (3,), (4,)])
+        self.pool.release.assert_called_once_with(self.session)
+        self.assertFalse(self.stream.cancelled)
+        self.session.delete.assert_not_called()
+        # The cursor can run the next query.
+        self.cursor.execute("SELECT x FROM t")
+
+    def test_close_cancels_an_unfinished_stream(self):
+        # The session is deleted before its release, so the pool does not
+        # hand it out again.
+        self.pool.release.side_effect = lambda session: self.assertTrue(
+            session.delete.called
+        )
+        self.cursor.execute("SELECT x FROM t")
+        self.cursor.fetchone()
+        self.cursor.close()
+        self.assertTrue(self.stream.cancelled)
+        self.pool.release.assert_called_once_with(self.session)
+
+
+class StreamingIteratorTest(TransactionTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        Square.objects.bulk_create(
+            Square(root=i, square=i * i) for i in range(1, 2_001)
+        )
+
+    def test_iterator_streams_every_row(self):
+        roots = [
+            square.root
+            for square in Square.objects.order_by("root").iterator(chunk_size=100)
+        ]
+        self.assertEqual(roots, list(range(1, 2_001)))
+
+    def test_closing_part_way_releases_the_session(self):
+        squares = Square.objects.iterator(chunk_size=10)
+        next(squares)
+        squares.close()
+        self.assertEqual(Square.objects.count(), 2_000)
+
+    def test_iterator_inside_a_transaction(self):
+        with transaction.atomic():
+            squares = list(Square.objects.iterator(chunk_size=50))
+        self.assertEqual(len(squares), 2_000)
+
+    def test_chunked_cursor_streams_only_in_autocommit(self):
+        with connection.chunked_cursor() as cursor:
+            self.assertIsInstance(cursor.cursor, StreamingCursor)
+        with transaction.atomic(), connection.chunked_cursor() as cursor:
+            self.assertNotIsInstance(cursor.cursor, StreamingCursor)
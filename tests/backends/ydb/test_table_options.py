@@ -0,0 +1,220 @@
+from unittest import mock
+
+from django.db import NotSupportedError
+from django.db import connection
+from django.db import models
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.operations import AddConstraint
+from django.db.migrations.operations import RemoveConstraint
+from django.db.migrations.state import ModelState
+from django.db.migrations.state import ProjectState
+from django.db.models import Sum
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend.models.constraints import YDBTableOptions
+
+from ..models import ColumnEvent
+from ..models import PartitionedModel
+
+_SCHEMA_LOGGER = "django_ydb_backend.ydb_backend.backend.schema"
+
+
+def _collect(method, *args):
+    with connection.schema_editor(collect_sql=True) as editor:
+        getattr(editor, method)(*args)
+    return editor.collected_sql
+
+
+class TableOptionsSQLTests(SimpleTestCase):
+    def test_create_table_with_settings(self):
+        (sql,) = _collect("create_model", PartitionedModel)
+        self.assertTrue(
+            sql.endswith(
+                "PRIMARY KEY (`key`)) WITH ("
+                "AUTO_PARTITIONING_BY_LOAD = ENABLED, "
+                "AUTO_PARTITIONING_MIN_PARTITIONS_COUNT = 4, "
+                "PARTITION_AT_KEYS = (100, 200, 300));"
+            ),
+            sql,
+        )
+
+    def test_composite_split_points(self):
+        options = YDBTableOptions(name="s", partition_at_keys=[(1, "a"), (2, "b")])
+        with connection.schema_editor(collect_sql=True) as editor:
+            self.assertEqual(
+                editor._table_settings_sql(options.settings),
+                "PARTITION_AT_KEYS = ((1, 'a'), (2, 'b'))",
+            )
+
+    def test_add_sets_the_settings(self):
+        options = YDBTableOptions(
+            name="s",
+            auto_partitioning_by_size=False,
+            partition_size_mb=512,
+            max_partitions_count=64,
+        )
+        self.assertEqual(
+            _collect("add_constraint", PartitionedModel, options),
+            [
+                "ALTER TABLE `backends_partitionedmodel` SET ("
+                "AUTO_PARTITIONING_BY_SIZE = DISABLED, "
+                "AUTO_PARTITIONING_PARTITION_SIZE_MB = 512, "
+                "AUTO_PARTITIONING_MAX_PARTITIONS_COUNT = 64);"
+            ],
+        )
+
+    def test_remove_restores_the_defaults(self):
+        options = YDBTableOptions(name="s", auto_partitioning_by_load=True)
+        self.assertEqual(
+            _collect("remove_constraint", PartitionedModel, options),
+            [
+                "ALTER TABLE `backends_partitionedmodel` SET "
+                "(AUTO_PARTITIONING_BY_LOAD = DISABLED);"
+            ],
+        )
+
+    def test_create_only_settings_are_skipped(self):
+        options = YDBTableOptions(name="s", uniform_partitions=8)
+        with self.assertLogs(_SCHEMA_LOGGER, level="WARNING") as logs:
+            self.assertEqual(_collect("add_constraint", PartitionedModel, options), [])
+        self.assertIn("UNIFORM_PARTITIONS", logs.output[0])
+
+    def test_uniform_partitions_or_split_points(self):
+        with self.assertRaises(ValueError):
+            YDBTableOptions(name="s", uniform_partitions=4, partition_at_keys=[1])
+
+    def test_deconstruct(self):
+        options = PartitionedModel._meta.constraints[0]
+        path, args, kwargs = options.deconstruct()
+        self.assertEqual(path, "ydb_backend.models.constraints.YDBTableOptions")
+        self.assertEqual(YDBTableOptions(*args, **kwargs), options)
+        self.assertEqual(kwargs["partition_at_keys"], [100, 200, 300])
+
+
+class ColumnTableSQLTests(SimpleTestCase):
+    def test_create_column_table(self):
+        with self.assertLogs(_SCHEMA_LOGGER, level="WARNING") as logs:
+            (sql,) = _collect("create_model", ColumnEvent)
+        self.assertTrue(
+            sql.endswith(
+                "PRIMARY KEY (`key`)) PARTITION BY HASH(`key`) WITH (STORE = COLUMN);"
+            ),
+            sql,
+        )
+        self.assertIn("no secondary indexes", logs.output[0])
+
+    def test_add_index_is_skipped(self):
+        index = models.Index(fields=["device"], name="column_event_device")
+        with self.assertLogs(_SCHEMA_LOGGER, level="WARNING"):
+            self.assertEqual(_collect("add_index", ColumnEvent, index), [])
+
+    def test_store_is_fixed_at_creation(self):
+        options = YDBTableOptions(name="s", store="column")
+        with self.assertLogs(_SCHEMA_LOGGER, level="WARNING") as logs:
+            self.assertEqual(_collect("add_constraint", PartitionedModel, options), [])
+        self.assertIn("STORE", logs.output[0])
+
+    def test_partition_by_needs_column_store(self):
+        with self.assertRaises(ValueError):
+            YDBTableOptions(name="s", partition_by=["key"])
+        with self.assertRaises(ValueError):
+            YDBTableOptions(name="s", store="columnar")
+
+    def test_deconstruct(self):
+        options = ColumnEvent._meta.constraints[0]
+        path, args, kwargs = options.deconstruct()
+        self.assertEqual(
+            kwargs,
+            {"name": "column_event_store", "store": "column", "partition_by": ["key"]},
+        )
+        self.assertEqual(YDBTableOptions(*args, **kwargs), options)
+        self.assertNotEqual(
+            YDBTableOptions(name="column_event_store", store="column"), options
+        )
+
+
+class MixedStoreWriteTests(SimpleTestCase):
+    def setUp(self):
+        patchers = (
+            mock.patch.object(connection, "in_atomic_block", True),
+            mock.patch.object(connection, "_written_store", None),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_row_and_column_writes_do_not_mix(self):
+        connection.record_write(PartitionedModel)
+        connection.record_write(PartitionedModel)
+        with self.assertRaisesMessage(NotSupportedError, "backends_columnevent"):
+            connection.record_write(ColumnEvent)
+
+    def test_column_writes_may_share_a_transaction(self):
+        connection.record_write(ColumnEvent)
+        connection.record_write(ColumnEvent)
+        self.assertEqual(connection._written_store, "column")
+
+    def test_writes_outside_atomic_are_not_recorded(self):
+        connection.in_atomic_block = False
+        connection.record_write(ColumnEvent)
+        self.assertIsNone(connection._written_store)
+
+
+def _state(options):
+    project = ProjectState()
+    project.add_model(
+        ModelState(
+            "app",
+            "Event",
+            [("id", PartitionedModel._meta.pk.clone())],
+            {"constraints": options},
+        )
+    )
+    return project
+
+
+class TableOptionsAutodetectorTests(SimpleTestCase):
+    def _changes(self, before, after):
+        return MigrationAutodetector(_state(before), _state(after))._detect_changes()
+
+    def test_changed_settings_are_migrated(self):
+        changes = self._changes(
+            [YDBTableOptions(name="p", min_partitions_count=4)],
+            [YDBTableOptions(name="p", min_partitions_count=8)],
+        )
+        self.assertEqual(
+            [type(op) for op in changes["app"][0].operations],
+            [RemoveConstraint, AddConstraint],
+        )
+
+    def test_unchanged_settings_need_no_migration(self):
+        changes = self._changes(
+            [YDBTableOptions(name="p", min_partitions_count=4)],
+            [YDBTableOptions(name="p", min_partitions_count=4)],
+        )
+        self.assertEqual(changes, {})
+
+
+class TableOptionsTests(TransactionTestCase):
+    databases = {"default"}
+
+    def test_alter_settings(self):
+        options = YDBTableOptions(
+            name="s", auto_partitioning_by_load=False, max_partitions_count=16
+        )
+        with connection.schema_editor() as editor:
+            editor.add_constraint(PartitionedModel, options)
+            editor.remove_constraint(PartitionedModel, options)
+        PartitionedModel.objects.create(key=150, value="x")
+        self.assertEqual(PartitionedModel.objects.get(key=150).value, "x")
+
+    def test_column_table_aggregate(self):
+        ColumnEvent.objects.bulk_create(
+            ColumnEvent(key=key, device=key % 3, value=key) for key in range(30)
+        )
+        totals = dict(
+            ColumnEvent.objects.values_list("device")
+            .annotate(total=Sum("value"))
+            .order_by("device")
+        )
+        self.assertEqual(totals, {0: 135.0, 1: 145.0, 2: 155.0})
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from unittest import mock
+
+import ydb
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from django.utils import timezone
+from ydb_backend.models.constraints import YDBTTL
+
+from ..models import ExpiringToken
+from ..models import PartitionedModel
+
+
+def _collect(method, *args):
+    with connection.schema_editor(collect_sql=True) as editor:
+        getattr(editor, method)(*args)
+    return editor.collected_sql
+
+
+class TTLSQLTests(SimpleTestCase):
+    def test_create_table_with_ttl(self):
+        (sql,) = _collect("create_model", ExpiringToken)
+        self.assertTrue(
+            sql.endswith(
+                'PRIMARY KEY (`key`)) WITH (TTL = Interval("PT3600S") ON `expires_at`);'
+            ),
+            sql,
+        )
+
+    def test_set_ttl_on_unix_time_column(self):
+        ttl = YDBTTL(
+            name="t", field="key", expire_after=timedelta(days=30), unit="seconds"
+        )
+        self.assertEqual(
+            _collect("add_constraint", PartitionedModel, ttl),
+            [
+                "ALTER TABLE `backends_partitionedmodel` SET "
+                '(TTL = Interval("P30D") ON `key` AS SECONDS);'
+            ],
+        )
+
+    def test_reset_ttl(self):
+        ttl = ExpiringToken._meta.constraints[0]
+        self.assertEqual(
+            _collect("remove_constraint", ExpiringToken, ttl),
+            ["ALTER TABLE `backends_expiringtoken` RESET (TTL);"],
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            YDBTTL(name="t", field="f", expire_after=timedelta(milliseconds=5))
+        with self.assertRaises(ValueError):
+            YDBTTL(name="t", field="f", expire_after=3600)
+        with self.assertRaises(ValueError):
+            YDBTTL(name="t", field="f", expire_after=timedelta(0), unit="hours")
+
+    def test_deconstruct(self):
+        ttl = ExpiringToken._meta.constraints[0]
+        path, args, kwargs = ttl.deconstruct()
+        self.assertEqual(path, "ydb_backend.models.constraints.YDBTTL")
+        self.assertEqual(
+            kwargs,
+            {
+                "name": "token_ttl",
+                "field": "expires_at",
+                "expire_after": timedelta(hours=1),
+            },
+        )
+        self.assertEqual(YDBTTL(*args, **kwargs), ttl)
+
+
+def _ttl_constraint(column, seconds, unit=None):
+    return {
+        "columns": [column],
+        "primary_key": False,
+        "unique": False,
+        "foreign_key": None,
+        "check": False,
+        "index": False,
+        "orders": None,
+        "type": "ttl",
+        "expire_after": timedelta(seconds=seconds),
+        "unit": unit,
+    }
+
+
+class TTLIntrospectionTests(SimpleTestCase):
+    def _constraints(self, ttl_settings):
+        entry = mock.Mock(primary_key=["key"], ttl_settings=ttl_settings)
+        with (
+            mock.patch.object(connection, "get_describe", return_value=entry),
+            mock.patch.object(connection, "get_index_descriptions", return_value=[]),
+        ):
+            return connection.introspection.get_constraints(None, "t")
+
+    def test_date_type_column(self):
+        ttl_settings = ydb.TtlSettings().with_date_type_column("expires_at", 3600)
+        self.assertEqual(
+            self._constraints(ttl_settings)["ttl"],
+            _ttl_constraint("expires_at", 3600),
+        )
+
+    def test_unix_time_column(self):
+        ttl_settings = ydb.TtlSettings().with_value_since_unix_epoch(
+            "created", ydb.ColumnUnit.UNIT_MILLISECONDS, 60
+        )
+        self.assertEqual(
+            self._constraints(ttl_settings)["ttl"],
+            _ttl_constraint("created", 60, "milliseconds"),
+        )
+
+    def test_no_ttl(self):
+        self.assertNotIn("ttl", self._constraints(None))
+
+
+class TTLMigrationTests(SimpleTestCase):
+    """Applying a TTL the table already has is a no-op."""
+
+    def _run(self, method, current):
+        ttl = ExpiringToken._meta.constraints[0]
+        with (
+            connection.schema_editor() as editor,
+            mock.patch.object(editor, "_table_ttl", return_value=current),
+            mock.patch.object(editor, "execute") as execute,
+        ):
+            getattr(editor, method)(ExpiringToken, ttl)
+        return [str(call.args[0]) for call in execute.call_args_list]
+
+    def test_add_existing_ttl(self):
+        current = _ttl_constraint("expires_at", 3600)
+        self.assertEqual(self._run("add_constraint", current), [])
+
+    def test_add_changed_ttl(self):
+        current = _ttl_constraint("expires_at", 60)
+        self.assertEqual(
+            self._run("add_constraint", current),
+            [
+                "ALTER TABLE `backends_expiringtoken` SET "
+                '(TTL = Interval("PT3600S") ON `expires_at`);'
+            ],
+        )
+
+    def test_remove_missing_ttl(self):
+        self.assertEqual(self._run("remove_constraint", None), [])
+
+
+class TTLTests(TransactionTestCase):
+    databases = {"default"}
+
+    def test_ttl_round_trip(self):
+        ExpiringToken.objects.create(key="a", expires_at=timezone.now())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, ExpiringToken._meta.db_table
+            )
+        self.assertEqual(constraints["ttl"], _ttl_constraint("expires_at", 3600))
+        ttl = ExpiringToken._meta.constraints[0]
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(ExpiringToken, ttl)
+            editor.remove_constraint(ExpiringToken, ttl)
+            editor.add_constraint(ExpiringToken, ttl)
+        self.assertEqual(ExpiringToken.objects.get().key, "a")
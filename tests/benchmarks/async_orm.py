@@ -0,0 +1,133 @@
+"""Benchmark of the async ORM under uvicorn: native async vs thread hops.
+
+Serves an async Django view that looks up one row with ``aget()`` through
+two aliases of the same database: ``threaded``, where Django runs the query
+in its ``sync_to_async`` worker thread, and ``native``, with
+``OPTIONS["async_native"]``, where it runs on the event loop. Each alias is
+loaded with concurrent requests for a few seconds and the requests/sec are
+compared. Needs a YDB server (``docker compose up``; override with
+``YDB_HOST``/``YDB_PORT``/``YDB_DATABASE``) plus uvicorn and httpx::
+
+    pip install uvicorn httpx
+    python tests/benchmarks/async_orm.py
+"""
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import django
+import httpx
+import uvicorn
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import path
+
+CONCURRENCY = 64
+DURATION = 5
+ROWS = 1_000
+PORT = 8765
+
+
+async def lookup(request, alias, pk):  # noqa: ARG001
+    from django.contrib.contenttypes.models import ContentType
+    from ydb_backend.models.query import YDBQuerySet
+
+    obj = await YDBQuerySet(ContentType, using=alias).aget(pk=pk)
+    return JsonResponse({"model": obj.model})
+
+
+urlpatterns = [path("<str:alias>/<int:pk>", lookup)]
+
+
+def _configure():
+    database = {
+        "ENGINE": "ydb_backend.backend",
+        "NAME": "ydb_db",
+        "HOST": os.environ.get("YDB_HOST", "localhost"),
+        "PORT": os.environ.get("YDB_PORT", "2136"),
+        "DATABASE": os.environ.get("YDB_DATABASE", "/local"),
+    }
+    settings.configure(
+        DATABASES={
+            "default": database,
+            "threaded": database,
+            "native": {**database, "OPTIONS": {"async_native": True}},
+        },
+        INSTALLED_APPS=["django.contrib.contenttypes"],
+        ROOT_URLCONF=__name__,
+        ALLOWED_HOSTS=["*"],
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+def _populate():
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connection
+
+    if ContentType._meta.db_table not in connection.introspection.table_names():
+        with connection.schema_editor() as editor:
+            editor.create_model(ContentType)
+    ContentType.objects.all().delete()
+    ContentType.objects.bulk_create(
+        ContentType(pk=i, app_label="bench", model=f"m{i}") for i in range(1, ROWS + 1)
+    )
+
+
+async def _load(alias):
+    done = 0
+    deadline = time.monotonic() + DURATION
+    limits = httpx.Limits(max_connections=CONCURRENCY)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+
+        async def worker():
+            nonlocal done
+            while time.monotonic() < deadline:
+                pk = random.randint(1, ROWS)  # noqa: S311
+                url = f"http://127.0.0.1:{PORT}/{alias}/{pk}"
+                response = await client.get(url)
+                response.raise_for_status()
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return done / DURATION
+
+
+def main():
+    _configure()
+    _populate()
+
+    from django.core.asgi import get_asgi_application
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            get_asgi_application(), port=PORT, log_level="warning", lifespan="off"
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    print(f"{CONCURRENCY} concurrent clients, {DURATION}s per alias")
+    results = {}
+    for alias in ("threaded", "native"):
+        asyncio.run(_load(alias))  # warm up connections and the statement path
+        results[alias] = asyncio.run(_load(alias))
+        print(f"{alias:>9}: {results[alias]:>8,.0f} req/s")
+    print(f"  speedup: {results['native'] / results['threaded']:>8.1f}x")
+
+    server.should_exit = True
+    thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Micro-benchmark for compiler placeholder naming.
+
+Compares the single-pass ``_replace_placeholders`` against the previous
+implementation, which rewrote one ``%s`` at a time with ``str.replace`` and so
+copied the whole statement once per parameter. No database is needed::
+
+    python tests/benchmarks/placeholders.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from ydb_backend.models.sql.compiler import _replace_placeholders
+
+SIZES = (10, 1_000, 30_000)
+# Above this size the quadratic baseline takes tens of seconds per call, so it is
+# timed once instead of best-of-three.
+SLOW_BASELINE_SIZE = 1_000
+
+
+def _replace_placeholders_quadratic(sql):
+    # The implementation replaced by the single-pass tokenizer, kept here as the
+    # baseline.
+    placeholder_rows = []
+    counter = 1
+    while "%s" in sql:
+        sql = sql.replace("%s", f"${'element_' + str(counter)}", 1)
+        placeholder_rows.append("$element_" + str(counter))
+        counter += 1
+    return sql, placeholder_rows
+
+
+def _statement(size):
+    # The shape of filter(pk__in=[...]): one placeholder per list element.
+    placeholders = ", ".join(["%s"] * size)
+    return f"SELECT `t`.`id` FROM `t` WHERE `t`.`id` IN ({placeholders})"
+
+
+def _best_of(func, sql, number, repeat):
+    times = timeit.repeat(lambda: func(sql), number=number, repeat=repeat)
+    return min(times) / number
+
+
+def main():
+    print(f"{'params':>8} {'str.replace':>14} {'single pass':>14} {'speedup':>9}")
+    for size in SIZES:
+        sql = _statement(size)
+        assert _replace_placeholders(sql) == _replace_placeholders_quadratic(sql)
+        number = max(1, 10_000 // size)
+        repeat = 1 if size > SLOW_BASELINE_SIZE else 3
+        before = _best_of(_replace_placeholders_quadratic, sql, number, repeat)
+        after = _best_of(_replace_placeholders, sql, number, 3)
+        print(
+            f"{size:>8} {before * 1e3:>12.3f}ms {after * 1e3:>12.3f}ms "
+            f"{before / after:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 from ydb_backend.models.manager import YDBManager
+from ydb_backend.models.mixins import CascadeDeleteMixin
+from ydb_backend.models.mixins import UpsertOnSaveMixin
 
 
 class Book(models.Model):
@@ -143,3 +145,48 @@ class InventoryItem(models.Model):
 
     def __str__(self):
         return f"{self.sku} {self.name} {self.reorder_level} {self.quantity}"
+
+
+class Warehouse(CascadeDeleteMixin, models.Model):
+    code = models.CharField(max_length=20, primary_key=True)
+
+    objects = YDBManager()
+
+    def __str__(self):
+        return self.code
+
+
+class Shelf(models.Model):
+    id = models.IntegerField(primary_key=True)
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"{self.warehouse_id} {self.id}"
+
+
+class Crate(models.Model):
+    id = models.IntegerField(primary_key=True)
+    shelf = models.ForeignKey(Shelf, on_delete=models.CASCADE)
+    spare_shelf = models.ForeignKey(
+        Shelf, on_delete=models.SET_NULL, null=True, related_name="spare_crates"
+    )
+
+    def __str__(self):
+        return f"{self.shelf_id} {self.id}"
+
+
+class SensorReading(UpsertOnSaveMixin, models.Model):
+    sensor = models.CharField(max_length=40, primary_key=True)
+    value = models.FloatField()
+    battery = models.IntegerField(null=True)
+
+    def __str__(self):
+        return f"{self.sensor} {self.value}"
+
+
+class StampedReading(UpsertOnSaveMixin, models.Model):
+    sensor = models.CharField(max_length=40, primary_key=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sensor
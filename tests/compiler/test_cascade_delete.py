@@ -0,0 +1,165 @@
+from unittest import mock
+
+from django.db import connection
+from django.db import transaction
+from django.db.models import signals
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend.models.deletion import YDBCollector
+
+from .models import Crate
+from .models import Shelf
+from .models import Warehouse
+
+
+class YDBCollectorTest(SimpleTestCase):
+    """The statements sent, with the pipeline itself stubbed out."""
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", mock.Mock()),
+            mock.patch.object(connection, "autocommit", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.pipeline = mock.patch.object(connection, "execute_pipeline").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def collector(self):
+        warehouse = Warehouse(code="w1")
+        shelves = [Shelf(id=2, warehouse=warehouse), Shelf(id=1, warehouse=warehouse)]
+        collector = YDBCollector(using="default")
+        collector.add([warehouse])
+        collector.add(shelves, source=Warehouse)
+        collector.fast_deletes.append(Crate.objects.filter(shelf__in=shelves))
+        collector.add_field_update(
+            Crate._meta.get_field("spare_shelf"),
+            None,
+            Crate.objects.filter(spare_shelf__in=shelves),
+        )
+        return collector, warehouse, shelves
+
+    def test_deletion_is_one_request(self):
+        self.pipeline.return_value = [
+            [(1,), (2,), (3,)],
+            [(4,)],
+            [(1,), (2,)],
+            [("w1",)],
+        ]
+        collector, warehouse, shelves = self.collector()
+
+        self.assertEqual(
+            collector.delete(),
+            (
+                6,
+                {
+                    "compiler.Crate": 3,
+                    "compiler.Shelf": 2,
+                    "compiler.Warehouse": 1,
+                },
+            ),
+        )
+        (statements,) = self.pipeline.call_args.args
+        self.assertEqual(
+            [sql.split(" WHERE")[0] for sql, _ in statements],
+            [
+                "DELETE FROM `compiler_crate`",
+                "UPDATE `compiler_crate` SET `spare_shelf_id` = NULL",
+                "DELETE FROM `compiler_shelf`",
+                "DELETE FROM `compiler_warehouse`",
+            ],
+        )
+        self.assertEqual(
+            [value for value, _ in statements[2][1].values()], [[2, 1]]
+        )
+        self.assertIsNone(warehouse.pk)
+        self.assertEqual([shelf.pk for shelf in shelves], [None, None])
+
+    def test_post_delete_follows_the_request(self):
+        self.pipeline.return_value = [[], [], [], []]
+        sent = []
+
+        def receiver(sender, **kwargs):
+            sent.append((sender, self.pipeline.called))
+
+        signals.post_delete.connect(receiver)
+        self.addCleanup(signals.post_delete.disconnect, receiver)
+        self.collector()[0].delete()
+        self.assertEqual(
+            sent, [(Shelf, True), (Shelf, True), (Warehouse, True)]
+        )
+
+    def test_written_tables_are_recorded(self):
+        self.pipeline.return_value = [[], [], [], []]
+        with mock.patch.object(connection, "record_write") as record_write:
+            self.collector()[0].delete()
+        self.assertEqual(
+            {call.args[0] for call in record_write.call_args_list},
+            {Crate, Shelf, Warehouse},
+        )
+
+    def test_instance_delete_uses_the_collector(self):
+        warehouse = Warehouse(code="w1")
+        with mock.patch.object(YDBCollector, "collect") as collect, mock.patch.object(
+            YDBCollector, "delete", return_value=(1, {})
+        ) as delete:
+            self.assertEqual(warehouse.delete(), (1, {}))
+        collect.assert_called_once_with([warehouse], keep_parents=False)
+        delete.assert_called_once_with()
+
+
+class CascadeDeleteTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_cascade(self):
+        warehouse = Warehouse.objects.create(code="w1")
+        Warehouse.objects.create(code="w2")
+        shelves = [Shelf.objects.create(id=i, warehouse=warehouse) for i in (1, 2)]
+        for i in range(3):
+            Crate.objects.create(id=i, shelf=shelves[i % 2])
+        other = Shelf.objects.create(id=3, warehouse_id="w2")
+        Crate.objects.create(id=10, shelf=other, spare_shelf=shelves[0])
+
+        # A SELECT per collected model, then the deletion in one request.
+        with self.assertNumQueries(3):
+            deleted = Warehouse.objects.filter(code="w1").delete()
+
+        self.assertEqual(
+            deleted,
+            (
+                6,
+                {
+                    "compiler.Crate": 3,
+                    "compiler.Shelf": 2,
+                    "compiler.Warehouse": 1,
+                },
+            ),
+        )
+        self.assertEqual(list(Shelf.objects.values_list("id", flat=True)), [3])
+        self.assertIsNone(Crate.objects.get(id=10).spare_shelf_id)
+
+    def test_rolled_back_cascade_keeps_the_rows(self):
+        warehouse = Warehouse.objects.create(code="w1")
+        shelf = Shelf.objects.create(id=1, warehouse=warehouse)
+        Crate.objects.create(id=1, shelf=shelf)
+
+        with self.assertRaises(ValueError), transaction.atomic():
+            Warehouse.objects.filter(code="w1").delete()
+            raise ValueError
+
+        self.assertTrue(Warehouse.objects.filter(code="w1").exists())
+        self.assertEqual(list(Shelf.objects.values_list("id", flat=True)), [1])
+        self.assertEqual(list(Crate.objects.values_list("id", flat=True)), [1])
+
+    def test_instance_delete(self):
+        warehouse = Warehouse.objects.create(code="w1")
+        shelf = Shelf.objects.create(id=1, warehouse=warehouse)
+        Crate.objects.create(id=1, shelf=shelf)
+
+        # The shelves' SELECT, then the deletion in one request.
+        with self.assertNumQueries(2):
+            deleted = warehouse.delete()
+
+        self.assertEqual(deleted[0], 3)
+        self.assertFalse(Crate.objects.exists())
@@ -1,16 +1,21 @@
 """
 Unit tests for compiler helper functions.
 
-These tests exercise _generate_params_for_update and _get_data directly
-without a database connection, so they run as SimpleTestCase.
+These tests exercise _generate_params_for_update, _get_data and
+_replace_placeholders directly without a database connection, so they run as
+SimpleTestCase.
 """
 from datetime import datetime
+from datetime import time
 from datetime import timezone
 from unittest.mock import MagicMock
 
+from django.db import IntegrityError
 from django.test import SimpleTestCase
+from ydb_backend.models.sql.compiler import _batches
 from ydb_backend.models.sql.compiler import _generate_params_for_update
 from ydb_backend.models.sql.compiler import _get_data
+from ydb_backend.models.sql.compiler import _replace_placeholders
 
 
 def _make_field(column, internal_type):
@@ -156,3 +161,122 @@ class TestGetDataDateTimeField(SimpleTestCase):
         field = _make_field("name", "CharField")
         result = _get_data([field], [["hello"]])
         self.assertEqual(result[0]["name"], "hello")
+
+
+class TestGetDataColumnPlan(SimpleTestCase):
+    """_get_data plans each column once and applies it to every row."""
+
+    def test_mixed_columns_over_many_rows(self):
+        dt = datetime(2025, 3, 10, 8, 0, tzinfo=timezone.utc)
+        fields = [
+            _make_field("name", "CharField"),
+            _make_field("at", "DateTimeField"),
+            _make_field("starts", "TimeField"),
+        ]
+        rows = [["a", dt, time(1, 0)], ["b", None, None]]
+        self.assertEqual(
+            _get_data(fields, rows),
+            [
+                {
+                    "name": "a",
+                    "at": int(dt.timestamp() * 1_000_000),
+                    "starts": 3_600_000_000,
+                },
+                {"name": "b", "at": None, "starts": None},
+            ],
+        )
+
+    def test_null_in_not_null_column_raises(self):
+        name = _make_field("name", "CharField")
+        name.null = False
+        with self.assertRaisesMessage(
+            IntegrityError, "NOT NULL constraint failed: name"
+        ):
+            _get_data([name], [["a"], [None]])
+
+
+class TestBatches(SimpleTestCase):
+    """_batches splits payload rows by estimated encoded size."""
+
+    def setUp(self):
+        self.fields = [
+            _make_field("id", "BigIntegerField"),
+            _make_field("name", "CharField"),
+        ]
+
+    def sizes(self, rows, max_bytes, max_rows=None):
+        batches = _batches(self.fields, rows, max_bytes, max_rows)
+        return [len(batch) for batch in batches]
+
+    def test_fixed_and_variable_widths(self):
+        # 8 (Int64) + 10 characters + 2 x 2 bytes of framing = 22 bytes a row.
+        rows = [{"id": i, "name": "x" * 10} for i in range(10)]
+        self.assertEqual(self.sizes(rows, 22 * 4), [4, 4, 2])
+
+    def test_non_ascii_is_measured_in_bytes(self):
+        rows = [{"id": i, "name": "я" * 10} for i in range(4)]
+        self.assertEqual(self.sizes(rows, 32 * 2), [2, 2])
+
+    def test_row_limit(self):
+        rows = [{"id": i, "name": None} for i in range(5)]
+        self.assertEqual(self.sizes(rows, 10_000, max_rows=2), [2, 2, 1])
+
+    def test_values_other_than_text(self):
+        # NULLs count nothing; bytes by their size; anything else by its text.
+        fields = [
+            _make_field("data", "BinaryField"),
+            _make_field("doc", "JSONField"),
+            _make_field("name", "CharField"),
+        ]
+        rows = [
+            {"data": None, "doc": None, "name": None},
+            {"data": memoryview(b"abcd"), "doc": {"a": 1}, "name": 12345},
+            {"data": b"ab", "doc": ["я"], "name": "x"},
+        ]
+        # 3 x 2 bytes of framing a row, then 0, 4 + 8 + 5 and 2 + 6 + 1.
+        for max_bytes, expected in ((6 + 23, [2, 1]), (6 + 22, [1, 1, 1])):
+            batches = _batches(fields, rows, max_bytes)
+            self.assertEqual([len(batch) for batch in batches], expected)
+
+    def test_oversized_row_is_sent_alone(self):
+        rows = [{"id": 1, "name": "x" * 100}, {"id": 2, "name": "y"}]
+        self.assertEqual(self.sizes(rows, 50), [1, 1])
+
+
+class TestReplacePlaceholders(SimpleTestCase):
+    """Placeholders are named $element_N in order, in a single scan."""
+
+    def test_names_placeholders_in_order(self):
+        sql, names = _replace_placeholders("SELECT a FROM t WHERE a = %s AND b = %s")
+        self.assertEqual(
+            sql, "SELECT a FROM t WHERE a = $element_1 AND b = $element_2"
+        )
+        self.assertEqual(names, ["$element_1", "$element_2"])
+
+    def test_no_placeholders(self):
+        self.assertEqual(_replace_placeholders("SELECT 1"), ("SELECT 1", []))
+
+    def test_many_placeholders(self):
+        sql, names = _replace_placeholders(
+            f"a IN ({', '.join(['%s'] * 1000)})"
+        )
+        self.assertEqual(len(names), 1000)
+        self.assertEqual(names[-1], "$element_1000")
+        self.assertNotIn("%s", sql)
+        # $element_1 must not have been substituted inside $element_10 etc.
+        self.assertTrue(sql.endswith("$element_999, $element_1000)"))
+
+    def test_string_literal_is_left_untouched(self):
+        sql, names = _replace_placeholders(
+            "a LIKE '%s'u || %s AND b = 'it''s %s' AND c = %s"
+        )
+        self.assertEqual(
+            sql,
+            "a LIKE '%s'u || $element_1 AND b = 'it''s %s' AND c = $element_2",
+        )
+        self.assertEqual(names, ["$element_1", "$element_2"])
+
+    def test_quoted_identifier_is_left_untouched(self):
+        sql, names = _replace_placeholders("SELECT `odd%s` FROM t WHERE x = %s")
+        self.assertEqual(sql, "SELECT `odd%s` FROM t WHERE x = $element_1")
+        self.assertEqual(names, ["$element_1"])
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.db import connection
+from django.db import models
+from django.db.models import F
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+
+from .models import InventoryItem
+
+ROW = ("a", "anvil", None, 3)
+
+
+class OneRequestStatementTest(SimpleTestCase):
+    """The request sent, with the pipeline itself stubbed out."""
+
+    def setUp(self):
+        patcher = mock.patch.object(connection, "execute_pipeline")
+        self.pipeline = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def statements(self):
+        (statements,) = self.pipeline.call_args.args
+        return [sql for sql, _ in statements]
+
+    def test_get_or_create_inserts_when_missing(self):
+        self.pipeline.return_value = [[], [("a",)]]
+        item, created = InventoryItem.objects.get_or_create(
+            sku="a", defaults={"name": "anvil", "quantity": 1}
+        )
+        self.assertIs(created, True)
+        self.assertEqual((item.sku, item.quantity), ("a", 1))
+        self.assertFalse(item._state.adding)
+        lookup, insert = self.statements()
+        self.assertTrue(lookup.startswith("$existing = (SELECT "))
+        self.assertTrue(lookup.endswith(" FROM $existing"))
+        self.assertIn("INSERT INTO `compiler_inventoryitem`", insert)
+        self.assertTrue(
+            insert.endswith(
+                "WHERE (SELECT COUNT(*) FROM $existing) == 0 RETURNING `sku`;"
+            )
+        )
+
+    def test_get_or_create_returns_the_existing_row(self):
+        self.pipeline.return_value = [[ROW], []]
+        item, created = InventoryItem.objects.get_or_create(
+            sku="a", defaults={"name": "other", "quantity": 1}
+        )
+        self.assertIs(created, False)
+        self.assertEqual((item.name, item.quantity), ("anvil", 3))
+
+    def test_update_or_create_updates_in_the_same_request(self):
+        self.pipeline.return_value = [[ROW], [("a",)], []]
+        item, created = InventoryItem.objects.update_or_create(
+            sku="a",
+            defaults={"quantity": 5},
+            create_defaults={"name": "anvil", "quantity": 5},
+        )
+        self.assertIs(created, False)
+        self.assertEqual((item.name, item.quantity), ("anvil", 5))
+        _, update, _ = self.statements()
+        self.assertTrue(update.startswith("UPDATE `compiler_inventoryitem` SET"))
+        self.assertIn("(SELECT COUNT(*) FROM $existing) == 1", update)
+
+    def test_multiple_objects(self):
+        self.pipeline.return_value = [[ROW, ROW], []]
+        with self.assertRaises(InventoryItem.MultipleObjectsReturned):
+            InventoryItem.objects.get_or_create(name="anvil", quantity=3)
+
+    def test_field_lookups_use_django(self):
+        for method in ("get_or_create", "update_or_create"):
+            with mock.patch.object(
+                models.QuerySet, method, return_value=(None, False)
+            ) as django_method:
+                getattr(InventoryItem.objects, method)(name__iexact="anvil")
+            django_method.assert_called_once()
+        self.pipeline.assert_not_called()
+
+    def test_updating_a_looked_up_field_uses_django(self):
+        for kwargs in ({"name": "a"}, {"pk": "a"}):
+            with mock.patch.object(
+                models.QuerySet, "update_or_create", return_value=(None, False)
+            ) as django_method:
+                InventoryItem.objects.filter(quantity=1).update_or_create(
+                    **kwargs, defaults={"name": "b", "sku": "b"}
+                )
+            django_method.assert_called_once()
+        with mock.patch.object(
+            models.QuerySet, "update_or_create", return_value=(None, False)
+        ) as django_method:
+            InventoryItem.objects.filter(name="a").update_or_create(
+                sku="a", defaults={"name": "b"}
+            )
+        django_method.assert_called_once()
+        self.pipeline.assert_not_called()
+
+
+class OneRequestTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_idempotency_key(self):
+        with self.assertNumQueries(1):
+            item, created = InventoryItem.objects.get_or_create(
+                sku="k1", defaults={"name": "first", "quantity": 1}
+            )
+        self.assertTrue(created)
+        with self.assertNumQueries(1):
+            again, created = InventoryItem.objects.get_or_create(
+                sku="k1", defaults={"name": "second", "quantity": 2}
+            )
+        self.assertFalse(created)
+        self.assertEqual(again.name, "first")
+
+    def test_counter(self):
+        for _ in range(3):
+            InventoryItem.objects.update_or_create(
+                sku="hits",
+                defaults={"quantity": F("quantity") + 1},
+                create_defaults={"name": "hits", "quantity": 1},
+            )
+        self.assertEqual(InventoryItem.objects.get(sku="hits").quantity, 3)
+
+    def test_update_of_a_looked_up_field(self):
+        InventoryItem.objects.create(sku="s1", name="a", quantity=1)
+        item, created = InventoryItem.objects.update_or_create(
+            name="a", defaults={"name": "b"}
+        )
+        self.assertFalse(created)
+        self.assertEqual((item.sku, item.name), ("s1", "b"))
+        self.assertEqual(
+            list(InventoryItem.objects.values_list("sku", "name")), [("s1", "b")]
+        )
@@ -0,0 +1,102 @@
+"""
+Tests for binding literal ``__in`` lists as a single ``List<T>`` parameter.
+
+Only compilation is checked, which needs no live connection, so these run as
+SimpleTestCase.
+"""
+from datetime import datetime
+from datetime import timezone
+from decimal import Decimal
+
+import ydb
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase
+from ydb_backend.models.sql.compiler import _list_type
+from ydb_backend.models.sql.compiler import _ListParam
+from ydb_backend.models.sql.compiler import _resolve_one
+
+from .models import Book
+from .models import Product
+
+
+def _compile(queryset):
+    return queryset.query.get_compiler(connection=connection).as_sql()
+
+
+class TestInLookupCompilation(SimpleTestCase):
+    def test_list_is_one_typed_parameter(self):
+        sql, params = _compile(Book.objects.filter(isbn__in=["1", "2", "3"]))
+        self.assertTrue(sql.endswith("WHERE `compiler_book`.`isbn` IN $element_1"))
+        values, ydb_type = params["$element_1"]
+        self.assertEqual(values, ["1", "2", "3"])
+        self.assertEqual(str(ydb_type), "List<Utf8>")
+
+    def test_query_text_does_not_depend_on_list_length(self):
+        short_sql, _ = _compile(Book.objects.filter(price__in=[1]))
+        long_sql, _ = _compile(Book.objects.filter(price__in=range(10_000)))
+        self.assertEqual(short_sql, long_sql)
+
+    def test_none_and_duplicates_are_dropped(self):
+        _, params = _compile(Book.objects.filter(isbn__in=["1", None, "1", "2"]))
+        self.assertEqual(params["$element_1"][0], ["1", "2"])
+
+    def test_element_type_follows_the_field(self):
+        _, params = _compile(Product.objects.filter(price__in=[1, 2]))
+        self.assertEqual(str(params["$element_1"][1]), "List<Int32>")
+
+    def test_expressions_keep_one_placeholder_per_value(self):
+        sql, params = _compile(Book.objects.filter(price__in=[F("price"), 3]))
+        self.assertIn("IN (`compiler_book`.`price`, $element_1)", sql)
+        self.assertEqual(params["$element_1"][0], 3)
+
+    def test_subquery_is_not_a_list_parameter(self):
+        sql, _ = _compile(
+            Book.objects.filter(isbn__in=Book.objects.values("isbn"))
+        )
+        self.assertIn("IN (SELECT", sql)
+
+
+class TestResolveListParam(SimpleTestCase):
+    def test_elements_are_converted_like_scalars(self):
+        decimal_type = ydb.DecimalType(10, 2)
+        values, ydb_type = _resolve_one(
+            decimal_type, _ListParam([Decimal("1.50"), Decimal("2.00")])
+        )
+        self.assertEqual(values, [Decimal("1.50"), Decimal("2.00")])
+        self.assertEqual(str(ydb_type), f"List<{decimal_type}>")
+
+    def test_mixed_numbers_widen(self):
+        int32, uint64 = ydb.PrimitiveType.Int32, ydb.PrimitiveType.Uint64
+        for items, expected in (
+            ([(1, int32), (2, uint64)], "List<Int64>"),
+            ([(1, int32), (2**63, uint64)], "List<Uint64>"),
+            ([(1, int32), (2.5, ydb.PrimitiveType.Double)], "List<Double>"),
+        ):
+            with self.subTest(items=items):
+                self.assertEqual(str(_list_type(None, items)), expected)
+        # Untyped values are inferred one by one, then unified.
+        _, ydb_type = _resolve_one(None, _ListParam([1, 2.5]))
+        self.assertEqual(str(ydb_type), "List<Double>")
+
+    def test_incompatible_types_raise(self):
+        # A DateTimeField types an int as Int32 and a datetime as Timestamp64.
+        with self.assertRaisesMessage(ValueError, "Int32, Timestamp64"):
+            _resolve_one(
+                "DateTimeField",
+                _ListParam([1, datetime(2024, 1, 1, tzinfo=timezone.utc)]),
+            )
+
+    def test_none_makes_the_element_optional(self):
+        values, ydb_type = _resolve_one("DateTimeField", _ListParam([None]))
+        self.assertEqual((values, str(ydb_type)), ([None], "List<Timestamp64?>"))
+        values, ydb_type = _resolve_one(None, _ListParam([None, "a"]))
+        self.assertEqual((values, str(ydb_type)), ([None, "a"], "List<Utf8?>"))
+
+    def test_repr(self):
+        self.assertEqual(repr(_ListParam(["a", 1])), "_ListParam(['a', 1])")
+
+    def test_equal_lists_hash_alike(self):
+        self.assertEqual(_ListParam([1, 2]), _ListParam([1, 2]))
+        self.assertEqual(hash(_ListParam([1, 2])), hash(_ListParam([1, 2])))
+        self.assertEqual(len({_ListParam([1, 2]), _ListParam([1, 2])}), 1)
@@ -1,8 +1,19 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models.sql import InsertQuery
 from django.test import SimpleTestCase
 
 from .models import Book
 
 
+def _books(count):
+    return [
+        Book(title=f"Title {i}", author="Author", isbn=str(i), price=i)
+        for i in range(count)
+    ]
+
+
 class TestInsert(SimpleTestCase):
     databases = {"default"}
 
@@ -76,3 +87,30 @@ class TestInsert(SimpleTestCase):
         self.assertTrue(books.count() > 0)
         self.assertIn("9780679783305", isbns)
         self.assertIn("9785445303873", isbns)
+
+    def test_bulk_insert_over_byte_budget(self):
+        with mock.patch.object(connection, "bulk_batch_bytes", 200):
+            Book.objects.bulk_create(_books(30))
+        self.assertEqual(Book.objects.filter(author="Author").count(), 30)
+
+
+class TestInsertBatching(SimpleTestCase):
+    """Rows are split into statements under OPTIONS["bulk_batch_bytes"]."""
+
+    def compile(self, books):
+        query = InsertQuery(Book)
+        query.insert_values(Book._meta.concrete_fields, books)
+        return query.get_compiler(connection=connection).as_sql()
+
+    def test_rows_within_budget_are_one_statement(self):
+        self.assertEqual(len(self.compile(_books(30))), 1)
+
+    def test_rows_over_budget_are_split(self):
+        with mock.patch.object(connection, "bulk_batch_bytes", 200):
+            statements = self.compile(_books(30))
+        self.assertGreater(len(statements), 1)
+        self.assertEqual(len({sql for sql, _ in statements}), 1)
+        isbns = [
+            row["isbn"] for _, params in statements for row in params["$in_"][0]
+        ]
+        self.assertEqual(isbns, [str(i) for i in range(30)])
@@ -1,7 +1,23 @@
+from unittest import skipUnless
+
+import ydb
+from django.core.paginator import EmptyPage
+from django.core.paginator import InvalidPage
 from django.core.paginator import Paginator
+from django.db import connection
+from django.test import SimpleTestCase
 from django.test import TransactionTestCase
+from ydb_backend.pagination import KeysetPage
+from ydb_backend.pagination import KeysetPaginator
 
 from .models import Book
+from .models import InventoryItem
+from .models import NFTToken
+
+try:
+    import rest_framework
+except ImportError:
+    rest_framework = None
 
 
 class PaginatorTest(TransactionTestCase):
@@ -24,3 +40,135 @@ class PaginatorTest(TransactionTestCase):
         self.assertEqual(
             [b.isbn for b in paginator.page(3).object_list], ["pag-4"]
         )
+
+
+class SeekSQLTest(SimpleTestCase):
+    def _sql(self, queryset):
+        return queryset.query.get_compiler(connection=connection).as_sql()
+
+    def test_row_value_comparison_and_key_order(self):
+        sql, params = self._sql(
+            InventoryItem.objects.seek(("quantity", "sku"), after=(5, "a"))[:10]
+        )
+        self.assertIn(
+            "WHERE (`compiler_inventoryitem`.`quantity`, "
+            "`compiler_inventoryitem`.`sku`) > ($element_1, $element_2) "
+            "ORDER BY `compiler_inventoryitem`.`quantity` ASC, "
+            "`compiler_inventoryitem`.`sku` ASC LIMIT 10",
+            sql,
+        )
+        self.assertNotIn("OFFSET", sql)
+        self.assertEqual(params["$element_1"], (5, ydb.PrimitiveType.Int32))
+        self.assertEqual(params["$element_2"], ("a", ydb.PrimitiveType.Utf8))
+
+    def test_before_descending_keys_reads_ascending(self):
+        sql, _ = self._sql(
+            InventoryItem.objects.seek(("-quantity", "-sku"), before=(5, "a"))
+        )
+        self.assertIn(") > ($element_1, $element_2)", sql)
+        self.assertIn("`quantity` ASC, `compiler_inventoryitem`.`sku` ASC", sql)
+
+    def test_single_key_uses_plain_lookup(self):
+        sql, _ = self._sql(NFTToken.objects.seek(after=("t1",)))
+        self.assertIn("WHERE `compiler_nfttoken`.`token_id` > $element_1", sql)
+
+    def test_mixed_directions_are_rejected(self):
+        with self.assertRaises(ValueError):
+            InventoryItem.objects.seek(("quantity", "-sku"))
+
+    def test_wrong_number_of_values_is_rejected(self):
+        with self.assertRaises(ValueError):
+            InventoryItem.objects.seek(("quantity", "sku"), after=(5,))
+
+
+class KeysetCursorTest(SimpleTestCase):
+    def test_primary_key_is_appended(self):
+        paginator = KeysetPaginator(InventoryItem.objects.all(), 2, ("-quantity",))
+        self.assertEqual(paginator.keys, ("-quantity", "-pk"))
+
+    def test_cursor_round_trip(self):
+        paginator = KeysetPaginator(InventoryItem.objects.all(), 2, ("quantity",))
+        cursor = paginator.encode_cursor(InventoryItem(sku="a/b", quantity=7), "n", 4)
+        self.assertEqual(paginator.decode_cursor(cursor), ("n", (7, "a/b"), 4))
+
+    def test_empty_page_indexes(self):
+        paginator = KeysetPaginator(InventoryItem.objects.all(), 2)
+        page = KeysetPage([], paginator, None, None)
+        self.assertEqual((page.start_index(), page.end_index()), (0, 0))
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(InventoryItem.objects.all(), 2)
+        for cursor in ("garbage", "WyJuIiwgWzEsIDJdXQ"):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidPage):
+                paginator.decode_cursor(cursor)
+
+
+class KeysetPaginatorTest(TransactionTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        InventoryItem.objects.bulk_create(
+            InventoryItem(sku=f"sku-{i}", name="n", quantity=i % 3)
+            for i in range(7)
+        )
+
+    def _skus(self, page):
+        return [item.sku for item in page]
+
+    def test_forward_and_back(self):
+        paginator = KeysetPaginator(
+            InventoryItem.objects.all(), 3, keys=("quantity",)
+        )
+        first = paginator.page()
+        self.assertEqual(self._skus(first), ["sku-0", "sku-3", "sku-6"])
+        self.assertEqual((first.start_index(), first.end_index()), (1, 3))
+        self.assertFalse(first.has_previous())
+        second = paginator.page(first.next_page_number())
+        self.assertEqual(self._skus(second), ["sku-1", "sku-4", "sku-2"])
+        self.assertEqual((second.start_index(), second.end_index()), (4, 6))
+        third = paginator.page(second.next_page_number())
+        self.assertEqual(self._skus(third), ["sku-5"])
+        self.assertEqual((third.start_index(), third.end_index()), (7, 7))
+        self.assertFalse(third.has_next())
+        with self.assertRaises(EmptyPage):
+            third.next_page_number()
+        back = paginator.page(third.previous_page_number())
+        self.assertEqual(self._skus(back), self._skus(second))
+        self.assertEqual((back.start_index(), back.end_index()), (4, 6))
+        self.assertEqual(
+            self._skus(paginator.page(back.previous_page_number())),
+            self._skus(first),
+        )
+
+    def test_get_page_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(InventoryItem.objects.all(), 2)
+        self.assertEqual(
+            self._skus(paginator.get_page("garbage")), ["sku-0", "sku-1"]
+        )
+
+    def test_seek_descending(self):
+        items = InventoryItem.objects.seek(("-sku",), after=("sku-5",))[:2]
+        self.assertEqual([item.sku for item in items], ["sku-4", "sku-3"])
+
+
+@skipUnless(rest_framework, "djangorestframework is not installed")
+class KeysetCursorPaginationTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_links_walk_every_row(self):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from ydb_backend.drf import KeysetCursorPagination
+
+        InventoryItem.objects.bulk_create(
+            InventoryItem(sku=f"sku-{i}", name="n", quantity=i) for i in range(5)
+        )
+        pagination = KeysetCursorPagination()
+        pagination.page_size = 2
+        url, seen = "/items/", []
+        while url:
+            request = Request(APIRequestFactory().get(url))
+            rows = pagination.paginate_queryset(InventoryItem.objects.all(), request)
+            seen.extend(item.sku for item in rows)
+            url = pagination.get_paginated_response([]).data["next"]
+        self.assertEqual(seen, [f"sku-{i}" for i in range(5)])
@@ -58,6 +58,27 @@ class TestParameterTyping(TransactionTestCase):
         )
         self.assertEqual(set(skus), {"A1", "B1"})
 
+    def test_in_filter_large_list(self):
+        # Bound as one List parameter, so the list length is not limited by
+        # the query text size.
+        prices = [999, *range(100_000, 200_000)]
+        skus = Product.objects.filter(price__in=prices).values_list(
+            "sku", flat=True
+        )
+        self.assertEqual(list(skus), ["A1"])
+
+    def test_in_filter_ignores_none(self):
+        skus = Product.objects.filter(sku__in=["A2", None]).values_list(
+            "sku", flat=True
+        )
+        self.assertEqual(list(skus), ["A2"])
+
+    def test_exclude_in_filter(self):
+        skus = Product.objects.exclude(price__in=[999, 20]).values_list(
+            "sku", flat=True
+        )
+        self.assertEqual(list(skus), ["B1"])
+
     def test_f_expression(self):
         skus = Product.objects.filter(price__gt=F("stock")).values_list(
             "sku", flat=True
@@ -0,0 +1,130 @@
+"""
+Tests for the opt-in compiled-statement cache.
+
+Compilation needs the backend's operations and features but never a live
+connection, so these run as SimpleTestCase.
+"""
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase
+from ydb_backend.models.sql.cache import StatementCache
+from ydb_backend.models.sql.cache import get_statement_cache
+
+from .models import Book
+
+
+def _compile(queryset):
+    return queryset.query.get_compiler(connection=connection).as_sql()
+
+
+def _comparable(compiled):
+    # Container types such as List<T> have no __eq__; compare their YQL names.
+    sql, params = compiled
+    return sql, {name: (value, str(t)) for name, (value, t) in params.items()}
+
+
+class StatementCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cache = StatementCache(maxsize=8)
+        self._saved = connection.statement_cache
+        connection.statement_cache = self.cache
+
+    def tearDown(self):
+        connection.statement_cache = self._saved
+
+
+class TestCachedSelect(StatementCacheTestCase):
+    def test_same_shape_reuses_statement_and_binds_new_values(self):
+        first_sql, first = _compile(Book.objects.filter(isbn="1", price__gt=10))
+        second_sql, second = _compile(Book.objects.filter(isbn="2", price__gt=20))
+        self.assertEqual(first_sql, second_sql)
+        self.assertEqual(first["$element_1"][0], "1")
+        self.assertEqual(second["$element_1"][0], "2")
+        self.assertEqual(second["$element_2"], (20, first["$element_2"][1]))
+        self.assertEqual(self.cache.info()[:2], (1, 1))
+
+    def test_hit_matches_uncached_compilation(self):
+        queryset = Book.objects.filter(
+            title__in=["a", "b"], alias__isnull=True
+        ).order_by("-price")[:3]
+        _compile(queryset)
+        cached = _compile(queryset.all())
+        connection.statement_cache = None
+        self.assertEqual(
+            _comparable(cached), _comparable(_compile(queryset.all()))
+        )
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_different_shapes_are_separate_entries(self):
+        _compile(Book.objects.filter(isbn="1"))
+        _compile(Book.objects.filter(price="1"))
+        _compile(Book.objects.filter(isbn="1").order_by("price"))
+        _compile(Book.objects.filter(isbn="1")[:5])
+        _compile(Book.objects.filter(alias__isnull=True))
+        _compile(Book.objects.filter(alias__isnull=False))
+        self.assertEqual(self.cache.info().currsize, 6)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_expressions_are_not_cached(self):
+        _compile(Book.objects.filter(price=F("price")))
+        _compile(Book.objects.annotate(double=F("price") * 2))
+        self.assertEqual(self.cache.info(), (0, 0, 8, 0))
+
+    def test_select_for_update_is_not_cached(self):
+        _compile(Book.objects.filter(isbn="1"))
+        _compile(Book.objects.filter(isbn="2").select_for_update())
+        _compile(Book.objects.filter(isbn="3").select_for_update(skip_locked=True))
+        self.assertEqual(self.cache.info()[:2], (0, 1))
+
+    def test_iterables_keep_select_state_on_a_hit(self):
+        _compile(Book.objects.filter(isbn="1"))
+        compiler = Book.objects.filter(isbn="2").query.get_compiler(
+            connection=connection
+        )
+        compiler.as_sql()
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(compiler.col_count, len(Book._meta.concrete_fields))
+        self.assertIsNotNone(compiler.klass_info)
+
+
+class TestStatementCache(SimpleTestCase):
+    def test_lru_eviction(self):
+        cache = StatementCache(maxsize=2)
+        cache.put("a", "t", 1)
+        cache.put("b", "t", 2)
+        cache.get("a")
+        cache.put("c", "t", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.info(), (2, 1, 2, 2))
+
+    def test_invalidate_drops_only_that_table(self):
+        cache = StatementCache(maxsize=4)
+        cache.put("a", "t1", 1)
+        cache.put("b", "t2", 2)
+        cache.invalidate("t1")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_shared_per_alias(self):
+        self.assertIs(
+            get_statement_cache("cache-test", 4), get_statement_cache("cache-test", 4)
+        )
+
+    def test_new_maxsize_resizes_the_shared_cache(self):
+        cache = get_statement_cache("cache-resize-test", 3)
+        for key in "abc":
+            cache.put(key, "t", key)
+        self.assertIs(get_statement_cache("cache-resize-test", 2), cache)
+        self.assertEqual(cache.info().maxsize, 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "c")
+
+
+class TestSchemaEditorInvalidation(StatementCacheTestCase):
+    def test_altering_a_table_drops_its_statements(self):
+        _compile(Book.objects.filter(isbn="1"))
+        self.assertEqual(self.cache.info().currsize, 1)
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            editor.remove_field(Book, Book._meta.get_field("alias"))
+        self.assertEqual(self.cache.info().currsize, 0)
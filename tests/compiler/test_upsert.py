@@ -1,4 +1,8 @@
+from unittest import mock
+
 from django.db import NotSupportedError
+from django.db import connection
+from django.test import SimpleTestCase
 from django.test import TransactionTestCase
 
 from .models import InventoryItem
@@ -254,6 +258,26 @@ class NFTTokenUpsertTest(TransactionTestCase):
         self.assertEqual(NFTToken.objects.count(), 1)
         self.assertEqual(NFTToken.objects.get(token_id="12345").owner, "0xAlice123")
 
+    def test_bulk_mode_inserts_and_updates(self):
+        NFTToken.objects.create(**self.token1_data)
+        NFTToken.objects.bulk_upsert(
+            [{**self.token1_data, "owner": "0xCarol789"}, self.token2_data],
+            mode="bulk",
+        )
+        self.assertEqual(NFTToken.objects.count(), 2)
+        self.assertEqual(NFTToken.objects.get(token_id="12345").owner, "0xCarol789")
+
+    def test_bulk_mode_sends_batches_concurrently(self):
+        tokens = [
+            {**self.token1_data, "token_id": str(i), "last_price": float(i)}
+            for i in range(25)
+        ]
+        NFTToken.objects.bulk_upsert(
+            tokens, mode="bulk", batch_size=4, max_workers=3
+        )
+        self.assertEqual(NFTToken.objects.count(), 25)
+        self.assertEqual(NFTToken.objects.get(token_id="24").last_price, 24.0)
+
     def test_unsupported_conflict_target_raises(self):
         # YDB UPSERT is keyed on the primary key; a non-PK target must fail
         # clearly rather than silently upserting by PK.
@@ -287,3 +311,52 @@ class InventoryUpsertTest(TransactionTestCase):
                 {"sku": "A2", "name": "X", "quantity": 1},
                 update_fields=["name"],
             )
+
+
+class BulkModeRequestTest(SimpleTestCase):
+    """mode="bulk" requests, checked against a stand-in driver connection."""
+
+    def bulk_upsert(self, objs, **kwargs):
+        driver_connection = mock.Mock()
+        with mock.patch.object(connection, "ensure_connection"), mock.patch.object(
+            connection, "connection", driver_connection
+        ):
+            NFTToken.objects.bulk_upsert(objs, mode="bulk", **kwargs)
+        return driver_connection.bulk_upsert.call_args_list
+
+    def test_rows_are_sent_in_batches(self):
+        tokens = [
+            NFTToken(
+                token_id=str(i),
+                contract_address="0x1",
+                owner="0xA",
+                metadata_url="ipfs://a",
+                last_price=1.5,
+            )
+            for i in range(5)
+        ]
+        calls = self.bulk_upsert(tokens, batch_size=2)
+        self.assertEqual(len(calls), 3)
+        table, rows, column_types = calls[2].args
+        self.assertEqual(table, NFTToken._meta.db_table)
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "contract_address": "0x1",
+                    "token_id": "4",
+                    "owner": "0xA",
+                    "metadata_url": "ipfs://a",
+                    "last_price": 1.5,
+                }
+            ],
+        )
+        self.assertIn("token_id:Utf8", str(column_types))
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            NFTToken.objects.bulk_upsert([], mode="fast")
+
+    def test_batch_options_need_bulk_mode(self):
+        with self.assertRaises(ValueError):
+            NFTToken.objects.bulk_upsert([], batch_size=10)
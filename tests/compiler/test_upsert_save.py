@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models import signals
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+
+from .models import SensorReading
+from .models import StampedReading
+
+
+class UpsertOnSaveStatementTest(SimpleTestCase):
+    """The statements save() sends, against a stand-in driver connection."""
+
+    databases = {"default"}
+
+    def setUp(self):
+        driver = mock.MagicMock()
+        self.cursor = driver.cursor.return_value
+        self.cursor.description = None
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", driver),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assert_statements(self, *expected):
+        self.assertEqual(
+            [
+                sql.split("; ")[-1].split(" ")[0]
+                for sql, *_ in (call.args for call in self.cursor.execute.mock_calls)
+            ],
+            list(expected),
+        )
+
+    def test_save_is_one_upsert(self):
+        SensorReading(sensor="t1", value=1.5).save()
+        self.assert_statements("UPSERT")
+        (sql, params), _ = self.cursor.execute.call_args
+        self.assertIn("`sensor`, `value`, `battery`", sql)
+
+    def test_update_fields(self):
+        SensorReading(sensor="t1", value=1.5).save(update_fields=["value"])
+        self.assert_statements("UPSERT")
+        (sql, _), _ = self.cursor.execute.call_args
+        self.assertIn("(`sensor`, `value`)", sql)
+
+    def test_update_fields_without_a_not_null_column_update(self):
+        self.cursor.fetchall.return_value = [("t1",)]
+        self.cursor.description = [("sensor",)]
+        SensorReading(sensor="t1", value=1.5).save(update_fields=["battery"])
+        self.assert_statements("UPDATE")
+
+    def test_forced_and_insert_dependent_saves_fall_back(self):
+        SensorReading(sensor="t1", value=1.5).save(force_insert=True)
+        StampedReading(sensor="t1").save()
+        self.assert_statements("INSERT", "UPDATE", "INSERT")
+
+    def test_created_follows_the_instance_state(self):
+        created = []
+
+        def receiver(sender, **kwargs):
+            created.append(kwargs["created"])
+
+        signals.post_save.connect(receiver, sender=SensorReading)
+        self.addCleanup(signals.post_save.disconnect, receiver, sender=SensorReading)
+        reading = SensorReading(sensor="t1", value=1.5)
+        reading.save()
+        reading.save()
+        self.assertEqual(created, [True, False])
+
+
+class UpsertOnSaveTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_insert_then_update_one_statement_each(self):
+        reading = SensorReading(sensor="t1", value=1.5)
+        with self.assertNumQueries(1):
+            reading.save()
+        reading.value = 2.5
+        with self.assertNumQueries(1):
+            reading.save()
+        self.assertEqual(SensorReading.objects.get(sensor="t1").value, 2.5)
+
+    def test_update_fields_preserves_other_columns(self):
+        SensorReading.objects.create(sensor="t1", value=1.5, battery=80)
+        SensorReading(sensor="t1", value=3.0).save(update_fields=["value"])
+        reading = SensorReading.objects.get(sensor="t1")
+        self.assertEqual((reading.value, reading.battery), (3.0, 80))
+
+    def test_update_fields_inserts_a_missing_row(self):
+        SensorReading(sensor="t2", value=1.0).save(update_fields=["value"])
+        self.assertEqual(SensorReading.objects.get(sensor="t2").value, 1.0)
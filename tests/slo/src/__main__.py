@@ -59,6 +59,12 @@ def build_parser():
         default=_env_int("WORKLOAD_DURATION", 600),
         help="Run duration in seconds",
     )
+    run.add_argument(
+        "--kv-write",
+        choices=("upsert", "save"),
+        default=os.environ.get("SLO_KV_WRITE", "upsert"),
+        help="kv: write with objects.upsert() or with Model.save()",
+    )
     run.add_argument("--scan-range", type=int, default=50, help="query: PK scan width")
     run.add_argument("--scan-limit", type=int, default=10, help="query: rows per scan")
     run.add_argument("--read-rps", type=int, default=1000)
@@ -16,7 +16,8 @@ new connection via the ``connection_created`` signal.
 
 Two scenarios are available (``--scenario``):
 
-``kv`` (default) — point key-value access: ``get(pk)`` / native ``upsert``.
+``kv`` (default) — point key-value access: ``get(pk)`` / native ``upsert``
+(or ``save()``, with ``--kv-write save``).
 ``query`` — primary-key range scan + ``ORDER BY``/``LIMIT`` reads, and a
 transactional read-modify-write.
 """
@@ -105,7 +106,12 @@ def _kv_read(args):
 
 
 def _kv_write(args):
-    KeyValue.objects.upsert(make_row(random.randint(1, args.records)))
+    row = make_row(random.randint(1, args.records))
+    if args.kv_write == "save":
+        # UpsertOnSaveMixin: save() is the same single UPSERT.
+        KeyValue(**row).save()
+    else:
+        KeyValue.objects.upsert(row)
 
 
 # --- query scenario ------------------------------------------------------------
@@ -131,8 +137,10 @@ def _query_write(args):
         obj.payload_double = random.random()
         obj.payload_str = random_string()
         obj.payload_timestamp = datetime.now(timezone.utc)
+        # force_update keeps this an UPDATE (UpsertOnSaveMixin would UPSERT).
         obj.save(
-            update_fields=["payload_double", "payload_str", "payload_timestamp"]
+            update_fields=["payload_double", "payload_str", "payload_timestamp"],
+            force_update=True,
         )
 
 
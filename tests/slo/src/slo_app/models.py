@@ -1,15 +1,17 @@
 from django.db import models
 
 from ydb_backend.models.manager import YDBManager
+from ydb_backend.models.mixins import UpsertOnSaveMixin
 
 
-class KeyValue(models.Model):
+class KeyValue(UpsertOnSaveMixin, models.Model):
     """Key-value row exercised by the SLO workload.
 
     The primary key is an explicit integer the workload controls, so reads can
     target keys that are known to exist. Writes go through ``YDBManager.upsert``
-    (native YDB ``UPSERT INTO``), and reads through ``objects.get(pk=...)`` —
-    both run entirely on the Django ORM + ydb_backend code path under test.
+    or, with ``UpsertOnSaveMixin``, ``save()`` (both native YDB ``UPSERT
+    INTO``), and reads through ``objects.get(pk=...)`` — all on the Django
+    ORM + ydb_backend code path under test.
     """
 
     id = models.BigIntegerField(primary_key=True)
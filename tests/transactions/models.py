@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 
 
@@ -6,3 +8,11 @@ class TxItem(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class TxEntry(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    name = models.CharField(max_length=50)
+
+    def __str__(self):
+        return self.name
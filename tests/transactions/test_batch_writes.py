@@ -0,0 +1,137 @@
+from unittest import mock
+
+from django.db import IntegrityError
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend import transaction
+from ydb_backend.backend.base import _join_statements
+
+from .models import TxEntry
+from .models import TxItem
+
+
+class JoinStatementsTest(SimpleTestCase):
+    def test_parameters_are_renamed_per_statement(self):
+        sql, params = _join_statements(
+            [
+                ("DECLARE $in_ AS Int32; UPSERT INTO t SELECT $in_;", {"$in_": 1}),
+                ("UPDATE t SET a = $element_1 WHERE b = $element_10", {
+                    "$element_1": 2,
+                    "$element_10": 3,
+                }),
+            ]
+        )
+        self.assertEqual(
+            sql,
+            "DECLARE $s0_in_ AS Int32; UPSERT INTO t SELECT $s0_in_;\n"
+            "UPDATE t SET a = $s1_element_1 WHERE b = $s1_element_10;",
+        )
+        self.assertEqual(
+            params, {"$s0_in_": 1, "$s1_element_1": 2, "$s1_element_10": 3}
+        )
+
+
+class BatchWritesRequestsTest(SimpleTestCase):
+    """The requests sent, against a stand-in driver connection."""
+
+    databases = {"default"}
+
+    def setUp(self):
+        self.driver = mock.MagicMock(table_path_prefix="", pyformat=False)
+        self.driver._tx_context.execute.return_value = iter(())
+        self.cursor = self.driver.cursor.return_value
+        self.cursor.fetchmany.return_value = []
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", self.driver),
+            mock.patch.object(connection, "autocommit", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def sent(self):
+        return [
+            call.kwargs for call in self.driver._tx_context.execute.call_args_list
+        ]
+
+    def test_writes_are_sent_with_the_commit(self):
+        with transaction.atomic(batch_writes=True):
+            for name in "abc":
+                TxEntry.objects.create(name=name)
+            TxEntry.objects.bulk_create([TxEntry(name="d"), TxEntry(name="e")])
+            self.assertEqual(self.sent(), [])
+        (request,) = self.sent()
+        self.assertIs(request["commit_tx"], True)
+        self.assertEqual(request["query"].count("INSERT INTO"), 4)
+        self.assertEqual(len(request["parameters"]), 4)
+        self.cursor.execute.assert_not_called()
+        self.assertIsNone(connection._write_buffer)
+
+    def test_next_statement_sends_the_buffer_first(self):
+        with transaction.atomic(batch_writes=True):
+            TxEntry.objects.create(name="a")
+            self.cursor.execute.side_effect = lambda *args: self.assertEqual(
+                len(self.sent()), 1
+            )
+            list(TxEntry.objects.all())
+        (request,) = self.sent()
+        self.assertIs(request["commit_tx"], False)
+        self.driver.commit.assert_called_once_with()
+
+    def test_writes_reading_back_a_key_are_not_buffered(self):
+        self.cursor.description = None
+        with transaction.atomic(batch_writes=True):
+            TxItem.objects.create(name="a")
+            self.cursor.execute.assert_called_once()
+        self.assertEqual(self.sent(), [])
+
+    def test_rollback_drops_the_buffer(self):
+        with self.assertRaises(ValueError), transaction.atomic(batch_writes=True):
+            TxEntry.objects.create(name="a")
+            raise ValueError
+        self.assertEqual(self.sent(), [])
+        self.driver.rollback.assert_called_once_with()
+
+    def test_default_sends_each_write(self):
+        with transaction.atomic():
+            TxEntry.objects.create(name="a")
+            self.cursor.execute.assert_called_once()
+        self.assertIsNone(connection._write_buffer)
+
+
+class BatchWritesTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_buffered_writes_are_committed(self):
+        with transaction.atomic(batch_writes=True):
+            TxEntry.objects.create(name="a")
+            TxEntry.objects.bulk_create([TxEntry(name="b"), TxEntry(name="c")])
+        self.assertEqual(
+            sorted(TxEntry.objects.values_list("name", flat=True)), ["a", "b", "c"]
+        )
+
+    def test_reads_see_buffered_writes(self):
+        with transaction.atomic(batch_writes=True):
+            entry = TxEntry.objects.create(name="a")
+            self.assertEqual(TxEntry.objects.get(pk=entry.pk).name, "a")
+            TxEntry.objects.create(name="b")
+        self.assertEqual(TxEntry.objects.count(), 2)
+
+    def test_flushed_writes_are_rolled_back(self):
+        with self.assertRaises(ValueError), transaction.atomic(batch_writes=True):
+            TxEntry.objects.create(name="a")
+            # The read sends the buffered write inside the transaction.
+            self.assertEqual(TxEntry.objects.count(), 1)
+            raise ValueError
+        self.assertFalse(TxEntry.objects.exists())
+
+    def test_conflict_is_raised_at_commit(self):
+        entry = TxEntry.objects.create(name="a")
+        with (
+            self.assertRaises(IntegrityError),
+            transaction.atomic(batch_writes=True),
+        ):
+            TxEntry.objects.create(pk=entry.pk, name="b")
+            TxEntry.objects.create(name="c")
+        self.assertEqual(TxEntry.objects.count(), 1)
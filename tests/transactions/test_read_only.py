@@ -0,0 +1,82 @@
+from unittest import mock
+
+import ydb
+from django.db import DatabaseError
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from ydb_backend import transaction
+
+from .models import TxItem
+
+
+class ReadOnlyBeginTest(SimpleTestCase):
+    """The transaction mode begin() sees, against a stand-in driver connection."""
+
+    def setUp(self):
+        self.driver = mock.Mock(_tx_mode=ydb.QuerySerializableReadWrite())
+        self.begun_with = []
+        self.driver.begin.side_effect = lambda: self.begun_with.append(
+            self.driver._tx_mode.name
+        )
+        for patcher in (
+            mock.patch.object(connection, "ensure_connection"),
+            mock.patch.object(connection, "connection", self.driver),
+            mock.patch.object(connection, "autocommit", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_outer_block_begins_in_snapshot_read_only(self):
+        with transaction.atomic(read_only=True):
+            pass
+        self.assertEqual(self.begun_with, [ydb.QuerySnapshotReadOnly().name])
+        # The connection's own mode is back for the next transaction.
+        self.assertEqual(
+            self.driver._tx_mode.name, ydb.QuerySerializableReadWrite().name
+        )
+        self.driver.commit.assert_called_once_with()
+
+    def test_default_is_read_write(self):
+        with transaction.atomic():
+            pass
+
+        @transaction.atomic
+        def decorated():
+            pass
+
+        decorated()
+        self.assertEqual(
+            self.begun_with, [ydb.QuerySerializableReadWrite().name] * 2
+        )
+
+    def test_nested_read_only_joins_the_outer_transaction(self):
+        with transaction.atomic(), transaction.atomic(read_only=True):
+            pass
+        self.assertEqual(self.begun_with, [ydb.QuerySerializableReadWrite().name])
+        self.assertFalse(connection._begin_read_only)
+
+
+class ReadOnlyAtomicTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_reads_see_one_snapshot(self):
+        TxItem.objects.create(name="a")
+        with transaction.atomic(read_only=True):
+            self.assertEqual(TxItem.objects.count(), 1)
+            self.assertEqual(TxItem.objects.get().name, "a")
+
+    def test_writes_are_rejected(self):
+        with (
+            self.assertRaises(DatabaseError),
+            transaction.atomic(read_only=True),
+        ):
+            TxItem.objects.create(name="b")
+        self.assertEqual(TxItem.objects.filter(name="b").count(), 0)
+
+    def test_connection_returns_to_read_write(self):
+        with transaction.atomic(read_only=True):
+            TxItem.objects.count()
+        with transaction.atomic():
+            TxItem.objects.create(name="c")
+        self.assertEqual(TxItem.objects.filter(name="c").count(), 1)
@@ -0,0 +1,162 @@
+"""
+Native async queries for Django's async ORM.
+
+Django's async QuerySet methods (``aget()``, ``acount()``, ``async for`` ...)
+run the sync ORM in a worker thread through ``sync_to_async``, so every query
+pays a thread hop and ASGI concurrency is capped by that thread. With
+``OPTIONS["async_native"]`` the read methods of ``YDBQuerySet`` instead stay
+on the event loop: the ORM call runs as usual, with the same compiler output
+and parameter typing, but the SELECTs it issues are sent through
+``ydb_dbapi``'s ``AsyncConnection``.
+
+This happens in passes. A pass runs the sync call until it reaches a SELECT
+whose rows are not known yet, which stops it (``_Pending``). The statement is
+awaited on the async connection, and the call runs again with those rows
+served from memory. A call making one query (``get``, ``count``, ``exists``,
+``first``, iteration) takes two passes; each ``prefetch_related()`` lookup
+adds one.
+
+Each event loop gets one ``AsyncConnection`` per alias, reused by every task
+on it. Close them with ``aclose_connections()``, e.g. in the ASGI lifespan
+shutdown.
+"""
+import asyncio
+import contextvars
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import EmptyResultSet
+from django.db import NotSupportedError
+from django.db import connections
+from django.db.models.sql.constants import MULTI
+from django.db.models.sql.constants import SINGLE
+
+# Most SELECTs one ORM call may issue natively; each needs a pass.
+MAX_STATEMENTS = 32
+
+# Rows served to the current pass, keyed by statement; None outside a pass.
+_served = contextvars.ContextVar("ydb_async_served", default=None)
+# Event loop -> {alias: AsyncConnection}.
+_connections = weakref.WeakKeyDictionary()
+_locks = weakref.WeakKeyDictionary()
+
+
+class _Pending(BaseException):
+    """Stops a pass at a statement that still has to be executed."""
+
+    def __init__(self, key, sql, params):
+        super().__init__(sql)
+        self.key = key
+        self.sql = sql
+        self.params = params
+
+
+def _statement_key(sql, params):
+    # Parameter types have no reliable equality, and the repr of List<T> or
+    # Decimal(p,s) carries the object address; their str() names the type.
+    items = params.items() if isinstance(params, dict) else enumerate(params)
+    key = []
+    for name, param in items:
+        value, ydb_type = param if isinstance(param, tuple) else (param, None)
+        key.append((name, repr(value), str(ydb_type)))
+    return sql, tuple(key)
+
+
+def serving():
+    """Return True while a native async pass is running."""
+    return _served.get() is not None
+
+
+def execute_sql(compiler, result_type):
+    """
+    ``SQLCompiler.execute_sql()`` inside a pass: return the fetched rows in the
+    shape Django expects, or stop the pass if they are not known yet.
+    """
+    if result_type not in (MULTI, SINGLE):
+        msg = "Only SELECT queries run on the native async path."
+        raise NotSupportedError(msg)
+    try:
+        sql, params = compiler.as_sql()
+    except EmptyResultSet:
+        sql = None
+    if not sql:
+        return iter([]) if result_type == MULTI else None
+    key = _statement_key(sql, params)
+    served = _served.get()
+    if key not in served:
+        raise _Pending(key, sql, params)
+    rows = served[key]
+    if result_type == SINGLE:
+        return rows[0][: compiler.col_count] if rows else None
+    if compiler.has_extra_select:
+        rows = [row[: compiler.col_count] for row in rows]
+    return [rows] if rows else []
+
+
+def native_enabled(alias):
+    return bool(connections[alias].settings_dict.get("OPTIONS", {}).get("async_native"))
+
+
+async def get_connection(alias):
+    """Return this event loop's ``AsyncConnection`` for ``alias``."""
+    loop = asyncio.get_running_loop()
+    opened = _connections.setdefault(loop, {})
+    connection = opened.get(alias)
+    if connection is not None:
+        return connection
+    lock = _locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        if alias not in opened:
+            wrapper = connections[alias]
+            params = wrapper.get_connection_params()
+            isolation_level = params.pop("isolation_level", None)
+            with wrapper.wrap_database_errors:
+                connection = await wrapper.Database.async_connect(**params)
+            if isolation_level is not None:
+                connection.set_isolation_level(isolation_level)
+            # Statements run in autocommit, as outside transaction.atomic().
+            connection.interactive_transaction = False
+            opened[alias] = connection
+    return opened[alias]
+
+
+async def aclose_connections():
+    """Close the async connections opened on the running event loop."""
+    opened = _connections.pop(asyncio.get_running_loop(), {})
+    for connection in opened.values():
+        await connection.close()
+
+
+async def _fetch(alias, sql, params):
+    connection = await get_connection(alias)
+    with connections[alias].wrap_database_errors:
+        cursor = connection.cursor()
+        try:
+            await cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+
+async def run(alias, func):
+    """
+    Await the sync ORM call ``func`` (taking no arguments) for ``alias``.
+
+    With ``OPTIONS["async_native"]`` its SELECTs run on the async connection
+    (see the module docstring); otherwise, or inside ``transaction.atomic()``,
+    it runs through ``sync_to_async`` as in Django.
+    """
+    if not native_enabled(alias) or connections[alias].in_atomic_block:
+        return await sync_to_async(func)()
+    served = {}
+    for _ in range(MAX_STATEMENTS + 1):
+        token = _served.set(served)
+        try:
+            return func()
+        except _Pending as e:
+            pending = e
+        finally:
+            _served.reset(token)
+        served[pending.key] = await _fetch(alias, pending.sql, pending.params)
+    msg = f"More than {MAX_STATEMENTS} queries in one native async call."
+    raise NotSupportedError(msg)
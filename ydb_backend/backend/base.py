@@ -1,5 +1,10 @@
+import contextvars
+import posixpath
 import re
+import time
+from contextlib import contextmanager
 
+import ydb
 from django.core.exceptions import ImproperlyConfigured
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.backends.base.base import logger
@@ -26,14 +31,63 @@ if Database is None:
 if not hasattr(Database, "Binary"):
     Database.Binary = bytes
 
+# Private SDK modules, used only to read index kinds and covered columns
+# (see DatabaseWrapper.get_index_descriptions).
+try:
+    from ydb import _apis
+    from ydb import _session_impl
+except ImportError:
+    _apis = _session_impl = None
+
+from ydb_dbapi.utils import convert_query_parameters
+from ydb_dbapi.utils import handle_ydb_errors
+
+from ydb_backend.models.constraints import is_column_table
+from ydb_backend.models.sql.cache import get_statement_cache
+
 from .client import DatabaseClient
 from .creation import DatabaseCreation
 from .features import DatabaseFeatures
+from .hedging import HedgedCursor
+from .hedging import get_hedge_stats
 from .introspection import DatabaseIntrospection
+from .introspection import IndexDescription
 from .operations import DatabaseOperations
+from .pool import CONNECTION_PARAMS
+from .pool import DEFAULT_POOL_SIZE
+from .pool import acquire as acquire_shared_pool
+from .pool import release as release_shared_pool
 from .schema import DatabaseSchemaEditor
 from .validation import DatabaseValidation
 
+# Default for OPTIONS["bulk_batch_bytes"]: comfortably below YDB's request
+# message size limit while still carrying many thousands of rows per request.
+DEFAULT_BULK_BATCH_BYTES = 8 * 1024 * 1024
+
+# Default for OPTIONS["backfill_batch_size"]: rows a column backfill updates
+# per transaction (see DatabaseSchemaEditor.add_field).
+DEFAULT_BACKFILL_BATCH_SIZE = 5000
+
+# Statements ydb_backend.transaction.atomic(batch_writes=True) buffers before
+# sending them early, keeping a long block's commit request bounded.
+WRITE_BUFFER_SIZE = 64
+
+_PARAMETER = re.compile(r"\$\w+")
+
+# The aliases the ORM has written in the current context (thread or task),
+# for ReadReplicaRouter's read-your-writes; see ydb_backend.routers.
+_written_aliases = contextvars.ContextVar("ydb_written_aliases")
+
+
+def written_aliases():
+    """Return the set of aliases written in the current context."""
+    try:
+        return _written_aliases.get()
+    except LookupError:
+        aliases = set()
+        _written_aliases.set(aliases)
+        return aliases
+
 
 def _normalize_isolation_level(value):
     """
@@ -60,6 +114,179 @@ def _normalize_isolation_level(value):
         raise ImproperlyConfigured(msg) from None
 
 
+def _local_health(connection):
+    """
+    Judge a ``ydb_dbapi`` connection from its driver's local state.
+
+    Return False when its driver or session pool has been stopped, True while
+    endpoint discovery knows at least one live node, and None when that is
+    not known (no endpoints yet, or a driver without that state): only a
+    query can tell then.
+    """
+    driver = getattr(connection, "_driver", None)
+    session_pool = getattr(connection, "_session_pool", None)
+    if driver is None or session_pool is None:
+        return None
+    should_stop = getattr(session_pool, "_should_stop", None)
+    if getattr(driver, "_stopped", False) or (
+        should_stop is not None and should_stop.is_set()
+    ):
+        return False
+    store = getattr(driver, "_store", None)
+    if store is not None and store.size > 0:
+        return True
+    return None
+
+
+def _join_statements(statements):
+    """
+    Join ``(sql, params)`` statements into one multi-statement query.
+
+    Each statement's parameters are prefixed with its position so the
+    ``$element_N`` / ``$in_`` names the compiler reuses from statement to
+    statement do not collide.
+    """
+    queries = []
+    joined_params = {}
+    for index, (sql, params) in enumerate(statements):
+        # A statement without parameters may carry an empty tuple.
+        typed = params or {}
+        renamed = {name: f"$s{index}_{name[1:]}" for name in typed}
+        query = _PARAMETER.sub(
+            lambda match, names=renamed: names.get(match[0], match[0]), sql
+        )
+        queries.append(query.rstrip("; \n"))
+        for name, value in typed.items():
+            joined_params[renamed[name]] = value
+    return ";\n".join(queries) + ";", joined_params
+
+
+def _index_descriptions(_rpc_state, response_pb):
+    """Unpack the index descriptions of a DescribeTable response."""
+    ydb.issues._process_response(response_pb.operation)
+    message = _apis.ydb_table.DescribeTableResult()
+    response_pb.operation.result.Unpack(message)
+    return [
+        IndexDescription(
+            name=index.name,
+            columns=list(index.index_columns),
+            type=(
+                "global_async" if index.HasField("global_async_index") else "global"
+            ),
+            cover=list(index.data_columns),
+        )
+        for index in message.indexes
+    ]
+
+
+class _CommittingCursor(Database.Cursor):
+    """A cursor whose statement also commits the interactive transaction."""
+
+    def _execute_transactional_query(self, tx_context, query, parameters=None):
+        return self._materialize(
+            tx_context.execute(
+                query=query,
+                parameters=parameters,
+                commit_tx=True,
+                settings=self._get_request_settings(),
+            )
+        )
+
+
+class _PipelineCursor(Database.Cursor):
+    """A cursor that also keeps the rows of each result set apart."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.result_sets = {}
+
+    def _fill_buffer(self, result_set_list):
+        for result_set in result_set_list:
+            # A long result set arrives in several parts with the same index.
+            self.result_sets.setdefault(result_set.index, []).extend(
+                self._rows_iterable(result_set)
+            )
+        super()._fill_buffer(result_set_list)
+
+
+class StreamingCursor(Database.Cursor):
+    """
+    A cursor that streams its result set instead of reading it whole.
+
+    ``execute`` holds a pooled session and reads only the first result-set
+    part; later parts are pulled from the server as rows are fetched, so
+    memory is bounded by a part rather than the whole result, and gRPC flow
+    control applies back-pressure while the caller processes rows. The session
+    returns to the pool when the stream is exhausted; a stream closed part way
+    through is cancelled and its session deleted.
+    Used by ``QuerySet.iterator()`` (see ``DatabaseWrapper.chunked_cursor``).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._session = None
+
+    def execute(self, query, parameters=None):
+        self._raise_if_closed()
+        self._raise_if_running()
+
+        query = self._append_table_path_prefix(query)
+        if self._pyformat and parameters is not None:
+            query, parameters = convert_query_parameters(query, parameters)
+
+        self._begin_query()
+        try:
+            self._open_stream(query, parameters)
+            first = self._next_result_set()
+        except BaseException:
+            self._end_stream(cancel=True)
+            raise
+        self._rows = self._stream_rows(first)
+
+    @handle_ydb_errors
+    def _open_stream(self, query, parameters):
+        self._session = self._session_pool.acquire()
+        self._stream = self._session.transaction(self._tx_mode).execute(
+            query=query,
+            parameters=parameters,
+            commit_tx=True,
+            settings=self._get_request_settings(),
+        )
+
+    @handle_ydb_errors
+    def _next_result_set(self):
+        return next(self._stream, None)
+
+    def _stream_rows(self, result_set):
+        try:
+            while result_set is not None:
+                self._update_description(result_set)
+                yield from self._rows_iterable(result_set)
+                result_set = self._next_result_set()
+        finally:
+            self._end_stream()
+
+    def _end_stream(self, cancel=False):
+        if self._stream is not None and cancel:
+            # Stop a stream abandoned part way through (e.g. a loop over
+            # iterator() that breaks early). The pool would hand its session
+            # out again as is, so delete it: the pool then sees it inactive
+            # and replaces it on a later acquire().
+            self._stream.cancel()
+            if self._session is not None:
+                self._session.delete()
+        self._stream = None
+        if self._session is not None:
+            self._session_pool.release(self._session)
+            self._session = None
+        if not self.is_closed:
+            self._finish_query()
+
+    def close(self):
+        self._end_stream(cancel=True)
+        super().close()
+
+
 class DatabaseWrapper(BaseDatabaseWrapper):
     """
     Represent a database connection.
@@ -178,6 +405,57 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     ops_class = DatabaseOperations
     validation_class = DatabaseValidation
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict.get("OPTIONS", {})
+        # Opt-in cache of compiled SELECT statements, shared by every
+        # connection to this alias (see ydb_backend.models.sql.cache).
+        cache_size = options.get("statement_cache_size")
+        self.statement_cache = (
+            get_statement_cache(self.alias, cache_size) if cache_size else None
+        )
+        # Upper bound on the estimated encoded size of the rows sent by one
+        # bulk write; larger writes are split into several requests.
+        self.bulk_batch_bytes = options.get(
+            "bulk_batch_bytes", DEFAULT_BULK_BATCH_BYTES
+        )
+        # Share one driver and session pool per (endpoint, database,
+        # credentials, driver options) across the process instead of
+        # starting them for every connection (see ydb_backend.backend.pool).
+        self.shared_pool = options.get("shared_pool", False)
+        self.pool_size = options.get("pool_size", DEFAULT_POOL_SIZE)
+        self._shared_pool_key = None
+        # Seconds a successful SELECT 1 probe in is_usable() is trusted for;
+        # 0 probes every time the driver state is inconclusive.
+        self.health_check_interval = options.get("health_check_interval", 0)
+        self._probed_usable_until = 0
+        # Seconds after which an autocommit SELECT is sent again on another
+        # session (see ydb_backend.backend.hedging); None disables hedging.
+        hedge_after_ms = options.get("hedge_after_ms")
+        self.hedge_after = None if hedge_after_ms is None else hedge_after_ms / 1000
+        self.hedge_stats = (
+            None if self.hedge_after is None else get_hedge_stats(self.alias)
+        )
+        # How DatabaseSchemaEditor.add_field backfills the default of a new
+        # nullable column: rows per batch, an optional rows/second limit, or
+        # one BATCH UPDATE.
+        self.backfill_batch_size = options.get(
+            "backfill_batch_size", DEFAULT_BACKFILL_BATCH_SIZE
+        )
+        self.backfill_rows_per_second = options.get("backfill_rows_per_second")
+        self.backfill_batch_update = options.get("backfill_batch_update", False)
+        # Set by the SELECT compilers while they run a read that may be hedged.
+        self._hedging = False
+        # Set by ydb_backend.transaction.atomic(read_only=True) while it opens
+        # its transaction.
+        self._begin_read_only = False
+        # Statements buffered by ydb_backend.transaction.atomic(
+        # batch_writes=True); None outside such a block.
+        self._write_buffer = None
+        # "row" or "column": the kind of table the current transaction has
+        # written (see record_write).
+        self._written_store = None
+
     # def get_driver(self):
     #     return self.connection._driver
 
@@ -192,6 +470,53 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         self.ensure_connection()
         return self.connection.describe(table_name)
 
+    def get_index_descriptions(self, table_name):
+        """
+        Return an ``IndexDescription`` for each of ``table_name``'s indexes.
+
+        The SDK's table description leaves out each index's kind and covered
+        columns, so they are read from the raw DescribeTable response through
+        SDK internals. Should a ydb release move those, the indexes are taken
+        from ``get_describe`` instead and reported as ``"global"``, without
+        cover.
+        """
+        self.ensure_connection()
+        if _session_impl is not None:
+            try:
+                return self._describe_indexes(table_name)
+            except (AttributeError, TypeError):
+                pass
+        return [
+            IndexDescription(
+                name=index.name,
+                columns=list(index.index_columns),
+                type="global",
+                cover=[],
+            )
+            for index in self.get_describe(table_name).indexes
+        ]
+
+    def _describe_indexes(self, table_name):
+        conn = self.connection
+        path = posixpath.join(conn.database, conn.table_path_prefix, table_name)
+        # The table client's session pool is the one describe() runs on.
+        table_client = conn._driver.table_client
+        table_client._init_pool_if_needed()
+
+        def callee(session):
+            return session._driver(
+                _session_impl.describe_table_request_factory(session._state, path),
+                _apis.TableService.Stub,
+                _apis.TableService.DescribeTable,
+                _index_descriptions,
+                conn.request_settings,
+                (),
+                session._state.endpoint,
+            )
+
+        with self.wrap_database_errors:
+            return table_client._pool.retry_operation_sync(callee)
+
     @staticmethod
     def _parse_database_version(version):
         if isinstance(version, bytes):
@@ -262,6 +587,17 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
         options = dict(settings_dict.get("OPTIONS", {}))
         isolation_level = options.pop("isolation_level", None)
+        # Backend-only options, not driver settings (see __init__).
+        options.pop("statement_cache_size", None)
+        options.pop("bulk_batch_bytes", None)
+        options.pop("shared_pool", None)
+        options.pop("pool_size", None)
+        options.pop("health_check_interval", None)
+        options.pop("async_native", None)
+        options.pop("hedge_after_ms", None)
+        options.pop("backfill_batch_size", None)
+        options.pop("backfill_rows_per_second", None)
+        options.pop("backfill_batch_update", None)
 
         conn_params = {
             "host": settings_dict["HOST"],
@@ -288,7 +624,10 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         isolation_level = conn_params.pop("isolation_level", None)
         try:
             logger.debug(f"Connecting to YDB with params: {conn_params}")
-            connection = Database.connect(**conn_params)
+            if self.shared_pool:
+                connection = self._connect_shared(conn_params)
+            else:
+                connection = Database.connect(**conn_params)
             logger.info("Successfully connected to YDB.")
         except DatabaseError as e:
             logger.error(f"Failed to connect to YDB: {e}")
@@ -303,12 +642,193 @@ class DatabaseWrapper(BaseDatabaseWrapper):
                 connection.set_isolation_level(isolation_level)
             return connection
 
+    def _connect_shared(self, conn_params):
+        """
+        Open a ``ydb_dbapi`` connection on the process-wide session pool for
+        ``conn_params``, starting its driver if this is the first user.
+        """
+        driver_params = {
+            k: v for k, v in conn_params.items() if k not in CONNECTION_PARAMS
+        }
+        key, session_pool = acquire_shared_pool(driver_params, self.pool_size)
+        try:
+            connection = Database.connect(
+                ydb_session_pool=session_pool,
+                **{k: v for k, v in conn_params.items() if k in CONNECTION_PARAMS},
+            )
+        except BaseException:
+            release_shared_pool(key)
+            raise
+        self._release_shared_pool()
+        self._shared_pool_key = key
+        return connection
+
+    def _release_shared_pool(self):
+        if self._shared_pool_key is not None:
+            key, self._shared_pool_key = self._shared_pool_key, None
+            release_shared_pool(key)
+
+    def _close(self):
+        self._probed_usable_until = 0
+        try:
+            return super()._close()
+        finally:
+            self._release_shared_pool()
+
     def create_cursor(self, name=None):
         """
         Create a cursor. Assume that a connection is established.
+
+        A named cursor streams its result set (see ``chunked_cursor``), and a
+        read marked by the compiler is hedged (see ``hedged_reads``). Buffered
+        writes are sent first, so the cursor sees them.
         """
+        if self._write_buffer:
+            self.flush_writes()
+        if name is not None:
+            return self._driver_cursor(StreamingCursor)
+        if self._hedging:
+            cursor = self._driver_cursor(HedgedCursor)
+            cursor.hedge_after = self.hedge_after
+            cursor.stats = self.hedge_stats
+            return cursor
         return self.connection.cursor()
 
+    @contextmanager
+    def hedged_reads(self):
+        """
+        Hedge the cursors created in the block, for SELECTs only: a read may
+        be sent twice. A no-op unless ``OPTIONS["hedge_after_ms"]`` is set.
+        """
+        if self.hedge_after is None or self._hedging:
+            yield
+            return
+        self._hedging = True
+        try:
+            yield
+        finally:
+            self._hedging = False
+
+    def _driver_cursor(self, cursor_class):
+        # ydb_dbapi cursors read the open transaction from their connection
+        # (ydb-dbapi >= 0.1.23), so inside atomic() these statements run in
+        # it rather than in autocommit on another session.
+        connection = self.connection
+        return cursor_class(
+            connection=connection,
+            session_pool=connection._session_pool,
+            tx_mode=connection._tx_mode,
+            request_settings=connection.request_settings,
+            retry_settings=connection.retry_settings,
+            table_path_prefix=connection.table_path_prefix,
+            pyformat=connection.pyformat,
+        )
+
+    def defer_writes(self, statements):
+        """
+        Buffer ``(sql, params)`` write statements whose result is not read
+        until the transaction's next statement or commit. Return False, and
+        buffer nothing, outside ``ydb_backend.transaction.atomic(
+        batch_writes=True)``.
+        """
+        if self._write_buffer is None:
+            return False
+        if len(self._write_buffer) + len(statements) > WRITE_BUFFER_SIZE:
+            self.flush_writes()
+        self._write_buffer.extend(statements)
+        return True
+
+    def flush_writes(self, commit=False):
+        """
+        Send the buffered writes as one multi-statement request; with
+        ``commit``, the same request commits the transaction.
+        """
+        statements = self._write_buffer
+        if not statements:
+            return
+        self._write_buffer = []
+        cursor = self._driver_cursor(
+            _CommittingCursor if commit else Database.Cursor
+        )
+        with self._prepare_cursor(cursor) as cursor:
+            cursor.execute(*_join_statements(statements))
+
+    def execute_pipeline(self, statements):
+        """
+        Run ``(sql, params)`` statements that each return one result set (a
+        SELECT, or a write with RETURNING) as one multi-statement request and
+        return the rows of each. Writes buffered by
+        ``ydb_backend.transaction.atomic(batch_writes=True)`` go first in the
+        same request.
+        """
+        if not statements:
+            return []
+        self.ensure_connection()
+        buffered = self._write_buffer or []
+        if buffered:
+            self._write_buffer = []
+        with (
+            self.wrap_database_errors,
+            self._prepare_cursor(self._driver_cursor(_PipelineCursor)) as cursor,
+        ):
+            cursor.execute(*_join_statements([*buffered, *statements]))
+            result_sets = cursor.cursor.result_sets
+        return [result_sets.get(index, []) for index in range(len(statements))]
+
+    def record_write(self, model):
+        """
+        Note that the ``atomic()`` block writes ``model``'s table. YDB does
+        not let one transaction write both row and column tables; the write
+        that would mix them raises ``NotSupportedError`` before it is sent,
+        so YDB does not abort the transaction.
+        """
+        self.note_write()
+        if not self.in_atomic_block:
+            return
+        store = "column" if is_column_table(model) else "row"
+        if self._written_store is None:
+            self._written_store = store
+        elif self._written_store != store:
+            error_message = (
+                f"YDB cannot write the {store} table {model._meta.db_table!r} "
+                f"in a transaction that has written {self._written_store} "
+                f"tables. Write column tables outside transaction.atomic() or "
+                f"in a transaction of their own."
+            )
+            raise NotSupportedError(error_message)
+
+    def note_write(self):
+        """
+        Note that the current context has written through this alias, for
+        ``ReadReplicaRouter`` to send its later reads to the primary.
+        """
+        written_aliases().add(self.alias)
+
+    def _commit(self):
+        self._written_store = None
+        if self._write_buffer:
+            with self.wrap_database_errors:
+                self.flush_writes(commit=True)
+        return super()._commit()
+
+    def _rollback(self):
+        self._written_store = None
+        if self._write_buffer:
+            self._write_buffer.clear()
+        return super()._rollback()
+
+    def chunked_cursor(self):
+        """
+        Return a cursor for ``QuerySet.iterator()`` that streams its rows.
+
+        Only in autocommit mode: a statement inside an interactive transaction
+        must be read completely before the transaction's next statement, so
+        there the result is read whole as usual.
+        """
+        if not self.get_autocommit():
+            return super().chunked_cursor()
+        return self._cursor(name="stream")
+
     def _set_autocommit(self, autocommit):
         """
         Enable or disable autocommit.
@@ -320,8 +840,19 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         isolated (see ``uses_savepoints = False``).
         """
         conn = self.connection
+        self._written_store = None
         if autocommit:
             conn.interactive_transaction = False
+        elif self._begin_read_only:
+            # ydb_backend.transaction.atomic(read_only=True): the transaction
+            # takes its mode at begin, so only begin() sees snapshot mode.
+            tx_mode = conn._tx_mode
+            conn._tx_mode = ydb.QuerySnapshotReadOnly()
+            conn.interactive_transaction = True
+            try:
+                conn.begin()
+            finally:
+                conn._tx_mode = tx_mode
         else:
             conn.interactive_transaction = True
             conn.begin()
@@ -330,6 +861,13 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         """
         Test if the database connection is usable.
 
+        A stopped driver is unusable. Otherwise, as long as no error has
+        occurred since the last successful request, the driver's state (see
+        ``_local_health``) or a passing probe at most ``health_check_interval``
+        seconds old decides without a round-trip. Else a ``SELECT 1`` probe
+        decides; it runs on a cursor of its own, so writes buffered by
+        ``atomic(batch_writes=True)`` stay buffered.
+
         This method may assume that self.connection is not None.
 
         Actual implementations should take care not to raise exceptions
@@ -337,10 +875,19 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         """
         if self.connection is None:
             return False
+        usable = _local_health(self.connection)
+        if usable is False:
+            return False
+        now = time.monotonic()
+        if not self.errors_occurred and (usable or now < self._probed_usable_until):
+            return True
         try:
-            with self.create_cursor() as cursor:
+            with self.connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
-                return cursor.rowcount == 1
+                usable = cursor.rowcount == 1
         except DatabaseError as e:
             logger.warning(f"Connection is not usable: {e}")
             return False
+        if usable:
+            self._probed_usable_until = now + self.health_check_interval
+        return usable
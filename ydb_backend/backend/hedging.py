@@ -0,0 +1,234 @@
+"""
+Hedged reads for read-only aliases.
+
+The tail latency of reads is dominated by the occasional slow node or
+session, even when the rest of the cluster answers in milliseconds. With
+``OPTIONS["hedge_after_ms"]`` a SELECT that has not answered within that many
+milliseconds is sent a second time on another pooled session; the first
+answer is used and the other request is cancelled.
+
+Only the statements the SELECT compilers mark as reads are hedged (see
+``SQLCompiler.execute_sql``), and only in autocommit mode: a statement of an
+interactive transaction is bound to the transaction's session. A SELECT is
+safe to send twice, but a duplicate is extra load, so keep the threshold
+near the alias's p95 latency to hedge about one read in twenty.
+
+``get_hedge_stats(alias)`` returns the alias's counters, shared by every
+connection to it.
+"""
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+import ydb_dbapi
+from ydb_dbapi.cursors import invalidate_cursor_on_ydb_error
+from ydb_dbapi.utils import handle_ydb_errors
+
+logger = logging.getLogger("django_ydb_backend.ydb_backend.backend.hedging")
+
+# Worker threads shared by the duplicates of the process; the first request
+# of a read runs on the calling thread.
+MAX_WORKERS = 32
+
+# Starts its threads on first use.
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="ydb-hedge")
+_lock = threading.Lock()
+_stats = {}
+
+
+class _Timer:
+    """One daemon thread that runs callbacks once their delay has passed."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._order = itertools.count()
+        self._thread = None
+
+    def schedule(self, delay, callback):
+        """Run ``callback`` in ``delay`` seconds; return a handle to cancel."""
+        entry = [monotonic() + delay, next(self._order), callback]
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ydb-hedge-timer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return entry
+
+    def cancel(self, entry):
+        with self._cond:
+            entry[2] = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > monotonic():
+                    timeout = self._heap[0][0] - monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                entry = heapq.heappop(self._heap)
+                callback = entry[2]
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception:
+                logger.exception("Cannot send a hedged read")
+
+
+_timer = _Timer()
+
+
+class HedgeStats:
+    """
+    Counters of the hedged reads of one alias: ``reads`` sent, ``hedged``
+    (those that also sent a duplicate) and ``won`` (hedged reads the duplicate
+    answered first).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hedged = 0
+        self.won = 0
+
+    def record(self, hedged, won):
+        with self._lock:
+            self.reads += 1
+            self.hedged += hedged
+            self.won += won
+
+    @property
+    def hedge_rate(self):
+        """Fraction of the reads that sent a duplicate."""
+        return self.hedged / self.reads if self.reads else 0.0
+
+    @property
+    def win_rate(self):
+        """Fraction of the hedged reads the duplicate answered first."""
+        return self.won / self.hedged if self.hedged else 0.0
+
+
+def get_hedge_stats(alias):
+    """Return the ``HedgeStats`` of ``alias``."""
+    with _lock:
+        return _stats.setdefault(alias, HedgeStats())
+
+
+class _Request:
+    """One of the requests of a hedged read, cancellable from another thread."""
+
+    __slots__ = ("_lock", "cancelled", "stream")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cancelled = False
+        self.stream = None
+
+    def attach(self, stream):
+        """Hold ``stream``; return False when the request is cancelled."""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.stream = stream
+            return True
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            stream = self.stream
+        if stream is not None:
+            stream.cancel()
+
+
+class HedgedCursor(ydb_dbapi.Cursor):
+    """
+    A cursor whose autocommit statements are hedged after ``hedge_after``
+    seconds, counted in ``stats``. Created by ``DatabaseWrapper.create_cursor``
+    for the reads the compiler marks.
+    """
+
+    hedge_after = None
+    stats = None
+
+    @handle_ydb_errors
+    @invalidate_cursor_on_ydb_error
+    def _execute_session_query(self, query, parameters=None):
+        # The first request runs on this thread. Once it has been sent, a
+        # timer submits the duplicate to the executor after hedge_after; the
+        # first of them to answer cancels the other.
+        settings = self._get_request_settings()
+        first, second = _Request(), _Request()
+        lock = threading.Lock()
+        state = {"done": False, "timer": None, "hedge": None}
+
+        def hedge():
+            with lock:
+                if state["done"]:
+                    return
+                future = _executor.submit(
+                    self._send, second, query, parameters, settings
+                )
+                state["hedge"] = future
+            future.add_done_callback(
+                lambda f: f.exception() is None and first.cancel()
+            )
+
+        def sent():
+            if state["timer"] is None:
+                state["timer"] = _timer.schedule(self.hedge_after, hedge)
+
+        rows = error = None
+        try:
+            rows = self._send(first, query, parameters, settings, sent)
+        except Exception as e:  # noqa: BLE001
+            error = e
+        with lock:
+            state["done"] = True
+            future = state["hedge"]
+        if state["timer"] is not None:
+            _timer.cancel(state["timer"])
+
+        won = False
+        if future is not None:
+            if error is None and not first.cancelled:
+                second.cancel()
+            else:
+                # The first request failed, or was cancelled by the duplicate's
+                # answer: the duplicate's outcome decides.
+                hedge_error = future.exception()
+                if hedge_error is None:
+                    rows, error, won = future.result(), None, True
+                else:
+                    error = error or hedge_error
+        if self.stats is not None:
+            self.stats.record(hedged=future is not None, won=won)
+        if error is not None:
+            raise error
+        return rows
+
+    def _send(self, request, query, parameters, settings, sent=None):
+        def callee(session):
+            if request.cancelled:
+                return []
+            stream = session.transaction(self._tx_mode).execute(
+                query=query,
+                parameters=parameters,
+                commit_tx=True,
+                settings=settings,
+            )
+            if sent is not None:
+                sent()
+            if not request.attach(stream):
+                stream.cancel()
+                return []
+            return self._materialize(stream)
+
+        return self._session_pool.retry_operation_sync(
+            callee, retry_settings=self._retry_settings
+        )
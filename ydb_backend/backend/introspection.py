@@ -1,4 +1,5 @@
 from collections import namedtuple
+from datetime import timedelta
 
 import ydb
 from django.db.backends.base.introspection import BaseDatabaseIntrospection
@@ -7,6 +8,9 @@ from django.db.backends.base.introspection import TableInfo as BaseTableInfo
 
 FieldInfo = namedtuple("FieldInfo", BaseFieldInfo._fields)
 TableInfo = namedtuple("TableInfo", BaseTableInfo._fields)
+# A secondary index: its key columns, "global" or "global_async", and the
+# columns it covers.
+IndexDescription = namedtuple("IndexDescription", ["name", "columns", "type", "cover"])
 
 # YDB primitive type names that back Django auto-increment (Serial) primary
 # keys. YDB does not expose "Serial" through describe() — a Serial column is
@@ -96,6 +100,29 @@ def _get_constraint_tuple(
     }
 
 
+def _get_ttl_tuple(ttl_settings):
+    """
+    Describe a table's TTL like a constraint, with its ``expire_after`` and
+    the ``unit`` of an integer column (None for a date or time column).
+    """
+    if ttl_settings.date_type_column is not None:
+        mode, unit = ttl_settings.date_type_column, None
+    else:
+        mode = ttl_settings.value_since_unix_epoch
+        unit = mode.column_unit.name.removeprefix("UNIT_").lower()
+    return {
+        **_get_constraint_tuple(
+            columns=[mode.column_name],
+            is_primary_key=False,
+            is_unique=False,
+            is_index=False,
+            _type="ttl",
+        ),
+        "expire_after": timedelta(seconds=mode.expire_after_seconds),
+        "unit": unit,
+    }
+
+
 class DatabaseIntrospection(BaseDatabaseIntrospection):
     """Encapsulate backends-specific introspection utilities."""
 
@@ -250,6 +277,10 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
 
         YDB exposes neither foreign keys nor check constraints, and its
         secondary indexes are not unique, so those are reported accordingly.
+        An index's type is ``"global"`` or ``"global_async"``, and its
+        ``"cover"`` lists the columns it covers (see ``YDBIndex``). A table's
+        TTL is reported as ``"ttl"``, of type ``"ttl"``, with its
+        ``expire_after`` and ``unit`` (see ``YDBTTL``).
         """
         constraints = {}
         table_scheme_entry = self.connection.get_describe(table_name)
@@ -263,15 +294,21 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                 orders=["ASC"] * len(pk_columns),
             )
 
-        for index in table_scheme_entry.indexes:
-            columns = list(index.index_columns)
-            constraints[index.name] = _get_constraint_tuple(
-                columns=columns,
-                is_primary_key=False,
-                # YDB secondary indexes do not enforce uniqueness.
-                is_unique=False,
-                orders=["ASC"] * len(columns),
-                _type="global",
-            )
+        for index in self.connection.get_index_descriptions(table_name):
+            constraints[index.name] = {
+                **_get_constraint_tuple(
+                    columns=index.columns,
+                    is_primary_key=False,
+                    # YDB secondary indexes do not enforce uniqueness.
+                    is_unique=False,
+                    orders=["ASC"] * len(index.columns),
+                    _type=index.type,
+                ),
+                "cover": index.cover,
+            }
+
+        ttl_settings = getattr(table_scheme_entry, "ttl_settings", None)
+        if ttl_settings is not None:
+            constraints["ttl"] = _get_ttl_tuple(ttl_settings)
 
         return constraints
@@ -9,8 +9,17 @@ from django.db.models.functions import Pi
 from django.db.models.functions import Random
 from django.db.models.functions import Substr
 from django.db.models.functions import Upper
+from django.db.models.lookups import In
 from django.db.models.lookups import PatternLookup
 
+from ydb_backend.models.sql.compiler import _ListParam
+
+# The left-hand side of a multi-column (tuple) lookup.
+try:
+    from django.db.models.expressions import ColPairs as _MultiColumn
+except ImportError:  # Django < 5.2
+    from django.db.models.fields.related_lookups import MultiColSource as _MultiColumn
+
 
 def _now_as_ydb(self, compiler, connection, **extra_context):
     # YQL has no CURRENT_TIMESTAMP literal (Now's default template); use the
@@ -139,6 +148,32 @@ def _pattern_lookup_as_sql_ydb(self, compiler, connection):
 
 PatternLookup.as_sql = _pattern_lookup_as_sql_ydb
 
+def _in_as_ydb(self, compiler, connection):
+    # Bind a literal ``__in`` list as one List<T> parameter (``col IN $list``)
+    # instead of one placeholder per value: every list length then shares a
+    # single query text (and YDB's compiled-query cache entry), and a long list
+    # no longer bloats the query towards YQL's ~1MB text limit. The element
+    # type comes from the left-hand side like any other lookup value.
+    #
+    # Subqueries, multi-column (tuple) lookups and lists containing
+    # expressions or subject to bilateral transforms render per-value SQL and
+    # keep Django's implementation.
+    if (
+        not self.rhs_is_direct_value()
+        or isinstance(self.lhs, _MultiColumn)
+        or self.bilateral_transforms
+        or any(hasattr(value, "resolve_expression") for value in self.rhs)
+    ):
+        return self.as_sql(compiler, connection)
+    lhs_sql, params = self.process_lhs(compiler, connection)
+    # process_rhs drops NULLs and duplicates, preps each value for the field
+    # and raises EmptyResultSet for an empty list.
+    _, rhs_params = self.process_rhs(compiler, connection)
+    return f"{lhs_sql} IN %s", [*params, _ListParam(rhs_params)]
+
+
+In.as_ydb = _in_as_ydb
+
 DATE_PARAMS_EXTRACT = [
     "year",
     "day",
@@ -570,7 +605,9 @@ class DatabaseOperations(BaseDatabaseOperations):
         Return the maximum number of items that can be passed in a single 'IN'
         list condition, or None if the backends does not impose a limit.
         """
-        # YQL has a limit on the size of a query in bytes (about 1Mb)
+        # No limit: a literal IN list is bound as a single List<T> parameter
+        # (see _in_as_ydb), so its length does not count towards YQL's query
+        # text size limit (about 1Mb).
 
     def max_name_length(self):
         """
@@ -0,0 +1,146 @@
+"""
+Process-wide YDB drivers and session pools shared between connections.
+
+``ydb_dbapi.connect()`` starts a driver (with its own endpoint discovery loop)
+and a session pool for every Django connection, i.e. per thread and per alias.
+With ``OPTIONS["shared_pool"]`` the backend instead opens one driver and one
+session pool per (endpoint, database, credentials, driver options) and hands
+the pool to every ``ydb_dbapi`` connection it opens; the driver is stopped
+when the last connection using it is closed.
+
+Transaction modes live on the ``ydb_dbapi`` connection, not on the pool, so
+aliases that share a pool keep their own ``isolation_level``.
+"""
+import threading
+
+import ydb
+import ydb_dbapi
+from ydb_dbapi.utils import prepare_credentials
+from ydb_dbapi.utils import prepare_driver_config_kwargs
+
+# Sessions per shared pool unless OPTIONS["pool_size"] says otherwise; the
+# ydb SDK's own default.
+DEFAULT_POOL_SIZE = 100
+# Seconds to wait for endpoint discovery when a shared driver is started.
+DRIVER_WAIT_TIMEOUT = 10
+
+# connect() keywords that configure the ydb_dbapi connection itself rather
+# than the driver; everything else belongs to the shared driver.
+CONNECTION_PARAMS = frozenset({"ydb_table_path_prefix", "pyformat"})
+
+_lock = threading.Lock()
+_pools = {}
+
+
+class _SharedPool:
+    """
+    A registry entry. ``ready`` is set once the driver has started, or has
+    failed to with ``error``; until then the entry holds no driver.
+    """
+
+    __slots__ = ("driver", "error", "pool", "ready", "refs")
+
+    def __init__(self):
+        self.driver = None
+        self.pool = None
+        self.error = None
+        self.ready = threading.Event()
+        self.refs = 0
+
+
+def _freeze(value):
+    # Hashable stand-in for a settings value; objects (e.g. a
+    # ydb.Credentials instance) are compared by identity.
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+    return value
+
+
+def pool_key(driver_params, size=DEFAULT_POOL_SIZE):
+    """Return the registry key for the driver settings ``driver_params``."""
+    return (_freeze(driver_params), size)
+
+
+def _start(driver_params, size):
+    """Start a driver for ``driver_params``; return it and its session pool."""
+    params = dict(driver_params)
+    protocol = params.pop("protocol", None) or "grpc"
+    endpoint = f"{protocol}://{params.pop('host', '')}:{params.pop('port', '')}"
+    database = params.pop("database", "")
+    credentials = prepare_credentials(params.pop("credentials", None))
+    root_certificates = params.pop("root_certificates", None)
+    root_certificates_path = params.pop("root_certificates_path", None)
+    if root_certificates is None:
+        root_certificates = ydb.load_ydb_root_certificate(root_certificates_path)
+    driver_config_kwargs = prepare_driver_config_kwargs(
+        params.pop("driver_config_kwargs", None), params
+    )
+    driver = ydb.Driver(
+        ydb.DriverConfig(
+            endpoint=endpoint,
+            database=database,
+            credentials=credentials,
+            root_certificates=root_certificates,
+            **driver_config_kwargs,
+        )
+    )
+    try:
+        driver.wait(DRIVER_WAIT_TIMEOUT, fail_fast=True)
+    except Exception as e:
+        details = driver.discovery_debug_details()
+        driver.stop()
+        msg = f"Failed to connect to YDB, details {details}"
+        raise ydb_dbapi.InterfaceError(msg) from e
+    return driver, ydb.QuerySessionPool(driver, size=size)
+
+
+def acquire(driver_params, size=DEFAULT_POOL_SIZE):
+    """
+    Return ``(key, session_pool)`` for ``driver_params``, starting the driver
+    on first use. Every call must be paired with ``release(key)``.
+    """
+    key = pool_key(driver_params, size)
+    # The lock guards the registry only: a driver starts outside it, so a
+    # slow or unreachable endpoint does not hold up the other keys.
+    with _lock:
+        shared = _pools.get(key)
+        starting = shared is None
+        if starting:
+            shared = _pools[key] = _SharedPool()
+        shared.refs += 1
+    if starting:
+        try:
+            shared.driver, shared.pool = _start(driver_params, size)
+        except BaseException as e:
+            shared.error = e
+            with _lock:
+                if _pools.get(key) is shared:
+                    del _pools[key]
+            raise
+        finally:
+            shared.ready.set()
+    else:
+        shared.ready.wait()
+        if shared.error is not None:
+            raise shared.error
+    return key, shared.pool
+
+
+def release(key):
+    """Drop one reference to a shared pool; stop it with the last one."""
+    with _lock:
+        shared = _pools.get(key)
+        if shared is None:
+            return
+        shared.refs -= 1
+        if shared.refs > 0:
+            return
+        del _pools[key]
+    shared.pool.stop()
+    shared.driver.stop()
@@ -1,19 +1,42 @@
 import logging
+import posixpath
+import threading
+from contextlib import contextmanager
 from datetime import date
 from datetime import datetime
 from datetime import time
 from datetime import timezone
 from enum import Enum
+from time import monotonic
+from time import sleep
 from uuid import UUID
 
+import ydb
 from django.db import NotSupportedError
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor
 from django.db.backends.ddl_references import Columns
 from django.db.backends.ddl_references import Statement
+from django.db.backends.ddl_references import Table
+from django.db.models.sql import UpdateQuery
+from django.db.models.sql.where import AND
+from django.db.models.sql.where import ExtraWhere
 from django.db.transaction import TransactionManagementError
 
+from ydb_backend.models.constraints import CREATE_ONLY_SETTINGS
+from ydb_backend.models.constraints import TABLE_SETTINGS
+from ydb_backend.models.constraints import TTL_UNITS
+from ydb_backend.models.constraints import YDBTTL
+from ydb_backend.models.constraints import YDBTableOptions
+from ydb_backend.models.constraints import is_column_table
+from ydb_backend.models.sql.query import BatchUpdateQuery
+
 logger = logging.getLogger("django_ydb_backend.ydb_backend.backend.schema")
 
+# Where add_field records how far the backfill of a new column has got, so a
+# migration interrupted during the backfill resumes it when run again. A
+# finished backfill deletes its row, and the last one drops the table.
+BACKFILL_TABLE = "django_ydb_backfill"
+
 
 def _quote_null(_value=None) -> str:
     # Accept the (unused) value so this matches the other _quote_* handlers and
@@ -46,6 +69,10 @@ def _quote_string(item) -> str:
     return "'" + item.replace("'", "''") + "'"
 
 
+def _utf8_literal(item) -> str:
+    return _quote_string(item) + "u"
+
+
 def _quote_list(item) -> str:
     return f"[{', '.join(str(_quote_value(element)) for element in item)}]"
 
@@ -101,6 +128,34 @@ def _default_literal(value) -> str:
     raise NotSupportedError(error_message)
 
 
+# What ALTER TABLE ... SET restores when a YDBTableOptions setting is removed:
+# YDB's own defaults.
+_TABLE_SETTING_DEFAULTS = {
+    "auto_partitioning_by_size": True,
+    "partition_size_mb": 2048,
+    "auto_partitioning_by_load": False,
+    "min_partitions_count": 1,
+    "max_partitions_count": 50,
+}
+
+
+def _table_setting_literal(value) -> str:
+    """Render a table setting value: a flag, a number or PARTITION_AT_KEYS."""
+    if isinstance(value, bool):
+        return "ENABLED" if value else "DISABLED"
+    if isinstance(value, tuple | list):
+        return f"({', '.join(_table_setting_literal(item) for item in value)})"
+    return _default_literal(value)
+
+
+def _interval_literal(value) -> str:
+    """Render a timedelta of whole seconds as a YQL Interval literal."""
+    seconds = int(value.total_seconds())
+    if seconds and not seconds % 86400:
+        return f'Interval("P{seconds // 86400}D")'
+    return f'Interval("PT{seconds}S")'
+
+
 class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     """
     This class and its subclasses are responsible for emitting schema-changing
@@ -108,11 +163,13 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     renaming, index fiddling, and so on.
     """
 
-    # TODO: WITH (STORE = %(store_type)s)
     # TODO: Need to able create index while we create the table
     sql_create_table = (
-        "CREATE TABLE %(table)s (%(definition)s, PRIMARY KEY (%(primary_key)s));"
+        "CREATE TABLE %(table)s (%(definition)s, PRIMARY KEY (%(primary_key)s))"
+        "%(partition_by)s%(with)s;"
     )
+    sql_alter_table_settings = "ALTER TABLE %(table)s SET (%(settings)s);"
+    sql_reset_table_settings = "ALTER TABLE %(table)s RESET (%(settings)s);"
     sql_delete_table = "DROP TABLE %(table)s;"
     sql_delete_column = "ALTER TABLE %(table)s DROP COLUMN %(column)s;"
     sql_delete_index = "ALTER TABLE %(table)s DROP INDEX %(name)s;"
@@ -122,6 +179,10 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     sql_create_index = (
         "ALTER TABLE %(table)s ADD INDEX %(name)s GLOBAL ON (%(columns)s)%(include)s;"
     )
+    sql_create_async_index = (
+        "ALTER TABLE %(table)s ADD INDEX %(name)s GLOBAL ASYNC ON (%(columns)s)"
+        "%(include)s;"
+    )
     # YDB has no GLOBAL UNIQUE variant in ALTER TABLE ADD INDEX syntax.
     sql_create_unique_index = None
     sql_rename_table = "ALTER TABLE %(old_table)s RENAME TO %(new_table)s;"
@@ -134,6 +195,20 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     sql_update_with_default = (
         "UPDATE %(table)s SET %(column)s = %(default)s WHERE %(column)s IS NULL;"
     )
+    sql_batch_update_with_default = (
+        "BATCH UPDATE %(table)s SET %(column)s = %(default)s "
+        "WHERE %(column)s IS NULL;"
+    )
+    sql_create_backfill_table = (
+        "CREATE TABLE IF NOT EXISTS %(table)s (`table_name` Utf8 NOT NULL, "
+        "`column_name` Utf8 NOT NULL, `last_key` Utf8, "
+        "PRIMARY KEY (`table_name`, `column_name`));"
+    )
+
+    # Seconds between the status checks of an index being built by add_index,
+    # and the most a check may take.
+    index_build_poll_interval = 10
+    index_build_poll_timeout = 10
 
     sql_check_constraint = None
     sql_unique_constraint = None
@@ -169,6 +244,180 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             columns=Columns(model._meta.db_table, columns, self.quote_name),
         )
 
+    def _table_settings_sql(self, settings):
+        return ", ".join(
+            f"{TABLE_SETTINGS[name]} = "
+            + (value.upper() if name == "store" else _table_setting_literal(value))
+            for name, value in settings.items()
+        )
+
+    def _ttl_setting_sql(self, model, ttl):
+        column = self.quote_name(model._meta.get_field(ttl.field).column)
+        sql = f"TTL = {_interval_literal(ttl.expire_after)} ON {column}"
+        if ttl.unit is not None:
+            sql += f" AS {TTL_UNITS[ttl.unit]}"
+        return sql
+
+    def _set_ttl_sql(self, model, ttl):
+        return Statement(
+            self.sql_alter_table_settings,
+            table=Table(model._meta.db_table, self.quote_name),
+            settings=self._ttl_setting_sql(model, ttl),
+        )
+
+    def _reset_ttl_sql(self, model):
+        return Statement(
+            self.sql_reset_table_settings,
+            table=Table(model._meta.db_table, self.quote_name),
+            settings="TTL",
+        )
+
+    def _table_ttl(self, model):
+        """
+        Return the TTL of ``model``'s table as reported by introspection
+        (None without one), or False when collecting SQL.
+        """
+        if self.collect_sql:
+            return False
+        with self.connection.cursor() as cursor:
+            constraints = self.connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        return constraints.get("ttl")
+
+    def _skips_indexes(self, model):
+        """
+        Return whether ``model``'s indexes are skipped: a column table has no
+        secondary indexes.
+        """
+        if not is_column_table(model):
+            return False
+        logger.warning(
+            "YDB column tables have no secondary indexes; skipping the indexes "
+            "of %r.",
+            model._meta.db_table,
+        )
+        return True
+
+    def _model_indexes_sql(self, model):
+        if self._skips_indexes(model):
+            return []
+        return super()._model_indexes_sql(model)
+
+    def _field_indexes_sql(self, model, field):
+        if self._skips_indexes(model):
+            return []
+        return super()._field_indexes_sql(model, field)
+
+    def add_index(self, model, index):
+        """
+        Add an index, logging the progress of its build: ``ADD INDEX``
+        returns only once YDB has built the index over the existing rows.
+        """
+        if self._skips_indexes(model):
+            return
+        if self.collect_sql:
+            super().add_index(model, index)
+            return
+        with self._polling_index_build(model, index.name):
+            super().add_index(model, index)
+
+    @contextmanager
+    def _polling_index_build(self, model, index_name):
+        """
+        Check the status of ``index_name`` every
+        ``index_build_poll_interval`` seconds while the block runs, and log
+        it.
+        """
+        db_table = model._meta.db_table
+        # The block holds the connection, which is not thread-safe: describe
+        # the table through the driver's table client.
+        driver_connection = self.connection.connection
+        table_client = driver_connection._driver.table_client
+        path = posixpath.join(
+            driver_connection.database, driver_connection.table_path_prefix, db_table
+        )
+        settings = ydb.BaseRequestSettings().with_timeout(
+            self.index_build_poll_timeout
+        )
+        done = threading.Event()
+        started = monotonic()
+
+        def poll():
+            while not done.wait(self.index_build_poll_interval):
+                try:
+                    indexes = table_client.describe_table(
+                        path, settings=settings
+                    ).indexes
+                except Exception:  # noqa: BLE001
+                    logger.debug("Cannot describe %r", db_table, exc_info=True)
+                    continue
+                status = next(
+                    (
+                        index.status
+                        for index in indexes
+                        if index.name == index_name
+                    ),
+                    None,
+                )
+                logger.info(
+                    "Index %r on %r: %s after %.0f s.",
+                    index_name,
+                    db_table,
+                    "building" if status is None else status.name.lower(),
+                    monotonic() - started,
+                )
+
+        poller = threading.Thread(
+            target=poll, name=f"ydb-index-build-{index_name}", daemon=True
+        )
+        poller.start()
+        try:
+            yield
+        finally:
+            done.set()
+            # A check still running is abandoned; the thread is a daemon.
+            poller.join(self.index_build_poll_timeout)
+        logger.info(
+            "Index %r on %r built in %.0f s.",
+            index_name,
+            db_table,
+            monotonic() - started,
+        )
+
+    def _alter_table_settings_sql(self, model, settings):
+        """
+        Return the ``ALTER TABLE ... SET`` statement applying ``settings``
+        (``{YDBTableOptions argument: value}``, None restoring YDB's default),
+        or None when there is nothing YDB can change after creation.
+        """
+        create_only = sorted(CREATE_ONLY_SETTINGS.intersection(settings))
+        if create_only:
+            logger.warning(
+                "YDB sets %s of %r only when the table is created; skipping.",
+                ", ".join(TABLE_SETTINGS[name] for name in create_only),
+                model._meta.db_table,
+            )
+        settings = {
+            name: _TABLE_SETTING_DEFAULTS[name] if value is None else value
+            for name, value in settings.items()
+            if name not in CREATE_ONLY_SETTINGS
+        }
+        if not settings:
+            return None
+        return Statement(
+            self.sql_alter_table_settings,
+            table=Table(model._meta.db_table, self.quote_name),
+            settings=self._table_settings_sql(settings),
+        )
+
+    def _invalidate_statements(self, db_table):
+        # Drop cached compiled statements that read a table whose definition
+        # is changing (see ydb_backend.models.sql.cache).
+        cache = getattr(self.connection, "statement_cache", None)
+        if cache is not None:
+            cache.invalidate(db_table)
+
     def prepare_default(self, value):
         """
         Only used for backends which have requires_literal_defaults feature
@@ -254,12 +503,38 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 
         pk = sorted(pk)
 
+        settings = {}
+        partition_by = ()
+        ttl = None
+        for constraint in model._meta.constraints:
+            if isinstance(constraint, YDBTableOptions):
+                settings.update(constraint.settings)
+                partition_by = constraint.partition_by or partition_by
+            elif isinstance(constraint, YDBTTL):
+                ttl = constraint
+        with_settings = [
+            sql
+            for sql in (
+                self._table_settings_sql(settings),
+                ttl and self._ttl_setting_sql(model, ttl),
+            )
+            if sql
+        ]
+        hash_columns = ", ".join(
+            self.quote_name(model._meta.get_field(name).column)
+            for name in partition_by
+        )
+
         sql = self.sql_create_table % {
             "table": self.quote_name(model._meta.db_table),
             "definition": ", ".join(
                 str(attribute) for attribute in column_sqls if attribute
             ),
             "primary_key": ", ".join(self.quote_name(field.column) for field in pk),
+            "partition_by": (
+                f" PARTITION BY HASH({hash_columns})" if partition_by else ""
+            ),
+            "with": f" WITH ({', '.join(with_settings)})" if with_settings else "",
         }
 
         if model._meta.db_tablespace:
@@ -315,6 +590,26 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 raise NotSupportedError(error_message)
             definition += f" DEFAULT {_default_literal(default)}"
 
+        # Existing rows get the default of a new nullable column, as on other
+        # databases, through a backfill after the column is added.
+        default = self.effective_default(field) if field.null else None
+        backfill = default is not None and not self.collect_sql
+        if (
+            backfill
+            and self.connection.backfill_batch_update
+            and self.connection.in_atomic_block
+        ):
+            error_message = (
+                f"The backfill of {model._meta.db_table!r}.{field.column!r} "
+                'cannot run inside a transaction with OPTIONS["backfill_batch_update"]'
+                ": BATCH UPDATE runs outside transactions. Add the field outside "
+                "transaction.atomic()."
+            )
+            raise NotSupportedError(error_message)
+        resumed, last_key = (
+            self._read_backfill_checkpoint(model, field) if backfill else (False, None)
+        )
+
         # Build the SQL and run it
         sql = self.sql_create_column % {
             "table": self.quote_name(model._meta.db_table),
@@ -322,10 +617,165 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             "definition": definition,
         }
 
-        self.execute(sql, params or None)
+        if not resumed or not self._has_column(model, field):
+            if backfill:
+                self._write_backfill_checkpoint(model, field, None)
+            self.execute(sql, params or None)
+        self._invalidate_statements(model._meta.db_table)
+        if backfill:
+            self._backfill(model, field, default, last_key)
+        elif default is not None:
+            # sqlmigrate: the batches depend on the table's keys, so show the
+            # backfill as the single statement they add up to.
+            if self.connection.backfill_batch_update:
+                template = self.sql_batch_update_with_default
+            else:
+                template = self.sql_update_with_default
+                self.collected_sql.append(
+                    f"-- Run in batches of {self.connection.backfill_batch_size} "
+                    f"rows in primary key order."
+                )
+            self.execute(
+                template
+                % {
+                    "table": self.quote_name(model._meta.db_table),
+                    "column": self.quote_name(field.column),
+                    "default": "%s",
+                },
+                [default],
+            )
         # Add an index, if required
         self.deferred_sql.extend(self._field_indexes_sql(model, field))
 
+    def _has_column(self, model, field):
+        columns = self.connection.get_describe(model._meta.db_table).columns
+        return any(column.name == field.column for column in columns)
+
+    def _backfill(self, model, field, default, last_key):
+        """
+        Set the new column ``field`` to ``default`` in the rows where it is
+        NULL, in primary key order from after ``last_key``.
+
+        Each batch of ``OPTIONS["backfill_batch_size"]`` rows is one UPDATE,
+        so no transaction grows with the table, and the key it ends at is
+        recorded in ``BACKFILL_TABLE`` for a rerun to resume from.
+        ``OPTIONS["backfill_rows_per_second"]`` spaces the batches out. With
+        ``OPTIONS["backfill_batch_update"]`` one ``BATCH UPDATE`` does the
+        whole backfill instead, YDB batching it by partition.
+        """
+        alias = self.connection.alias
+        db_table = model._meta.db_table
+        is_null = ExtraWhere([f"{self.quote_name(field.column)} IS NULL"], [])
+
+        if self.connection.backfill_batch_update:
+            query = BatchUpdateQuery(model)
+            query.add_update_fields([(field, None, default)])
+            query.where.add(is_null, AND)
+            query.get_compiler(alias).execute_sql()
+            self._delete_backfill_checkpoint(model, field)
+            logger.info("Backfilled %r.%r with BATCH UPDATE.", db_table, field.column)
+            return
+
+        batch_size = self.connection.backfill_batch_size
+        rows_per_second = self.connection.backfill_rows_per_second
+        keys = model._base_manager.db_manager(alias).order_by("pk")
+        started = monotonic()
+        scanned = updated = 0
+        while True:
+            batch = keys if last_key is None else keys.filter(pk__gt=last_key)
+            # The key of the batch's last row; None for the final batch.
+            upper = next(
+                iter(batch.values_list("pk", flat=True)[batch_size - 1 : batch_size]),
+                None,
+            )
+            query = UpdateQuery(model)
+            query.add_update_fields([(field, None, default)])
+            if last_key is not None:
+                query.add_filter("pk__gt", last_key)
+            if upper is not None:
+                query.add_filter("pk__lte", upper)
+            query.where.add(is_null, AND)
+            updated += query.get_compiler(alias).execute_sql()
+            if upper is None:
+                break
+            last_key = upper
+            scanned += batch_size
+            self._write_backfill_checkpoint(model, field, last_key)
+            logger.info(
+                "Backfilled %r.%r up to key %r: %d rows updated.",
+                db_table,
+                field.column,
+                last_key,
+                updated,
+            )
+            if rows_per_second:
+                sleep(max(0, started + scanned / rows_per_second - monotonic()))
+        self._delete_backfill_checkpoint(model, field)
+        logger.info(
+            "Backfilled %r.%r: %d rows updated in %.0f s.",
+            db_table,
+            field.column,
+            updated,
+            monotonic() - started,
+        )
+
+    def _backfill_checkpoint_where(self, model, field):
+        return (
+            f"`table_name` = {_utf8_literal(model._meta.db_table)} "
+            f"AND `column_name` = {_utf8_literal(field.column)}"
+        )
+
+    def _read_backfill_checkpoint(self, model, field):
+        """
+        Return ``(found, last_key)``: whether a backfill of ``field`` was
+        interrupted, and the key it had got to (None before its first batch).
+        """
+        self.execute(
+            self.sql_create_backfill_table % {"table": self.quote_name(BACKFILL_TABLE)}
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT `last_key` FROM {self.quote_name(BACKFILL_TABLE)} "
+                f"WHERE {self._backfill_checkpoint_where(model, field)};"
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return False, None
+        last_key = None if row[0] is None else model._meta.pk.to_python(row[0])
+        logger.info(
+            "Resuming the backfill of %r.%r after key %r.",
+            model._meta.db_table,
+            field.column,
+            last_key,
+        )
+        return True, last_key
+
+    def _write_backfill_checkpoint(self, model, field, last_key):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"UPSERT INTO {self.quote_name(BACKFILL_TABLE)} "
+                "(`table_name`, `column_name`, `last_key`) VALUES ("
+                f"{_utf8_literal(model._meta.db_table)}, "
+                f"{_utf8_literal(field.column)}, "
+                f"{'NULL' if last_key is None else _utf8_literal(str(last_key))});"
+            )
+
+    def _delete_backfill_checkpoint(self, model, field):
+        """
+        Delete the checkpoint of a finished backfill, and ``BACKFILL_TABLE``
+        once no other backfill has one.
+        """
+        table = self.quote_name(BACKFILL_TABLE)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} "
+                f"WHERE {self._backfill_checkpoint_where(model, field)};"
+            )
+            cursor.execute(f"SELECT 1 FROM {table} LIMIT 1;")
+            interrupted = cursor.fetchone() is not None
+        if not interrupted:
+            self.execute(self.sql_delete_table % {"table": table})
+
     def remove_field(self, model, field):
         """
         Remove a field from a model.
@@ -335,6 +785,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             "column": self.quote_name(field.column),
         }
         self.execute(sql)
+        self._invalidate_statements(model._meta.db_table)
 
     def alter_db_table(self, model, old_db_table, new_db_table):
         """
@@ -352,6 +803,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 "new_table": self.quote_name(new_db_table),
             }
         )
+        self._invalidate_statements(old_db_table)
 
     def create_model(self, model):
         """
@@ -362,6 +814,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         # Prevent using [] as params, in the case a literal '%' is used in the
         # definition.
         self.execute(sql, params or None)
+        self._invalidate_statements(model._meta.db_table)
 
         # Add any field index and index_together's (deferred as SQLite
         # _remake_table needs it).
@@ -390,6 +843,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 "table": self.quote_name(model._meta.db_table),
             }
         )
+        self._invalidate_statements(model._meta.db_table)
         # Remove all deferred statements referencing the deleted table.
         for sql in list(self.deferred_sql):
             if isinstance(sql, Statement) and sql.references_table(
@@ -401,12 +855,31 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         """
         YDB enforces neither uniqueness nor check constraints.
 
+        ``YDBTableOptions`` and ``YDBTTL`` are applied with ``ALTER TABLE ...
+        SET``; a TTL the table already has is left as it is.
+
         The constraint is skipped with a warning rather than created: a hard
         error would break ``migrate`` for stock Django apps (django.contrib.*
         ship unique constraints), while silently materialising it would imply
         an integrity guarantee YDB cannot provide. Enforce such invariants in
         application code.
         """
+        if isinstance(constraint, YDBTableOptions):
+            sql = constraint.create_sql(model, self)
+            if sql is not None:
+                self.execute(sql)
+            return
+        if isinstance(constraint, YDBTTL):
+            current = self._table_ttl(model)
+            wanted = {
+                "columns": [model._meta.get_field(constraint.field).column],
+                "expire_after": constraint.expire_after,
+                "unit": constraint.unit,
+            }
+            if current and all(current[key] == wanted[key] for key in wanted):
+                return
+            self.execute(constraint.create_sql(model, self))
+            return
         logger.warning(
             "YDB does not support database constraints; skipping %s %r on %r. "
             "Enforce this constraint in application code.",
@@ -419,7 +892,16 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         """
         No-op: constraints are never created on YDB (see ``add_constraint``),
         so there is nothing to drop. Kept for migration-executor compatibility.
+
+        Removing ``YDBTableOptions`` restores YDB's default settings, and
+        removing ``YDBTTL`` resets the table's TTL if it has one.
         """
+        if isinstance(constraint, YDBTableOptions):
+            sql = constraint.remove_sql(model, self)
+            if sql is not None:
+                self.execute(sql)
+        elif isinstance(constraint, YDBTTL) and self._table_ttl(model) is not None:
+            self.execute(constraint.remove_sql(model, self))
 
     def alter_field(self, model, old_field, new_field, strict=False):
         """
@@ -438,6 +920,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         old_db_params = old_field.db_parameters(connection=self.connection)
         new_db_params = new_field.db_parameters(connection=self.connection)
         db_table = model._meta.db_table
+        self._invalidate_statements(db_table)
 
         if old_field.column != new_field.column:
             error_message = (
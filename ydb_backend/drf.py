@@ -0,0 +1,94 @@
+"""
+Django REST framework integration.
+
+Importing this module requires ``djangorestframework``; the backend itself
+does not depend on it.
+"""
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.pagination import _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .pagination import KeysetPaginator
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination over ``KeysetPaginator``.
+
+    Like DRF's ``CursorPagination`` the response carries opaque ``next`` and
+    ``previous`` links, but the cursor holds the row's full key (``keys``,
+    with the primary key appended) instead of a single ordering value plus an
+    offset, so every page is one key range read however deep it is.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    keys = ("pk",)
+    cursor_query_param = "cursor"
+    page_size_query_param = None
+    max_page_size = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        paginator = KeysetPaginator(queryset, self.page_size, keys=self.keys)
+        try:
+            self.page = paginator.page(
+                request.query_params.get(self.cursor_query_param)
+            )
+        except InvalidPage as e:
+            msg = "Invalid cursor"
+            raise NotFound(msg) from e
+        return list(self.page)
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.page.next_cursor
+        )
+
+    def get_previous_link(self):
+        if not self.page.has_previous():
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.page.previous_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,256 @@
+"""
+Table settings declared in ``Meta.constraints``.
+
+Django has no model option for per-table storage settings, but it does track
+``Meta.constraints`` in migrations: adding, changing or removing one produces
+``AddConstraint`` / ``RemoveConstraint`` operations, which the schema editor
+applies. ``YDBTableOptions`` uses that to carry a table's partitioning
+settings::
+
+    class Event(models.Model):
+        ...
+
+        class Meta:
+            constraints = [
+                YDBTableOptions(
+                    name="event_partitioning",
+                    auto_partitioning_by_load=True,
+                    min_partitions_count=16,
+                    uniform_partitions=16,
+                ),
+            ]
+
+``CREATE TABLE`` renders them in its ``WITH (...)`` clause, and a migration
+that changes them runs ``ALTER TABLE ... SET (...)``. Nothing is enforced on
+rows: ``validate()`` accepts every instance.
+
+``store="column"`` makes the table column-oriented, for append-only data that
+is mostly aggregated; ``partition_by`` names the fields its rows are
+distributed by (``PARTITION BY HASH(...)``).
+
+``YDBTTL`` has YDB delete rows once a time column is older than a given
+interval, in place of periodic ``QuerySet.delete()`` jobs.
+"""
+from datetime import timedelta
+
+from django.db.models import BaseConstraint
+
+STORES = ("row", "column")
+
+# Argument name -> YDB table setting, in the order they are rendered.
+TABLE_SETTINGS = {
+    "store": "STORE",
+    "auto_partitioning_by_size": "AUTO_PARTITIONING_BY_SIZE",
+    "partition_size_mb": "AUTO_PARTITIONING_PARTITION_SIZE_MB",
+    "auto_partitioning_by_load": "AUTO_PARTITIONING_BY_LOAD",
+    "min_partitions_count": "AUTO_PARTITIONING_MIN_PARTITIONS_COUNT",
+    "max_partitions_count": "AUTO_PARTITIONING_MAX_PARTITIONS_COUNT",
+    "uniform_partitions": "UNIFORM_PARTITIONS",
+    "partition_at_keys": "PARTITION_AT_KEYS",
+}
+# Settings YDB accepts in CREATE TABLE only: they shape the initial partitions.
+CREATE_ONLY_SETTINGS = frozenset(
+    {"store", "uniform_partitions", "partition_at_keys"}
+)
+
+# YDBTTL unit -> the YQL of an integer TTL column's unit.
+TTL_UNITS = {
+    "seconds": "SECONDS",
+    "milliseconds": "MILLISECONDS",
+    "microseconds": "MICROSECONDS",
+    "nanoseconds": "NANOSECONDS",
+}
+
+
+def is_column_table(model):
+    """Return whether ``model``'s table is declared ``store="column"``."""
+    return any(
+        isinstance(constraint, YDBTableOptions) and constraint.store == "column"
+        for constraint in model._meta.constraints
+    )
+
+
+class YDBTableOptions(BaseConstraint):
+    """
+    Storage and partitioning settings of a model's table.
+
+    ``store`` is ``"row"`` (YDB's default) or ``"column"``, and
+    ``partition_by`` the fields a column table is hash-partitioned by; both
+    are fixed when the table is created. A column table has no secondary
+    indexes, so the schema editor skips the model's indexes.
+
+    ``auto_partitioning_by_size`` / ``auto_partitioning_by_load`` enable or
+    disable splitting partitions that grow past ``partition_size_mb`` or take
+    too much load, between ``min_partitions_count`` and
+    ``max_partitions_count`` partitions. ``uniform_partitions`` (a count) or
+    ``partition_at_keys`` (split points, each a primary key value or a tuple
+    of them) set the partitions a new table starts with. Settings left as
+    None keep YDB's defaults.
+    """
+
+    def __init__(
+        self,
+        *,
+        name,
+        store=None,
+        partition_by=None,
+        auto_partitioning_by_size=None,
+        partition_size_mb=None,
+        auto_partitioning_by_load=None,
+        min_partitions_count=None,
+        max_partitions_count=None,
+        uniform_partitions=None,
+        partition_at_keys=None,
+    ):
+        if uniform_partitions is not None and partition_at_keys is not None:
+            msg = (
+                "YDBTableOptions accepts uniform_partitions or partition_at_keys, "
+                "not both."
+            )
+            raise ValueError(msg)
+        if store is not None and store not in STORES:
+            msg = f"YDBTableOptions store must be one of {STORES}, not {store!r}."
+            raise ValueError(msg)
+        if partition_by and store != "column":
+            msg = 'YDBTableOptions partition_by requires store="column".'
+            raise ValueError(msg)
+        self.store = store
+        self.partition_by = tuple(partition_by) if partition_by else ()
+        self.auto_partitioning_by_size = auto_partitioning_by_size
+        self.partition_size_mb = partition_size_mb
+        self.auto_partitioning_by_load = auto_partitioning_by_load
+        self.min_partitions_count = min_partitions_count
+        self.max_partitions_count = max_partitions_count
+        self.uniform_partitions = uniform_partitions
+        self.partition_at_keys = (
+            None if partition_at_keys is None else tuple(partition_at_keys)
+        )
+        super().__init__(name=name)
+
+    @property
+    def settings(self):
+        """The settings given, as ``{argument name: value}``."""
+        return {
+            name: getattr(self, name)
+            for name in TABLE_SETTINGS
+            if getattr(self, name) is not None
+        }
+
+    def constraint_sql(self, model, schema_editor):
+        # Rendered by DatabaseSchemaEditor.table_sql() in CREATE TABLE ... WITH.
+        return None
+
+    def create_sql(self, model, schema_editor):
+        return schema_editor._alter_table_settings_sql(model, self.settings)
+
+    def remove_sql(self, model, schema_editor):
+        return schema_editor._alter_table_settings_sql(
+            model, dict.fromkeys(self.settings)
+        )
+
+    def validate(self, model, instance, exclude=None, using=None):
+        pass
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs.update(self.settings)
+        if self.partition_by:
+            kwargs["partition_by"] = list(self.partition_by)
+        if "partition_at_keys" in kwargs:
+            kwargs["partition_at_keys"] = list(kwargs["partition_at_keys"])
+        return path, args, kwargs
+
+    def __eq__(self, other):
+        if isinstance(other, YDBTableOptions):
+            return (
+                self.name == other.name
+                and self.settings == other.settings
+                and self.partition_by == other.partition_by
+            )
+        return super().__eq__(other)
+
+    def __repr__(self):
+        settings = "".join(
+            f" {name}={value!r}" for name, value in self.settings.items()
+        )
+        if self.partition_by:
+            settings += f" partition_by={list(self.partition_by)!r}"
+        return f"<{self.__class__.__qualname__}: name={self.name!r}{settings}>"
+
+
+class YDBTTL(BaseConstraint):
+    """
+    Expire the rows of a model's table ``expire_after`` (a ``timedelta`` of
+    whole seconds) after the time in ``field``::
+
+        class Session(models.Model):
+            ...
+            expires_at = models.DateTimeField()
+
+            class Meta:
+                constraints = [
+                    YDBTTL(
+                        name="session_ttl",
+                        field="expires_at",
+                        expire_after=timedelta(0),
+                    ),
+                ]
+
+    ``field`` is a date or datetime field, or an integer field holding a
+    Unix time in ``unit`` (``"seconds"``, ``"milliseconds"``,
+    ``"microseconds"`` or ``"nanoseconds"``). YDB deletes expired rows in the
+    background, so they may still be read for a while after they expire.
+    A table has at most one TTL.
+    """
+
+    def __init__(self, *, name, field, expire_after, unit=None):
+        if not isinstance(expire_after, timedelta) or (
+            expire_after < timedelta(0) or expire_after.microseconds
+        ):
+            msg = "YDBTTL expire_after must be a timedelta of whole seconds."
+            raise ValueError(msg)
+        if unit is not None and unit not in TTL_UNITS:
+            msg = f"YDBTTL unit must be one of {tuple(TTL_UNITS)}, not {unit!r}."
+            raise ValueError(msg)
+        self.field = field
+        self.expire_after = expire_after
+        self.unit = unit
+        super().__init__(name=name)
+
+    def constraint_sql(self, model, schema_editor):
+        # Rendered by DatabaseSchemaEditor.table_sql() in CREATE TABLE ... WITH.
+        return None
+
+    def create_sql(self, model, schema_editor):
+        return schema_editor._set_ttl_sql(model, self)
+
+    def remove_sql(self, model, schema_editor):
+        return schema_editor._reset_ttl_sql(model)
+
+    def validate(self, model, instance, exclude=None, using=None):
+        pass
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs["field"] = self.field
+        kwargs["expire_after"] = self.expire_after
+        if self.unit is not None:
+            kwargs["unit"] = self.unit
+        return path, args, kwargs
+
+    def __eq__(self, other):
+        if isinstance(other, YDBTTL):
+            return (
+                self.name == other.name
+                and self.field == other.field
+                and self.expire_after == other.expire_after
+                and self.unit == other.unit
+            )
+        return super().__eq__(other)
+
+    def __repr__(self):
+        unit = "" if self.unit is None else f" unit={self.unit!r}"
+        return (
+            f"<{self.__class__.__qualname__}: name={self.name!r} "
+            f"field={self.field!r} expire_after={self.expire_after!r}{unit}>"
+        )
@@ -0,0 +1,134 @@
+"""
+Cascade deletes in one request.
+
+Django's ``Collector`` deletes a collected object graph statement by
+statement: a DELETE per fast-deleted relation, an UPDATE per ``SET_NULL`` /
+``SET_DEFAULT`` relation and a DELETE per model, each its own round-trip.
+None of them depends on another's result, so ``YDBCollector`` compiles them
+all and sends them as one multi-statement request, counting the deleted rows
+from each DELETE's ``RETURNING`` result set. ``YDBQuerySet.delete()`` and
+``CascadeDeleteMixin.delete()`` use it.
+
+Collecting the graph is unchanged: a SELECT per related model, each taking
+the keys the previous one found, so those are still sent one by one.
+"""
+from collections import Counter
+from functools import reduce
+from operator import attrgetter
+from operator import or_
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db import models
+from django.db import transaction
+from django.db.models import signals
+from django.db.models import sql
+from django.db.models.deletion import Collector
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE
+
+
+class YDBCollector(Collector):
+    """
+    ``Collector`` whose ``delete()`` sends the whole deletion in one request.
+
+    ``pre_delete`` signals are sent before the request and ``post_delete``
+    signals after it, once every collected row is gone.
+    """
+
+    def delete(self):
+        for model, instances in self.data.items():
+            self.data[model] = sorted(instances, key=attrgetter("pk"))
+        self.sort()
+
+        # A single instance without dependencies is one DELETE already.
+        if len(self.data) == 1:
+            (instances,) = self.data.values()
+            if len(instances) == 1 and self.can_fast_delete(instances[0]):
+                return super().delete()
+
+        deleted_counter = Counter()
+        with transaction.atomic(using=self.using, savepoint=False):
+            for model, obj in self.instances_with_model():
+                if not model._meta.auto_created:
+                    signals.pre_delete.send(
+                        sender=model, instance=obj, using=self.using, origin=self.origin
+                    )
+
+            # (label counted, statement), in Django's order: fast deletes,
+            # field updates, then the collected instances.
+            statements = []
+            for qs in self.fast_deletes:
+                query = qs.query.clone()
+                query.__class__ = sql.DeleteQuery
+                self._compile(statements, qs.model._meta.label, query)
+
+            for (field, value), instances_list in self.field_updates.items():
+                updates = []
+                objs = []
+                for instances in instances_list:
+                    if (
+                        isinstance(instances, models.QuerySet)
+                        and instances._result_cache is None
+                    ):
+                        updates.append(instances)
+                    else:
+                        objs.extend(instances)
+                if updates:
+                    query = reduce(or_, updates).query.chain(sql.UpdateQuery)
+                    query.add_update_values({field.name: value})
+                    query.annotations = {}
+                    self._compile(statements, None, query)
+                if objs:
+                    model = objs[0].__class__
+                    pk_list = list({obj.pk for obj in objs})
+                    for batch in _chunks(pk_list):
+                        query = sql.UpdateQuery(model)
+                        query.add_update_values({field.name: value})
+                        query.add_filter("pk__in", batch)
+                        self._compile(statements, None, query)
+
+            for instances in self.data.values():
+                instances.reverse()
+
+            for model, instances in self.data.items():
+                pk_list = [obj.pk for obj in instances]
+                for batch in _chunks(pk_list):
+                    query = sql.DeleteQuery(model)
+                    query.add_filter(f"{model._meta.pk.attname}__in", batch)
+                    self._compile(statements, model._meta.label, query)
+
+            results = connections[self.using].execute_pipeline(
+                [statement for _, statement in statements]
+            )
+            for (label, _), rows in zip(statements, results, strict=True):
+                if label is not None and rows:
+                    deleted_counter[label] += len(rows)
+
+            for model, instances in self.data.items():
+                if not model._meta.auto_created:
+                    for obj in instances:
+                        signals.post_delete.send(
+                            sender=model,
+                            instance=obj,
+                            using=self.using,
+                            origin=self.origin,
+                        )
+
+        for model, instances in self.data.items():
+            for instance in instances:
+                setattr(instance, model._meta.pk.attname, None)
+        return sum(deleted_counter.values()), dict(deleted_counter)
+
+    def _compile(self, statements, label, query):
+        try:
+            statement = query.get_compiler(self.using).as_sql()
+        except EmptyResultSet:
+            return
+        if statement[0]:
+            connections[self.using].record_write(query.model)
+            statements.append((label, statement))
+
+
+def _chunks(pk_list):
+    for offset in range(0, len(pk_list), GET_ITERATOR_CHUNK_SIZE):
+        yield pk_list[offset : offset + GET_ITERATOR_CHUNK_SIZE]
@@ -0,0 +1,54 @@
+"""
+Secondary indexes with YDB's own options.
+
+A ``GLOBAL`` index is updated in the same distributed transaction as every
+write to its table, which makes writes slower. A ``GLOBAL ASYNC`` index is
+updated in the background: it may lag behind the table, but the write does
+not wait for it. ``YDBIndex`` declares either in ``Meta.indexes``::
+
+    class Order(models.Model):
+        ...
+
+        class Meta:
+            indexes = [
+                YDBIndex(
+                    fields=["customer"],
+                    name="order_customer",
+                    sync=False,
+                    cover=["status"],
+                ),
+            ]
+
+``cover`` lists the fields the index stores as well (``COVER (...)``), so a
+query reading only them is answered from the index.
+"""
+from django.db.models import Index
+
+
+class YDBIndex(Index):
+    """
+    An ``Index`` that is ``GLOBAL ASYNC`` when ``sync`` is False and covers
+    the ``cover`` fields (Django's ``include``).
+    """
+
+    def __init__(self, *expressions, sync=True, cover=None, **kwargs):
+        if cover and kwargs.get("include"):
+            msg = "YDBIndex accepts cover or include, not both."
+            raise ValueError(msg)
+        if cover:
+            kwargs["include"] = cover
+        self.sync = sync
+        super().__init__(*expressions, **kwargs)
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if not self.sync:
+            kwargs.setdefault("sql", schema_editor.sql_create_async_index)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        if "include" in kwargs:
+            kwargs["cover"] = kwargs.pop("include")
+        if not self.sync:
+            kwargs["sync"] = False
+        return path, args, kwargs
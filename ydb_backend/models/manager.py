@@ -2,16 +2,23 @@ from django.db import NotSupportedError
 from django.db import models
 from django.db import router
 
+from .query import YDBQuerySet
 from .sql.query import UpsertQuery
 
+# Rows per BulkUpsert request when bulk_upsert(mode="bulk") is not given a
+# batch_size.
+BULK_UPSERT_BATCH_SIZE = 10_000
 
-class YDBManager(models.Manager):
+
+class YDBManager(models.Manager.from_queryset(YDBQuerySet)):
     """Default manager that adds native YDB ``UPSERT INTO`` to a model.
 
     Set ``objects = YDBManager()`` on a model and call ``upsert()`` /
     ``bulk_upsert()``. Rows are matched by primary key: an existing row has its
     listed columns overwritten and a missing row is inserted, in a single
     atomic statement (no read-modify-write, so no race window).
+
+    Querysets are ``YDBQuerySet``, which adds keyset pagination via ``seek()``.
     """
 
     def upsert(self, obj, conflict_target=None, update_fields=None):
@@ -22,7 +29,15 @@ class YDBManager(models.Manager):
             update_fields=update_fields,
         )[0]
 
-    def bulk_upsert(self, objs, conflict_target=None, update_fields=None):
+    def bulk_upsert(
+        self,
+        objs,
+        conflict_target=None,
+        update_fields=None,
+        mode="statement",
+        batch_size=None,
+        max_workers=None,
+    ):
         """UPSERT model instances and/or dicts; return the instances.
 
         ``conflict_target`` is accepted for API symmetry but must name the
@@ -31,7 +46,19 @@ class YDBManager(models.Manager):
         are written (all concrete fields by default). Columns left out are
         preserved on existing rows; omitting a NOT NULL column without a default
         will fail when a brand-new row has to be inserted.
+
+        ``mode="bulk"`` sends the rows through YDB's BulkUpsert RPC instead of
+        an ``UPSERT INTO`` statement: much cheaper per row and not bound by the
+        query size limit, but not transactional. Rows are sent ``batch_size``
+        at a time (``BULK_UPSERT_BATCH_SIZE`` by default), over ``max_workers``
+        concurrent requests when given, and every primary key must be set.
         """
+        if mode not in ("statement", "bulk"):
+            msg = f"mode must be 'statement' or 'bulk', not {mode!r}."
+            raise ValueError(msg)
+        if mode != "bulk" and (batch_size is not None or max_workers is not None):
+            msg = "batch_size and max_workers only apply to mode='bulk'."
+            raise ValueError(msg)
         if not objs:
             return []
 
@@ -52,6 +79,17 @@ class YDBManager(models.Manager):
         )
         using = self._db or router.db_for_write(self.model)
         compiler = query.get_compiler(using=using)
+        if mode == "bulk":
+            if auto_pk and any(obj.pk is None for obj in objs):
+                msg = (
+                    "BulkUpsert cannot generate primary keys; set the primary "
+                    "key of every row or use mode='statement'."
+                )
+                raise NotSupportedError(msg)
+            compiler.execute_bulk_upsert(
+                batch_size or BULK_UPSERT_BATCH_SIZE, max_workers
+            )
+            return objs
         rows = compiler.execute_sql(
             returning_fields=[opts.pk] if auto_pk else None
         )
@@ -0,0 +1,123 @@
+from django.db import models
+from django.db import router
+
+from .deletion import YDBCollector
+from .sql.query import UpsertQuery
+
+
+class UpsertOnSaveMixin(models.Model):
+    """Model mixin that makes ``save()`` a single native ``UPSERT INTO``.
+
+    Django saves an instance with a primary key as an UPDATE and, when that
+    matched no row, an INSERT: two round-trips for a new row. With this mixin
+    the same save is one UPSERT keyed on the primary key, which needs no read
+    and cannot race with a concurrent insert of the same key::
+
+        class Reading(UpsertOnSaveMixin, models.Model):
+            sensor = models.CharField(max_length=40, primary_key=True)
+            value = models.FloatField()
+
+    ``save()`` falls back to Django's UPDATE/INSERT when the outcome depends
+    on whether the row exists: ``force_insert`` / ``force_update``, a primary
+    key still to be generated by the database, ``auto_now_add`` fields,
+    ``order_with_respect_to``, multi-table inheritance, fields read back after
+    an insert, and ``update_fields`` that leave out a NOT NULL column (YDB
+    UPSERT writes every NOT NULL column). Otherwise ``save(update_fields=...)``
+    upserts the listed columns, so it inserts a missing row instead of raising
+    ``DatabaseError``. ``post_save`` receives ``created=True`` for an instance
+    not loaded from the database, as the UPSERT itself does not tell.
+    """
+
+    class Meta:
+        abstract = True
+
+    def _save_table(
+        self,
+        raw=False,
+        cls=None,
+        force_insert=False,
+        force_update=False,
+        using=None,
+        update_fields=None,
+    ):
+        fields = (
+            None
+            if raw or force_insert or force_update
+            else self._upsert_fields(cls, update_fields)
+        )
+        if fields is None:
+            return super()._save_table(
+                raw, cls, force_insert, force_update, using, update_fields
+            )
+        query = UpsertQuery(cls)
+        query.insert_values(fields, [self])
+        query.get_compiler(using=using).execute_sql()
+        # Report an update for a row loaded from the database, an insert for
+        # a new instance: what save_base() passes to post_save as ``created``.
+        return not self._state.adding
+
+    def _upsert_fields(self, cls, update_fields):
+        """
+        Return the fields to UPSERT, or None when the save has to tell an
+        existing row from a missing one.
+        """
+        meta = cls._meta
+        if (
+            self._meta.parents
+            or meta.order_with_respect_to
+            or any(field is not meta.pk for field in meta.db_returning_fields)
+            or any(getattr(field, "auto_now_add", False) for field in meta.fields)
+        ):
+            return None
+        if self._get_pk_val(meta) is None:
+            setattr(self, meta.pk.attname, meta.pk.get_pk_value_on_save(self))
+            if self._get_pk_val(meta) is None:
+                return None
+        fields = [
+            field
+            for field in meta.local_concrete_fields
+            if not getattr(field, "generated", False)
+            and (
+                field.primary_key
+                or not update_fields
+                or field.name in update_fields
+                or field.attname in update_fields
+            )
+        ]
+        if any(
+            not field.null and field not in fields
+            for field in meta.local_concrete_fields
+            if not getattr(field, "generated", False)
+        ):
+            return None
+        return fields
+
+
+class CascadeDeleteMixin(models.Model):
+    """Model mixin that sends ``Model.delete()`` as one request.
+
+    Django deletes an instance and the rows cascaded from it a statement at a
+    time; with this mixin the deletion goes through ``YDBCollector``, as
+    ``YDBQuerySet.delete()`` does, so the admin's delete view and other
+    ``obj.delete()`` calls need one request after the collecting SELECTs::
+
+        class Warehouse(CascadeDeleteMixin, models.Model):
+            code = models.CharField(max_length=20, primary_key=True)
+    """
+
+    class Meta:
+        abstract = True
+
+    def delete(self, using=None, keep_parents=False):
+        if self.pk is None:
+            msg = (
+                f"{self._meta.object_name} object can't be deleted because its "
+                f"{self._meta.pk.attname} attribute is set to None."
+            )
+            raise ValueError(msg)
+        using = using or router.db_for_write(self.__class__, instance=self)
+        collector = YDBCollector(using=using, origin=self)
+        collector.collect([self], keep_parents=keep_parents)
+        return collector.delete()
+
+    delete.alters_data = True
@@ -0,0 +1,438 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError
+from django.db import connections
+from django.db import models
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Value
+from django.db.models import signals
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import Expression
+from django.db.models.query import MAX_GET_RESULTS
+from django.db.models.sql import InsertQuery
+from django.db.models.sql import UpdateQuery
+from django.db.models.sql.where import AND
+from django.db.models.sql.where import ExtraWhere
+from django.db.models.utils import resolve_callables
+
+from ydb_backend.backend import aio
+
+from .deletion import YDBCollector
+
+
+class _RowValueComparison(Expression):
+    """
+    ``(k1, k2, ...) > (v1, v2, ...)``: compare columns with the key values of a
+    row, lexicographically, as one condition YDB can turn into a key range.
+
+    Each value is bound as a parameter typed by its column's field.
+    """
+
+    conditional = True
+
+    def __init__(self, columns, values, operator):
+        super().__init__(output_field=models.BooleanField())
+        self.columns = list(columns)
+        self.values = list(values)
+        self.operator = operator
+
+    def get_source_expressions(self):
+        return [*self.columns, *self.values]
+
+    def set_source_expressions(self, exprs):
+        self.columns = exprs[: len(self.columns)]
+        self.values = exprs[len(self.columns) :]
+
+    def as_sql(self, compiler, connection):
+        columns, values, params = [], [], []
+        for expressions, parts in ((self.columns, columns), (self.values, values)):
+            for expression in expressions:
+                sql, expression_params = compiler.compile(expression)
+                parts.append(sql)
+                params.extend(expression_params)
+        return (
+            f"({', '.join(columns)}) {self.operator} ({', '.join(values)})",
+            params,
+        )
+
+
+def keyset_fields(model, keys):
+    """
+    Resolve keyset ``keys`` of ``model`` to ``[(name, field), ...]`` and the
+    shared direction (True for descending).
+
+    ``keys`` are field names (or ``"pk"``), all ascending or all descending
+    (``"-name"``): a single row-value comparison cannot mix directions.
+    """
+    if not keys:
+        msg = "Keyset pagination needs at least one key."
+        raise ValueError(msg)
+    descending = {key.startswith("-") for key in keys}
+    if len(descending) > 1:
+        msg = f"Keyset keys must all sort in the same direction, got {keys!r}."
+        raise ValueError(msg)
+    opts = model._meta
+    fields = []
+    for key in keys:
+        name = key.removeprefix("-")
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            msg = f"Keyset key {name!r} is not a field of {opts.label}."
+            raise ValueError(msg) from None
+        if not field.concrete or field.many_to_many or field.one_to_many:
+            msg = f"Keyset key {name!r} must be a column of {opts.label}."
+            raise ValueError(msg)
+        fields.append((name, field))
+    return fields, descending.pop()
+
+
+def seek(queryset, keys=("pk",), after=None, before=None):
+    """
+    Keyset ("seek") filter ``queryset``: order it by ``keys`` and keep the rows
+    strictly after the key values ``after`` or, in reverse order (nearest
+    first), strictly before ``before``.
+
+    Slice the result to the page size. Unlike ``LIMIT``/``OFFSET`` the
+    database starts reading at the previous page's last key instead of
+    reading and discarding every earlier row, so page N costs the same as
+    page 1. ``keys`` should identify a row uniquely (e.g. end with the primary
+    key) so that no row is skipped or repeated between pages.
+    """
+    if after is not None and before is not None:
+        msg = "Pass either after or before, not both."
+        raise ValueError(msg)
+    fields, descending = keyset_fields(queryset.model, keys)
+    bound = after if after is not None else before
+    reverse = before is not None
+    if bound is not None:
+        bound = tuple(bound)
+        if len(bound) != len(fields):
+            msg = f"Expected {len(fields)} key value(s), got {len(bound)}."
+            raise ValueError(msg)
+        # Ascending keys continue upwards after a row and downwards before it;
+        # descending keys the other way around.
+        operator = "<" if descending != reverse else ">"
+        if len(fields) == 1:
+            lookup = "lt" if operator == "<" else "gt"
+            queryset = queryset.filter(**{f"{fields[0][0]}__{lookup}": bound[0]})
+        else:
+            queryset = queryset.filter(
+                _RowValueComparison(
+                    [F(name) for name, _ in fields],
+                    [
+                        Value(value, output_field=field)
+                        for (_, field), value in zip(fields, bound, strict=True)
+                    ],
+                    operator,
+                )
+            )
+    prefix = "-" if descending != reverse else ""
+    return queryset.order_by(*(f"{prefix}{name}" for name, _ in fields))
+
+
+class YDBQuerySet(models.QuerySet):
+    """
+    QuerySet with YDB-specific helpers, returned by ``YDBManager``.
+
+    Its async read methods run on the event loop instead of in a worker
+    thread when the alias sets ``OPTIONS["async_native"]`` (see
+    ``ydb_backend.backend.aio``), and ``delete()`` sends a cascade in one
+    request (see ``ydb_backend.models.deletion``).
+    """
+
+    def seek(self, keys=("pk",), after=None, before=None):
+        """Keyset-paginate this queryset; see ``ydb_backend.models.query.seek``."""
+        return seek(self, keys, after=after, before=before)
+
+    def delete(self):
+        """Delete the records in the current QuerySet."""
+        # QuerySet.delete() with YDBCollector in place of Collector.
+        self._not_support_combined_queries("delete")
+        if self.query.is_sliced:
+            msg = "Cannot use 'limit' or 'offset' with delete()."
+            raise TypeError(msg)
+        if self.query.distinct_fields:
+            msg = "Cannot call delete() after .distinct(*fields)."
+            raise TypeError(msg)
+        if self._fields is not None:
+            msg = "Cannot call delete() after .values() or .values_list()"
+            raise TypeError(msg)
+
+        del_query = self._chain()
+        del_query._for_write = True
+        del_query.query.select_for_update = False
+        del_query.query.select_related = False
+        del_query.query.clear_ordering(force=True)
+
+        collector = YDBCollector(using=del_query.db, origin=self)
+        collector.collect(del_query)
+        num_deleted, num_deleted_per_model = collector.delete()
+
+        self._result_cache = None
+        return num_deleted, num_deleted_per_model
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def get_or_create(self, defaults=None, **kwargs):
+        """
+        Like ``QuerySet.get_or_create()``, as one request when the lookup is
+        by field values (see ``_get_or_write``).
+        """
+        if not self._writes_in_one_request(kwargs, defaults):
+            return super().get_or_create(defaults, **kwargs)
+        try:
+            return self._get_or_write(kwargs, dict(defaults or {}), None)
+        except IntegrityError:
+            # A concurrent insert of the same key won: let Django find it.
+            return super().get_or_create(defaults, **kwargs)
+
+    get_or_create.alters_data = True
+
+    def update_or_create(self, defaults=None, create_defaults=None, **kwargs):
+        """
+        Like ``QuerySet.update_or_create()``, as one request when the lookup
+        is by field values (see ``_get_or_write``).
+        """
+        update_defaults = dict(defaults or {})
+        if create_defaults is None:
+            create_defaults = update_defaults
+        if not self._writes_in_one_request(
+            kwargs, update_defaults, create_defaults, updating=True
+        ) or self._updates_lookup(kwargs, update_defaults):
+            if create_defaults is update_defaults:
+                return super().update_or_create(defaults, **kwargs)
+            return super().update_or_create(defaults, create_defaults, **kwargs)
+        try:
+            return self._get_or_write(kwargs, dict(create_defaults), update_defaults)
+        except IntegrityError:
+            if create_defaults is update_defaults:
+                return super().update_or_create(defaults, **kwargs)
+            return super().update_or_create(defaults, create_defaults, **kwargs)
+
+    update_or_create.alters_data = True
+
+    def _writes_in_one_request(self, kwargs, *defaults, updating=False):
+        """
+        Whether get_or_create()/update_or_create() can skip ``save()``: the
+        lookup and defaults name concrete fields, and no ``save()`` override,
+        signal receiver or ``pre_save()`` override depends on the model
+        instance being saved.
+        """
+        meta = self.model._meta
+        if (
+            self.query.is_sliced
+            or self.query.combinator
+            or meta.parents
+            or meta.order_with_respect_to
+            or self.model.save is not models.Model.save
+            or signals.pre_save.has_listeners(self.model)
+            or signals.post_save.has_listeners(self.model)
+        ):
+            return False
+        names = [*kwargs]
+        for values in defaults:
+            names.extend(values or {})
+        for name in names:
+            if LOOKUP_SEP in name:
+                return False
+            if name == "pk":
+                continue
+            try:
+                field = meta.get_field(name)
+            except FieldDoesNotExist:
+                return False
+            if not field.concrete or field.many_to_many:
+                return False
+        # update_or_create() also writes the fields that pre_save() sets,
+        # e.g. auto_now; their value is only known from the saved instance.
+        return not updating or all(
+            field.primary_key or field.__class__.pre_save is models.Field.pre_save
+            for field in meta.local_concrete_fields
+        )
+
+    def _updates_lookup(self, kwargs, update_defaults):
+        """
+        Whether ``update_defaults`` write a field that the lookup, or the
+        queryset's own filters, read. The INSERT's test of ``$existing`` may
+        then see the UPDATE's effects (YDB applies a query's writes
+        immediately) and create a duplicate.
+        """
+        meta = self.model._meta
+
+        def field(name):
+            return meta.pk if name == "pk" else meta.get_field(name)
+
+        updated = {field(name) for name in update_defaults}
+        if not updated:
+            return False
+        if any(field(name) in updated for name in kwargs):
+            return True
+        stack = [self.query.where]
+        while stack:
+            node = stack.pop()
+            if not hasattr(node, "get_source_expressions"):
+                # e.g. ExtraWhere: the columns it reads are unknown.
+                return True
+            if getattr(node, "target", None) in updated:
+                return True
+            stack.extend(
+                expr for expr in node.get_source_expressions() if expr is not None
+            )
+        return False
+
+    def _get_or_write(self, kwargs, create_defaults, update_defaults):
+        """
+        Look up the object matching ``kwargs`` and, in the same request, create
+        it from ``kwargs`` and ``create_defaults`` when it is missing, or, given
+        ``update_defaults``, update it when it exists. Return
+        ``(obj, created)``.
+
+        The lookup is bound as a named subquery, ``$existing``, that the writes
+        test: the INSERT runs when it is empty and the UPDATE when it holds
+        exactly one row. ``$existing`` is evaluated lazily, so the INSERT's
+        test can see the UPDATE's writes; update_or_create() therefore comes
+        here only when the update leaves the looked-up fields alone (see
+        ``_updates_lookup``).
+        """
+        self._for_write = True
+        using = self.db
+        connection = connections[using]
+        meta = self.model._meta
+        qn = connection.ops.quote_name
+        lookup = self.filter(**kwargs)
+        create_defaults = dict(resolve_callables(create_defaults))
+        update_defaults = dict(resolve_callables(update_defaults or {}))
+
+        fields = meta.concrete_fields
+        select = lookup.values_list(*(field.attname for field in fields))
+        select.query.clear_ordering(force=True)
+        select.query.set_limits(high=MAX_GET_RESULTS)
+        select_compiler = select.query.get_compiler(using)
+        select_sql, select_params = select_compiler.as_sql()
+        columns = ", ".join(qn(field.column) for field in fields)
+        statements = [
+            (
+                f"$existing = ({select_sql});\nSELECT {columns} FROM $existing",
+                select_params,
+            )
+        ]
+
+        if update_defaults:
+            update = lookup.query.chain(UpdateQuery)
+            update.add_update_values(update_defaults)
+            update.annotations = {}
+            update.where.add(
+                ExtraWhere(["(SELECT COUNT(*) FROM $existing) == 1"], []), AND
+            )
+            statements.append(update.get_compiler(using).as_sql())
+
+        params = {k: v for k, v in kwargs.items() if LOOKUP_SEP not in k}
+        params.update(create_defaults)
+        obj = self.model(**params)
+        pk_set = obj.pk is not None
+        if not pk_set:
+            obj.pk = meta.pk.get_pk_value_on_save(obj)
+            pk_set = obj.pk is not None
+        insert = InsertQuery(self.model)
+        insert.insert_values(
+            [
+                field
+                for field in meta.local_concrete_fields
+                if not getattr(field, "generated", False)
+                and (pk_set or field is not meta.auto_field)
+            ],
+            [obj],
+        )
+        # RETURNING tells whether the row was inserted, and its generated key.
+        (insert_statement,) = insert.get_compiler(using).as_sql(
+            [meta.pk.column], condition="(SELECT COUNT(*) FROM $existing) == 0"
+        )
+        statements.append(insert_statement)
+
+        connection.record_write(self.model)
+        with transaction.mark_for_rollback_on_error(using):
+            results = connection.execute_pipeline(statements)
+        existing, inserted = results[0], results[-1]
+
+        if inserted:
+            if not pk_set:
+                obj.pk = inserted[0][0]
+            obj._state.adding = False
+            obj._state.db = using
+            return obj, True
+        if len(existing) > 1:
+            count = len(existing)
+            if count == MAX_GET_RESULTS:
+                count = f"more than {MAX_GET_RESULTS - 1}"
+            msg = (
+                f"get() returned more than one {meta.object_name} -- it returned "
+                f"{count}!"
+            )
+            raise self.model.MultipleObjectsReturned(msg)
+        if not existing:
+            # Only when the created object would not match the lookup.
+            msg = f"{meta.object_name} matching query does not exist."
+            raise self.model.DoesNotExist(msg)
+        converters = select_compiler.get_converters(
+            [column for column, _, _ in select_compiler.select]
+        )
+        if converters:
+            existing = list(select_compiler.apply_converters(existing, converters))
+        (row,) = existing
+        obj = self.model.from_db(using, [field.attname for field in fields], row)
+        for name, value in update_defaults.items():
+            setattr(obj, name, value)
+        return obj, False
+
+    def __aiter__(self):
+        async def generator():
+            await aio.run(self.db, self._fetch_all)
+            for item in self._result_cache:
+                yield item
+
+        return generator()
+
+    async def aiterator(self, chunk_size=2000):
+        if not aio.native_enabled(self.db):
+            async for item in super().aiterator(chunk_size):
+                yield item
+            return
+        # The async driver reads a result whole, so there is nothing to
+        # stream; the rows are converted as one chunk.
+        items = await aio.run(self.db, lambda: list(self.iterator(chunk_size)))
+        for item in items:
+            yield item
+
+    async def aget(self, *args, **kwargs):
+        return await aio.run(self.db, lambda: self.get(*args, **kwargs))
+
+    async def acount(self):
+        return await aio.run(self.db, self.count)
+
+    async def aexists(self):
+        return await aio.run(self.db, self.exists)
+
+    async def acontains(self, obj):
+        return await aio.run(self.db, lambda: self.contains(obj))
+
+    async def afirst(self):
+        return await aio.run(self.db, self.first)
+
+    async def alast(self):
+        return await aio.run(self.db, self.last)
+
+    async def aearliest(self, *fields):
+        return await aio.run(self.db, lambda: self.earliest(*fields))
+
+    async def alatest(self, *fields):
+        return await aio.run(self.db, lambda: self.latest(*fields))
+
+    async def aaggregate(self, *args, **kwargs):
+        return await aio.run(self.db, lambda: self.aggregate(*args, **kwargs))
+
+    async def ain_bulk(self, id_list=None, *, field_name="pk"):
+        return await aio.run(
+            self.db, lambda: self.in_bulk(id_list, field_name=field_name)
+        )
@@ -0,0 +1,230 @@
+"""Opt-in cache of compiled SELECT statements, keyed on the query's shape.
+
+Compiling a queryset to YQL walks the whole expression tree on every
+execution, even when an application issues the same shape of query (e.g.
+``Model.objects.get(pk=...)``) over and over with different values. When
+``DATABASES[alias]["OPTIONS"]["statement_cache_size"]`` is set, the select
+compiler fingerprints simple queries -- a single table, a ``WHERE`` tree of
+plain column lookups against literal values, plain field ordering and slicing --
+and reuses the YQL text and per-parameter types compiled for that shape, so a
+repeat execution only binds its new values.
+
+Anything outside that subset (joins, annotations, ``extra()``, subqueries,
+expressions on either side of a lookup, ...) is compiled as usual and never
+cached.
+"""
+
+import threading
+from collections import OrderedDict
+from collections import namedtuple
+
+from django.core.exceptions import EmptyResultSet
+from django.core.exceptions import FullResultSet
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+from django.db.models.sql.where import WhereNode
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# A compiled statement: the final YQL text, its ``$element_N`` names, the Django
+# internal type of every parameter (what ``_resolve_typed_params`` consumes) and
+# the compiler state a cache hit must restore.
+CachedStatement = namedtuple(
+    "CachedStatement", ["sql", "placeholders", "param_types", "has_extra_select"]
+)
+
+# Lookups whose SQL depends only on the column and the number of bound values.
+# ``isnull`` binds nothing; its value is part of the shape instead.
+_CACHEABLE_LOOKUPS = frozenset(
+    {
+        "exact",
+        "iexact",
+        "gt",
+        "gte",
+        "lt",
+        "lte",
+        "in",
+        "range",
+        "contains",
+        "icontains",
+        "startswith",
+        "istartswith",
+        "endswith",
+        "iendswith",
+        "isnull",
+    }
+)
+
+
+class _Uncacheable(Exception):  # noqa: N818
+    """Raised while fingerprinting a query that falls outside the cached subset."""
+
+
+class StatementCache:
+    """A thread-safe LRU map of query fingerprints to compiled statements.
+
+    Entries remember the table they read so the schema editor can drop them
+    when the table changes (see ``invalidate``).
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                _, statement = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return statement
+
+    def put(self, key, table, statement):
+        with self._lock:
+            self._entries[key] = (table, statement)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize):
+        """Bound the cache to ``maxsize`` entries, evicting the oldest."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, table):
+        """Drop every cached statement that reads ``table``."""
+        with self._lock:
+            stale = [key for key, (t, _) in self._entries.items() if t == table]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+# One cache per database alias, shared by every thread's DatabaseWrapper so a
+# schema change made through one connection invalidates all of them.
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_statement_cache(alias, maxsize):
+    """
+    Return the process-wide statement cache for ``alias``, resized in place
+    if ``maxsize`` has changed so that every connection keeps sharing it.
+    """
+    with _caches_lock:
+        cache = _caches.get(alias)
+        if cache is None:
+            cache = _caches[alias] = StatementCache(maxsize)
+        elif cache.maxsize != maxsize:
+            cache.resize(maxsize)
+        return cache
+
+
+def _has_expression(value):
+    if hasattr(value, "resolve_expression"):
+        return True
+    if isinstance(value, list | tuple | set | frozenset):
+        return any(hasattr(v, "resolve_expression") for v in value)
+    return False
+
+
+def _where_shape(node, compiler, values):
+    if isinstance(node, WhereNode):
+        return (
+            node.connector,
+            node.negated,
+            tuple(_where_shape(child, compiler, values) for child in node.children),
+        )
+    if (
+        not isinstance(node, Lookup)
+        or node.lookup_name not in _CACHEABLE_LOOKUPS
+        or type(node.lhs) is not Col
+        or node.bilateral_transforms
+        or _has_expression(node.rhs)
+    ):
+        raise _Uncacheable
+    column = (type(node), node.lhs.alias, node.lhs.target, node.lhs.output_field)
+    if node.lookup_name == "isnull":
+        return (*column, bool(node.rhs))
+    # Compile the lookup itself so the values come out exactly as the statement
+    # binds them (e.g. an ``in`` list as a single List parameter).
+    _, params = compiler.compile(node)
+    values.extend(params)
+    return (*column, len(params))
+
+
+def fingerprint(compiler, with_limits, with_col_aliases):
+    """
+    Return ``(key, values)`` for a cacheable top-level SELECT, or ``None``.
+
+    ``key`` identifies the shape of the query -- everything that influences
+    the compiled YQL text -- and ``values`` are its bound parameters in
+    placeholder order, prepared exactly as compilation would prepare them.
+    """
+    query = compiler.query
+    if (
+        query.model is None
+        or query.subquery
+        or query.combinator
+        or query.annotations
+        or query.extra
+        or query.extra_tables
+        or query.extra_order_by
+        or query.select_related
+        or query.group_by is not None
+        or query.explain_info
+        # Compiling it checks the transaction and the backend's row locking,
+        # and may add FOR UPDATE and its options; a hit would skip all that.
+        or query.select_for_update
+        or len(query.alias_map) > 1
+        # An open-ended slice warns when compiled; keep that visible.
+        or (with_limits and query.low_mark and query.high_mark is None)
+    ):
+        return None
+    if any(type(col) is not Col for col in query.select) or any(
+        not isinstance(term, str) for term in query.order_by
+    ):
+        return None
+    values = []
+    try:
+        where = _where_shape(query.where, compiler, values)
+    except (_Uncacheable, EmptyResultSet, FullResultSet):
+        return None
+    deferred_names, defer = query.deferred_loading
+    key = (
+        query.model,
+        with_limits,
+        with_col_aliases,
+        compiler.elide_empty,
+        query.default_cols,
+        tuple((col.alias, col.target) for col in query.select),
+        tuple(query.values_select),
+        (frozenset(deferred_names), defer),
+        query.distinct,
+        tuple(query.distinct_fields),
+        tuple(query.order_by),
+        query.default_ordering,
+        query.standard_ordering,
+        query.low_mark,
+        query.high_mark,
+        where,
+    )
+    return key, values
@@ -1,4 +1,6 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import date
 from datetime import datetime
 from datetime import time
@@ -14,6 +16,7 @@ from django.db import DatabaseError
 from django.db import IntegrityError
 from django.db import NotSupportedError
 from django.db import models
+from django.db import transaction
 from django.db.models.expressions import Col
 from django.db.models.expressions import RawSQL
 from django.db.models.functions import Random
@@ -23,6 +26,11 @@ from django.db.models.sql.compiler import SQLAggregateCompiler
 from django.db.models.sql.compiler import SQLCompiler
 from django.db.models.sql.query import Query
 
+from ydb_backend.backend import aio
+
+from .cache import CachedStatement
+from .cache import fingerprint
+
 _ydb_types = {
     "AutoField": ydb.PrimitiveType.Int32,
     "BigAutoField": ydb.PrimitiveType.Int64,
@@ -117,20 +125,34 @@ class _ParamTypingMixin:
             self._captured_types = previous
 
 
-def _replace_placeholders(sql):
-    placeholder_rows = []
-    counter = 1
+# String literals may carry a YQL type suffix, e.g. ``'x'u`` (Utf8).
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'[a-zA-Z]*")
 
-    while "%s" in sql:
-        sql = sql.replace("%s", f"${'element_' + str(counter)}", 1)
-        placeholder_rows.append("$element_" + str(counter))
-        counter += 1
+# A ``%s`` placeholder, or a string literal / backtick-quoted identifier that is
+# copied through untouched so a "%s" inside one is not taken for a parameter.
+_PLACEHOLDER_TOKEN = re.compile(rf"{_STRING_LITERAL.pattern}|`[^`]*`|%s")
 
-    return sql, placeholder_rows
 
+def _replace_placeholders(sql):
+    """
+    Name every ``%s`` placeholder in ``sql`` as ``$element_N`` (1-based, in
+    order of appearance) and return ``(sql, names)``.
 
-# String literals may carry a YQL type suffix, e.g. ``'x'u`` (Utf8).
-_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'[a-zA-Z]*")
+    The statement is rewritten in a single scan, so the cost is linear in the
+    SQL length rather than in length times the number of parameters (a large
+    ``__in`` list or ``Q`` tree emits thousands of placeholders).
+    """
+    placeholder_rows = []
+
+    def name(match):
+        text = match.group()
+        if text != "%s":
+            return text
+        placeholder = f"$element_{len(placeholder_rows) + 1}"
+        placeholder_rows.append(placeholder)
+        return placeholder
+
+    return _PLACEHOLDER_TOKEN.sub(name, sql), placeholder_rows
 
 
 def _is_constant_sql(sql):
@@ -228,7 +250,94 @@ class _TypedParam:
         self.ydb_type = ydb_type
 
 
+class _ListParam:
+    """
+    The values of an ``__in`` lookup, bound as one ``List<T>`` parameter.
+
+    ``In.as_ydb`` (see operations.py) compiles ``col IN %s`` with a single
+    ``_ListParam`` instead of one placeholder per value, so every list length
+    shares one query text. Each element is resolved like any other parameter
+    of the lookup, and ``_list_type`` unifies their types.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    # The statement cache compares bound values to tell a hit from a miss.
+    def __eq__(self, other):
+        return isinstance(other, _ListParam) and self.values == other.values
+
+    def __hash__(self):
+        return hash(tuple(self.values))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.values!r})"
+
+
+_INTEGER_TYPES = frozenset(
+    str(t)
+    for t in (
+        ydb.PrimitiveType.Int16,
+        ydb.PrimitiveType.Uint16,
+        ydb.PrimitiveType.Int32,
+        ydb.PrimitiveType.Uint32,
+        ydb.PrimitiveType.Int64,
+        ydb.PrimitiveType.Uint64,
+    )
+)
+_FLOAT_TYPES = frozenset(
+    str(t) for t in (ydb.PrimitiveType.Float, ydb.PrimitiveType.Double)
+)
+_INT64_MAX = 2**63 - 1
+
+
+def _list_type(field_type, items):
+    """
+    Return the ``List<T>`` type of the resolved ``(value, ydb_type)`` items.
+
+    Elements of one type give ``List<T>``. Integers of different widths widen
+    to Int64 (Uint64 when a value exceeds Int64), integers mixed with floats to
+    Double, and NULLs make the element Optional. Any other mix cannot be one
+    list and raises ValueError.
+    """
+    types = {}
+    optional = False
+    for value, ydb_type in items:
+        if value is None:
+            optional = True
+        else:
+            types.setdefault(str(ydb_type), ydb_type)
+    if len(types) == 1:
+        (element,) = types.values()
+    elif not types:
+        # Only NULLs (or nothing): the field's type, if it has one.
+        if isinstance(field_type, ydb.DecimalType):
+            element = field_type
+        else:
+            element = _ydb_types.get(field_type, ydb.PrimitiveType.Utf8)
+    elif types.keys() <= _INTEGER_TYPES:
+        big = any(value is not None and value > _INT64_MAX for value, _ in items)
+        element = ydb.PrimitiveType.Uint64 if big else ydb.PrimitiveType.Int64
+    elif types.keys() <= _INTEGER_TYPES | _FLOAT_TYPES:
+        element = ydb.PrimitiveType.Double
+    else:
+        msg = f"Cannot bind values of types {', '.join(types)} as one YDB list"
+        raise ValueError(msg)
+    if optional and not isinstance(element, ydb.OptionalType):
+        element = ydb.OptionalType(element)
+    return ydb.ListType(element)
+
+
 def _resolve_one(field_type, val):
+    if isinstance(val, _ListParam):
+        items = [
+            (None, None) if v is None else _resolve_one(field_type, v)
+            for v in val.values
+        ]
+        return ([v for v, _ in items], _list_type(field_type, items))
+
     # A DecimalField carries its precision/scale as a ready ydb.DecimalType
     # (checked first: it is unhashable, so it must not reach the ``in`` test
     # below).
@@ -319,54 +428,202 @@ def _decimal_ydb_type(field):
     return None
 
 
+_AUTO_FIELD_TYPES = (
+    models.AutoField,
+    models.SmallAutoField,
+    models.BigAutoField,
+)
+
+# Values bound as integers: a datetime as epoch microseconds (Timestamp64) and a
+# time of day as microseconds since midnight (Int64).
+_INTEGER_CONVERTERS = {
+    "DateTimeField": _datetime_to_epoch_us,
+    "TimeField": _time_to_micros,
+}
+
+
+def _column_converter(field):
+    # The callable preparing one of ``field``'s values for the ``$in_`` payload,
+    # or None when the values pass through unchanged. An int is already
+    # converted (e.g. a value read back from the database), and None is left
+    # for the NOT NULL check.
+    to_integer = _INTEGER_CONVERTERS.get(_get_field_internal_type(field))
+    if to_integer is None:
+        return None
+
+    def convert(val):
+        if val is None or isinstance(val, int):
+            return val
+        return to_integer(val)
+
+    return convert
+
+
 def _get_data(fields, param_rows):
-    result = []
+    """
+    Build the rows of the ``$in_`` List<Struct> parameter of an INSERT/UPSERT.
 
-    auto_field_types = (
-        models.AutoField,
-        models.SmallAutoField,
-        models.BigAutoField,
-    )
-    for i in range(len(param_rows)):
-        struct = {}
-        for j in range(len(fields)):
-            field = fields[j]
-            val = param_rows[i][j]
-            if (
-                val is None
-                and not getattr(field, "null", False)
-                and not isinstance(field, auto_field_types)
-            ):
-                # A NOT NULL column cannot store NULL. Surface it the way Django
-                # expects (IntegrityError) instead of the driver's opaque type
-                # error when it tries to bind None to a non-optional type.
-                msg = f"NOT NULL constraint failed: {field.column}"
-                raise IntegrityError(msg)
-            internal_type = _get_field_internal_type(fields[j])
-            if val is None or isinstance(val, int):
-                struct[fields[j].column] = val
-            elif internal_type == "DateTimeField":
-                struct[fields[j].column] = _datetime_to_epoch_us(val)
-            elif internal_type == "TimeField":
-                struct[fields[j].column] = _time_to_micros(val)
-            else:
-                struct[fields[j].column] = val
-        result.append(struct)
+    The per-column decisions -- the field's internal type, whether it accepts
+    NULL and how its values are converted -- are planned once per statement
+    rather than once per cell, so a large ``bulk_create`` spends its time on
+    the values themselves.
+    """
+    columns = [field.column for field in fields]
+    converters = [
+        (j, convert)
+        for j, field in enumerate(fields)
+        if (convert := _column_converter(field)) is not None
+    ]
+    not_null = [
+        j
+        for j, field in enumerate(fields)
+        if not getattr(field, "null", False)
+        and not isinstance(field, _AUTO_FIELD_TYPES)
+    ]
 
+    result = []
+    for row in param_rows:
+        if not_null and None in row:
+            for j in not_null:
+                if row[j] is None:
+                    # A NOT NULL column cannot store NULL. Surface it the way
+                    # Django expects (IntegrityError) instead of the driver's
+                    # opaque type error when it tries to bind None to a
+                    # non-optional type.
+                    msg = f"NOT NULL constraint failed: {fields[j].column}"
+                    raise IntegrityError(msg)
+        if converters:
+            row = list(row)  # noqa: PLW2901
+            for j, convert in converters:
+                row[j] = convert(row[j])
+        result.append(dict(zip(columns, row, strict=True)))
     return result
 
 
-def _get_data_type(fields):
+# Encoded size in bytes of a value of each fixed-width column type, used to
+# estimate the size of bulk write payloads. Anything not listed (strings,
+# bytes, JSON) is sized by its length; see ``_encoded_len``.
+_FIXED_WIDTHS = {
+    ydb.PrimitiveType.Bool: 1,
+    ydb.PrimitiveType.Int16: 2,
+    ydb.PrimitiveType.Uint16: 2,
+    ydb.PrimitiveType.Int32: 4,
+    ydb.PrimitiveType.Uint32: 4,
+    ydb.PrimitiveType.Float: 4,
+    ydb.PrimitiveType.Date32: 4,
+    ydb.PrimitiveType.Int64: 8,
+    ydb.PrimitiveType.Uint64: 8,
+    ydb.PrimitiveType.Double: 8,
+    ydb.PrimitiveType.Timestamp64: 8,
+    ydb.PrimitiveType.Interval: 8,
+    ydb.PrimitiveType.UUID: 16,
+}
+_DECIMAL_WIDTH = 16
+# Per-value framing (field tag and length prefix) of the encoded message.
+_VALUE_OVERHEAD = 2
+
+
+def _encoded_len(value):
+    if value is None:
+        return 0
+    if isinstance(value, bytes | bytearray):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    # Anything else (a JSON document not yet dumped, a number in a text
+    # column, a lazy string) is sized by its text.
+    if not isinstance(value, str):
+        value = str(value)
+    return len(value) if value.isascii() else len(value.encode())
+
+
+def _batches(fields, rows, max_bytes, max_rows=None):
+    """
+    Split ``$in_`` rows (as built by ``_get_data``) into consecutive batches
+    whose estimated encoded size stays within ``max_bytes``, and, when given,
+    that hold at most ``max_rows`` rows each. A row larger than the budget on
+    its own still forms a batch, so every row is sent.
+
+    Fixed-width columns contribute a constant planned once per statement;
+    only variable-width values are measured row by row.
+    """
+    fixed = _VALUE_OVERHEAD * len(fields)
+    variable = []
+    for field in fields:
+        if _decimal_ydb_type(field) is not None:
+            fixed += _DECIMAL_WIDTH
+            continue
+        width = _FIXED_WIDTHS.get(_ydb_types[_get_field_internal_type(field)])
+        if width is None:
+            variable.append(field.column)
+        else:
+            fixed += width
+
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for row in rows:
+        row_bytes = fixed + sum(_encoded_len(row[column]) for column in variable)
+        if batch and (
+            batch_bytes + row_bytes > max_bytes
+            or (max_rows is not None and len(batch) >= max_rows)
+        ):
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+        batch.append(row)
+        batch_bytes += row_bytes
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _get_row_type(fields):
     struct_type = ydb.StructType()
     for f in fields:
         ydb_type = _decimal_ydb_type(f) or _ydb_types[_get_field_internal_type(f)]
         if getattr(f, "null", False):
             ydb_type = ydb.OptionalType(ydb_type)
         struct_type.add_member(f.column, ydb_type)
-    return ydb.ListType(struct_type)
+    return struct_type
+
+
+def _get_data_type(fields):
+    return ydb.ListType(_get_row_type(fields))
+
+
+class _NativeAsyncMixin:
+    """Serve SELECTs from ``ydb_backend.backend.aio`` during a native async pass."""
+
+    def execute_sql(
+        self,
+        result_type=compiler.MULTI,
+        chunked_fetch=False,
+        chunk_size=compiler.GET_ITERATOR_CHUNK_SIZE,
+    ):
+        if aio.serving():
+            return aio.execute_sql(self, result_type)
+        return super().execute_sql(result_type, chunked_fetch, chunk_size)
+
+
+class _HedgedReadMixin:
+    """Mark the statements of a SELECT compiler as reads that may be hedged."""
+
+    def execute_sql(
+        self,
+        result_type=compiler.MULTI,
+        chunked_fetch=False,
+        chunk_size=compiler.GET_ITERATOR_CHUNK_SIZE,
+    ):
+        if chunked_fetch or result_type not in (compiler.MULTI, compiler.SINGLE):
+            return super().execute_sql(result_type, chunked_fetch, chunk_size)
+        with self.connection.hedged_reads():
+            return super().execute_sql(result_type, chunked_fetch, chunk_size)
 
 
-class SQLCompiler(_ParamTypingMixin, SQLCompiler):
+class SQLCompiler(
+    _NativeAsyncMixin, _HedgedReadMixin, _ParamTypingMixin, SQLCompiler
+):
     def get_order_by(self):
         result = super().get_order_by()
         # Map each selected column's SQL to its alias so an order-by term that
@@ -456,7 +713,21 @@ class SQLCompiler(_ParamTypingMixin, SQLCompiler):
 
         If 'with_limits' is False, any limit/offset information is not included
         in the query.
+
+        With a statement cache configured, a query whose shape was compiled
+        before reuses that YQL text and only binds its new values.
         """
+        cache = getattr(self.connection, "statement_cache", None)
+        cache_key = None
+        if cache is not None:
+            found = fingerprint(self, with_limits, with_col_aliases)
+            if found is not None:
+                cache_key, cache_values = found
+                statement = cache.get(cache_key)
+                if statement is not None:
+                    return self._as_cached_sql(
+                        statement, cache_values, with_col_aliases
+                    )
 
         refcounts_before = self.query.alias_refcount.copy()
         # Per-parameter Django internal field types, kept aligned with ``params``.
@@ -647,11 +918,30 @@ class SQLCompiler(_ParamTypingMixin, SQLCompiler):
                 ph: resolved[i] for i, ph in enumerate(placeholder_rows)
             }
 
+            # Cache only when the fingerprint accounted for every bound value,
+            # so a hit can rebind them positionally.
+            if cache_key is not None and list(params) == cache_values:
+                cache.put(
+                    cache_key,
+                    self.query.get_meta().db_table,
+                    CachedStatement(
+                        sql, placeholder_rows, param_types, self.has_extra_select
+                    ),
+                )
+
             return sql, modified_params
         finally:
             # Finally do cleanup - get rid of the joins we created above.
             self.query.reset_refcounts(refcounts_before)
 
+    def _as_cached_sql(self, statement, values, with_col_aliases):
+        # The select list, klass_info and column count are still needed by the
+        # iterables that consume the results; everything else is in the cache.
+        self.setup_query(with_col_aliases=with_col_aliases)
+        self.has_extra_select = statement.has_extra_select
+        resolved = _resolve_typed_params(statement.param_types, values)
+        return statement.sql, dict(zip(statement.placeholders, resolved, strict=True))
+
     def get_combinator_sql(self, combinator, all_):
         """
         Compose a compound (UNION/...) query under this backend's named
@@ -765,7 +1055,9 @@ class BaseSQLWriteCompiler(compiler.SQLInsertCompiler):
                 expr_columns.append((field, placeholder))
         return value_fields, expr_columns
 
-    def _prepare_sql_statement(self, returning_columns, value_fields, expr_columns):
+    def _prepare_sql_statement(
+        self, returning_columns, value_fields, expr_columns, condition=None
+    ):
         qn = self.connection.ops.quote_name
         opts = self.query.get_meta()
 
@@ -790,6 +1082,8 @@ class BaseSQLWriteCompiler(compiler.SQLInsertCompiler):
         insert_columns += [qn(f.column) for f, _ in expr_columns]
 
         select = f"SELECT {', '.join(select_columns)} FROM AS_TABLE($in_)"
+        if condition:
+            select += f" WHERE {condition}"
         if returning_columns:
             # YDB returns database-generated keys (Serial) in input row order.
             select += f" RETURNING {', '.join(qn(c) for c in returning_columns)}"
@@ -839,13 +1133,27 @@ class BaseSQLWriteCompiler(compiler.SQLInsertCompiler):
     def _get_statement(self):
         raise NotImplementedError("Subclasses must implement this method")
 
-    def as_sql(self, returning_columns=None):
+    def as_sql(self, returning_columns=None, condition=None):
+        """
+        Return ``(sql, params)`` statements writing the rows. ``condition`` is
+        a YQL boolean expression; when given, rows are written only where it
+        holds.
+        """
         value_fields, expr_columns = self._split_fields()
-        sql = self._prepare_sql_statement(
-            returning_columns, value_fields, expr_columns
+        sql = " ".join(
+            self._prepare_sql_statement(
+                returning_columns, value_fields, expr_columns, condition
+            )
         )
-        params = self._prepare_params(value_fields)
-        return [(" ".join(sql), params)]
+        rows, data_type = self._prepare_params(value_fields)["$in_"]
+        # One statement per batch: a large bulk_create would otherwise exceed
+        # YDB's request size limit as a single $in_ list.
+        return [
+            (sql, {"$in_": (batch, data_type)})
+            for batch in _batches(
+                value_fields, rows, self.connection.bulk_batch_bytes
+            )
+        ]
 
     def execute_sql(self, returning_fields=None):
         opts = self.query.get_meta()
@@ -863,36 +1171,47 @@ class BaseSQLWriteCompiler(compiler.SQLInsertCompiler):
         use_returning = bool(returning_fields) and auto_pk and not pk_supplied
         returning_columns = [opts.pk.column] if use_returning else None
 
-        with self.connection.cursor() as cursor:
-            returned = []
-            for sql, params in self.as_sql(returning_columns):
-                cursor.execute(sql, params)
-                if use_returning and cursor.description:
-                    returned = cursor.fetchall()
+        statements = self.as_sql(returning_columns)
+        self.connection.record_write(self.query.model)
+        returned = []
+        # A write that reads nothing back can wait for the transaction's next
+        # statement inside ydb_backend.transaction.atomic(batch_writes=True).
+        if use_returning or not self.connection.defer_writes(statements):
+            # A write split into several statements stays all-or-nothing.
+            in_transaction = (
+                transaction.atomic(using=self.connection.alias, savepoint=False)
+                if len(statements) > 1
+                else nullcontext()
+            )
+            with in_transaction, self.connection.cursor() as cursor:
+                for sql, params in statements:
+                    cursor.execute(sql, params)
+                    if use_returning and cursor.description:
+                        returned.extend(cursor.fetchall())
 
-            if not returning_fields:
-                return []
+        if not returning_fields:
+            return []
 
-            if use_returning:
-                rows = [tuple(row) for row in returned]
-            else:
-                # The PK is already known; echo it back. For an auto field the
-                # value supplied may be a different type than the column stores
-                # (e.g. an integer PK created with a string), so coerce it to
-                # the field's Python type as a database read would.
-                coerce = opts.pk.to_python if auto_pk else (lambda value: value)
-                rows = [
-                    (coerce(self.pre_save_val(opts.pk, obj)),)
-                    for obj in self.query.objs
-                ]
+        if use_returning:
+            rows = [tuple(row) for row in returned]
+        else:
+            # The PK is already known; echo it back. For an auto field the
+            # value supplied may be a different type than the column stores
+            # (e.g. an integer PK created with a string), so coerce it to
+            # the field's Python type as a database read would.
+            coerce = opts.pk.to_python if auto_pk else (lambda value: value)
+            rows = [
+                (coerce(self.pre_save_val(opts.pk, obj)),)
+                for obj in self.query.objs
+            ]
 
-            cols = [field.get_col(opts.db_table) for field in returning_fields]
-            converters = self.get_converters(cols)
+        cols = [field.get_col(opts.db_table) for field in returning_fields]
+        converters = self.get_converters(cols)
 
-            if converters:
-                rows = list(self.apply_converters(rows, converters))
+        if converters:
+            rows = list(self.apply_converters(rows, converters))
 
-            return rows
+        return rows
 
 
 class SQLInsertCompiler(BaseSQLWriteCompiler):
@@ -908,6 +1227,48 @@ class SQLUpsertCompiler(BaseSQLWriteCompiler):
             on_conflict=self.query.on_conflict,
         )
 
+    def execute_bulk_upsert(self, batch_size, max_workers=None):
+        """
+        Write the rows with YDB's BulkUpsert RPC instead of an UPSERT statement.
+
+        The rows are the same typed structs the statement binds as ``$in_``,
+        sent at most ``batch_size`` rows and ``bulk_batch_bytes`` at a time --
+        concurrently over ``max_workers`` threads when given. BulkUpsert is not
+        transactional: each batch is applied on its own, immediately,
+        regardless of any open transaction.
+        """
+        value_fields, expr_columns = self._split_fields()
+        if expr_columns:
+            msg = (
+                "BulkUpsert only writes plain values; columns computed by an "
+                f"expression ({', '.join(f.name for f, _ in expr_columns)}) "
+                "need the UPSERT statement."
+            )
+            raise NotSupportedError(msg)
+        rows, _ = self._prepare_params(value_fields)["$in_"]
+        column_types = _get_row_type(value_fields)
+        table = self.query.get_meta().db_table
+        batches = _batches(
+            value_fields, rows, self.connection.bulk_batch_bytes, batch_size
+        )
+
+        self.connection.ensure_connection()
+        # Not record_write(): BulkUpsert is outside the open transaction.
+        self.connection.note_write()
+        connection = self.connection.connection
+
+        def send(batch):
+            connection.bulk_upsert(table, batch, column_types)
+
+        with self.connection.wrap_database_errors:
+            if max_workers and len(batches) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # list() drains the results so a failed batch re-raises.
+                    list(executor.map(send, batches))
+            else:
+                for batch in batches:
+                    send(batch)
+
 
 class SQLDeleteCompiler(_ParamTypingMixin, compiler.SQLDeleteCompiler):
     def _as_sql(self, query):
@@ -932,6 +1293,7 @@ class SQLDeleteCompiler(_ParamTypingMixin, compiler.SQLDeleteCompiler):
         return sql, modified_params
 
     def execute_sql(self, result_type=compiler.MULTI, *args, **kwargs):
+        self.connection.record_write(self.query.model)
         cursor = super().execute_sql(result_type, *args, **kwargs)
         # Count the RETURNING rows so QuerySet.delete() reports a real number.
         if cursor is not None and getattr(cursor, "rowcount", 0) == -1:
@@ -972,6 +1334,8 @@ class SQLDeleteCompiler(_ParamTypingMixin, compiler.SQLDeleteCompiler):
 
 
 class SQLUpdateCompiler(_ParamTypingMixin, compiler.SQLUpdateCompiler):
+    statement = "UPDATE"
+
     def as_sql(self):
         """
         Create the SQL for this query. Return the SQL string and list of
@@ -1043,7 +1407,7 @@ class SQLUpdateCompiler(_ParamTypingMixin, compiler.SQLUpdateCompiler):
         table = self.query.base_table
 
         result = [
-            f"UPDATE {qn(table)} SET",
+            f"{self.statement} {qn(table)} SET",
             ", ".join(values),
         ]
 
@@ -1060,7 +1424,8 @@ class SQLUpdateCompiler(_ParamTypingMixin, compiler.SQLUpdateCompiler):
         # -1), but it does support RETURNING. Emit the primary key so the real
         # number of updated rows can be counted in execute_sql; this is what
         # Model.save() relies on to decide between UPDATE and INSERT.
-        result.append(f"RETURNING {qn(self.query.model._meta.pk.column)}")
+        if self.statement == "UPDATE":
+            result.append(f"RETURNING {qn(self.query.model._meta.pk.column)}")
 
         sql, params = " ".join(result), tuple(update_params + where_params)
         param_types = set_types + where_types
@@ -1087,13 +1452,39 @@ class SQLUpdateCompiler(_ParamTypingMixin, compiler.SQLUpdateCompiler):
             return 0
         if not sql:
             return 0
+        self.connection.record_write(self.query.model)
         with self.connection.cursor() as cursor:
             cursor.execute(sql, params)
             rows = cursor.fetchall() if cursor.description else []
             return len(rows)
 
 
-class SQLAggregateCompiler(_ParamTypingMixin, SQLAggregateCompiler):
+class SQLBatchUpdateCompiler(SQLUpdateCompiler):
+    """
+    Compile a ``BatchUpdateQuery`` as YDB's ``BATCH UPDATE``: YDB applies it
+    partition by partition in transactions of its own, so it can update any
+    number of rows but is not atomic, and reports no count.
+    """
+
+    statement = "BATCH UPDATE"
+
+    def execute_sql(self, returning_fields=None):
+        if self.connection.in_atomic_block:
+            error_message = "YDB cannot run BATCH UPDATE inside a transaction."
+            raise NotSupportedError(error_message)
+        try:
+            sql, params = self.as_sql()
+        except EmptyResultSet:
+            return
+        if sql:
+            self.connection.note_write()
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql, params)
+
+
+class SQLAggregateCompiler(
+    _NativeAsyncMixin, _HedgedReadMixin, _ParamTypingMixin, SQLAggregateCompiler
+):
     def as_sql(self):
         """
         Compile a terminal aggregate query (``QuerySet.aggregate``) under this
@@ -1,4 +1,5 @@
 from django.db.models.sql import InsertQuery
+from django.db.models.sql import UpdateQuery
 
 
 class UpsertQuery(InsertQuery):
@@ -12,3 +13,17 @@ class UpsertQuery(InsertQuery):
     """
 
     compiler = "SQLUpsertCompiler"
+
+
+class BatchUpdateQuery(UpdateQuery):
+    """An UPDATE compiled with YDB's ``BATCH UPDATE`` statement.
+
+    ``BATCH UPDATE`` runs outside transactions and updates a table partition
+    by partition, each part committed on its own, so it suits updates of more
+    rows than one transaction may write. A failed statement may leave part of
+    the rows updated; rerunning an update that is idempotent (one whose WHERE
+    excludes the rows already updated) finishes it. Compiled by
+    ``SQLBatchUpdateCompiler``.
+    """
+
+    compiler = "SQLBatchUpdateCompiler"
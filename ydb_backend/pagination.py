@@ -0,0 +1,184 @@
+"""
+Keyset (cursor) pagination for YDB querysets.
+
+``django.core.paginator.Paginator`` pages with ``LIMIT``/``OFFSET``: YDB has to
+read and throw away every row before the offset, so deep pages get slower and
+more expensive the further in they are. ``KeysetPaginator`` instead remembers
+the sort key of the first and last row of a page in an opaque cursor and asks
+for the rows after (or before) it, which YDB serves as a key range read.
+"""
+import base64
+import json
+
+from django.core.paginator import EmptyPage
+from django.core.paginator import InvalidPage
+from django.core.paginator import Page
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.functional import cached_property
+
+from .models.query import keyset_fields
+from .models.query import seek
+
+_NEXT = "n"
+_PREVIOUS = "p"
+
+
+class KeysetPage(Page):
+    """
+    A page of a ``KeysetPaginator``; its "page numbers" are cursors.
+
+    ``offset`` is the number of rows before the page, carried in the cursors
+    as the pages are walked; rows written meanwhile are not accounted for.
+    """
+
+    def __init__(
+        self, object_list, paginator, next_cursor, previous_cursor, offset=0
+    ):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.offset = offset
+
+    def __repr__(self):
+        return f"<Keyset page of {len(self.object_list)}>"
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def next_page_number(self):
+        if self.next_cursor is None:
+            msg = "That page contains no results"
+            raise EmptyPage(msg)
+        return self.next_cursor
+
+    def previous_page_number(self):
+        if self.previous_cursor is None:
+            msg = "That page is the first page"
+            raise EmptyPage(msg)
+        return self.previous_cursor
+
+    def start_index(self):
+        """The 1-based position of the page's first row; 0 if it is empty."""
+        return self.offset + 1 if self.object_list else 0
+
+    def end_index(self):
+        """The 1-based position of the page's last row."""
+        return self.offset + len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate ``object_list`` by ``keys`` without ``OFFSET``.
+
+    ``keys`` are the ordering fields, all ascending or all descending; the
+    primary key is appended when missing so the order is total. Each page is
+    fetched with a single ``WHERE (keys) > (cursor) ORDER BY keys LIMIT n``.
+    Pages are addressed by the cursors of ``KeysetPage`` rather than numbers,
+    and there is no ``count``, ``num_pages`` or ``page_range``: counting would
+    scan the table this paginator exists to avoid scanning. This is not a
+    ``django.core.paginator.Paginator`` subclass and does not stand in for one.
+    """
+
+    def __init__(self, object_list, per_page, keys=("pk",)):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        if self.per_page < 1:
+            msg = "per_page must be a positive integer."
+            raise ValueError(msg)
+        model = object_list.model
+        keys = list(keys)
+        fields, descending = keyset_fields(model, keys)
+        pk = model._meta.pk
+        if all(field != pk for _, field in fields):
+            keys.append("-pk" if descending else "pk")
+            fields, descending = keyset_fields(model, keys)
+        self.keys = tuple(keys)
+        self.fields = fields
+
+    @cached_property
+    def _attnames(self):
+        return [field.attname for _, field in self.fields]
+
+    def encode_cursor(self, obj, direction=_NEXT, offset=0):
+        """
+        Return the cursor of the rows after (or before) ``obj``, ``offset``
+        being the number of rows before the position it names.
+        """
+        values = [getattr(obj, attname) for attname in self._attnames]
+        payload = json.dumps(
+            [direction, values, offset], cls=DjangoJSONEncoder, separators=(",", ":")
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+        Return ``(direction, key values, offset)``; raise InvalidPage if
+        malformed.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, values, offset = json.loads(base64.urlsafe_b64decode(padded))
+            if (
+                direction not in (_NEXT, _PREVIOUS)
+                or len(values) != len(self.fields)
+                or not isinstance(offset, int)
+                or offset < 0
+            ):
+                raise ValueError  # noqa: TRY301
+            values = tuple(
+                field.to_python(value)
+                for (_, field), value in zip(self.fields, values, strict=True)
+            )
+        except (TypeError, ValueError, ArithmeticError) as e:
+            msg = "Invalid page cursor"
+            raise InvalidPage(msg) from e
+        return direction, values, offset
+
+    def page(self, cursor=None):
+        """Return the first page, or the page a ``KeysetPage`` cursor names."""
+        direction, values, offset = (
+            self.decode_cursor(cursor) if cursor else (_NEXT, None, 0)
+        )
+        backwards = direction == _PREVIOUS
+        queryset = seek(
+            self.object_list,
+            self.keys,
+            **{"before" if backwards else "after": values},
+        )
+        rows = list(queryset[: self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+            # Going back from a page, there is always a next page (it).
+            has_next, has_previous = bool(rows), more
+            # The cursor's offset is where the page it was taken from starts.
+            offset = max(offset - len(rows), 0) if more else 0
+        else:
+            has_next, has_previous = more, values is not None
+        if not rows:
+            if values is None:
+                return KeysetPage(rows, self, None, None)
+            msg = "That page contains no results"
+            raise EmptyPage(msg)
+        return KeysetPage(
+            rows,
+            self,
+            (
+                self.encode_cursor(rows[-1], _NEXT, offset + len(rows))
+                if has_next
+                else None
+            ),
+            self.encode_cursor(rows[0], _PREVIOUS, offset) if has_previous else None,
+            offset,
+        )
+
+    def get_page(self, cursor=None):
+        """Like ``page()``, but fall back to the first page on a bad cursor."""
+        try:
+            return self.page(cursor)
+        except InvalidPage:
+            return self.page()
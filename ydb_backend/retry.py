@@ -27,17 +27,193 @@ replayed::
         with transaction.atomic():
             ...
 
+Async code uses ``aretry_ydb_operation()`` / ``@aretry_ydb_errors()``, which
+follow ``ydb.retry_operation_async`` and back off with ``asyncio.sleep()``.
+
 To observe retries (e.g. for metrics), set ``on_ydb_error_callback`` on a
 ``ydb.RetrySettings`` and pass it as ``retry_settings`` — the SDK calls it for
 every YDB error it sees while retrying.
+
+During an outage every caller retrying at full strength multiplies the load on
+the nodes that are left. A shared :class:`RetryBudget` caps retries to a
+fraction of the successful calls, and a shared :class:`CircuitBreaker` fails
+calls fast while the cluster keeps answering ``Unavailable`` / ``Overloaded``::
+
+    budget = RetryBudget(ratio=0.1)
+    breaker = CircuitBreaker()
+
+    @retry_ydb_errors(idempotent=True, budget=budget, breaker=breaker)
+    def transfer():
+        ...
 """
 
 import functools
+import inspect
+import threading
+import time
 
 import ydb
+from asgiref.sync import sync_to_async
 from django.db import Error as DjangoDatabaseError
+from django.db import OperationalError
 from django.db import connections
 from django.db.utils import DEFAULT_DB_ALIAS
+from ydb.retries import check_retriable_error
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(OperationalError):
+    """Raised instead of calling the operation while the breaker is open."""
+
+
+class RetryBudget:
+    """Token bucket that allows retries as a fraction of successful calls.
+
+    Every successful call deposits ``ratio`` tokens and every retry withdraws
+    one, so in steady state at most ``ratio`` retries are made per success. The
+    bucket starts full and holds at most ``capacity`` tokens: a burst of that
+    many retries is allowed after a quiet period, while a sustained outage,
+    where nothing succeeds, drains it and stops the retries. A retry the budget
+    refuses re-raises the error of the failed attempt. Share one instance
+    between the calls that should draw from the same budget; it is thread-safe.
+
+    The counters are ``attempts`` (calls of the operation, retries included),
+    ``retries`` and ``rejected`` (retries refused).
+    """
+
+    def __init__(self, ratio=0.1, capacity=10):
+        if ratio < 0 or capacity < 1:
+            msg = "RetryBudget needs ratio >= 0 and capacity >= 1."
+            raise ValueError(msg)
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.rejected = 0
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+    def record_attempt(self):
+        with self._lock:
+            self.attempts += 1
+
+    def deposit(self):
+        """Credit a successful call."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """Take the token for one retry; return False when there is none."""
+        with self._lock:
+            if self._tokens < 1:
+                self.rejected += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+
+class CircuitBreaker:
+    """Fail calls fast while the cluster keeps returning outage errors.
+
+    Failures are counted per error class among ``error_classes`` (by default
+    the ``ydb.issues`` errors of an unreachable or overloaded cluster, not
+    transaction conflicts): ``failure_threshold`` consecutive failures of one
+    class open the breaker for that class. While any class is open, calls
+    raise :class:`CircuitOpenError` without running. After ``reset_timeout``
+    seconds the class is half-open and lets a single trial call through: its
+    success closes the breaker, another failure of that class opens it again.
+    Share one instance between the calls guarded together; it is thread-safe.
+
+    ``states()`` maps each error class seen to ``"closed"``, ``"open"`` or
+    ``"half-open"``; ``rejected`` counts the calls refused.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=5,
+        reset_timeout=30.0,
+        error_classes=(
+            ydb.issues.Unavailable,
+            ydb.issues.Overloaded,
+            ydb.issues.ConnectionError,
+            ydb.issues.DeadlineExceed,
+            ydb.issues.SessionPoolEmpty,
+        ),
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.error_classes = tuple(error_classes)
+        self._lock = threading.Lock()
+        # error class -> [consecutive failures, opened at, trial started at]
+        self._circuits = {}
+        self.rejected = 0
+
+    def _state(self, circuit, now):
+        _, opened_at, _ = circuit
+        if opened_at is None:
+            return CLOSED
+        if now - opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def states(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                error_class: self._state(circuit, now)
+                for error_class, circuit in self._circuits.items()
+            }
+
+    def allow(self):
+        """Whether a call may run now; a half-open class admits one trial."""
+        now = time.monotonic()
+        with self._lock:
+            trials = []
+            for circuit in self._circuits.values():
+                state = self._state(circuit, now)
+                # A trial that never reported back is given up after
+                # reset_timeout, so the breaker cannot stay half-open for good.
+                trial_running = (
+                    circuit[2] is not None and now - circuit[2] < self.reset_timeout
+                )
+                if state == OPEN or (state == HALF_OPEN and trial_running):
+                    self.rejected += 1
+                    return False
+                if state == HALF_OPEN:
+                    trials.append(circuit)
+            for circuit in trials:
+                circuit[2] = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._circuits = {
+                error_class: [0, None, None] for error_class in self._circuits
+            }
+
+    def record_failure(self, error):
+        """Count a failed call with the ``ydb.issues`` error ``error``."""
+        error_class = next(
+            (cls for cls in self.error_classes if isinstance(error, cls)), None
+        )
+        with self._lock:
+            # Not an outage, e.g. a conflict, leaves the counts alone: the
+            # cluster did answer. Either way a running trial is over.
+            if error_class is not None:
+                circuit = self._circuits.setdefault(error_class, [0, None, None])
+                circuit[0] += 1
+                if circuit[0] >= self.failure_threshold:
+                    circuit[1] = time.monotonic()
+            for circuit in self._circuits.values():
+                circuit[2] = None
 
 
 def unwrap_ydb_error(exc):
@@ -61,6 +237,73 @@ def unwrap_ydb_error(exc):
     return None
 
 
+class _Attempts:
+    """Bookkeeping shared by the attempts of one retried call."""
+
+    def __init__(self, settings, on_error, budget, breaker):
+        self.settings = settings
+        self.on_error = on_error
+        self.budget = budget
+        self.breaker = breaker
+        self.captured = None
+        self.retries = 0
+
+    def start(self):
+        if self.breaker is not None and not self.breaker.allow():
+            msg = "Circuit breaker is open: the YDB cluster keeps failing."
+            raise CircuitOpenError(msg) from self.captured
+        if self.budget is not None:
+            self.budget.record_attempt()
+
+    def succeeded(self):
+        if self.budget is not None:
+            self.budget.deposit()
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def failed(self, exc):
+        """
+        Return the ``ydb.issues`` error to hand to the SDK policy for a failed
+        attempt, or None when ``exc`` must propagate as is.
+        """
+        self.captured = exc
+        if self.on_error is not None:
+            self.on_error(exc)
+        ydb_error = unwrap_ydb_error(exc)
+        if ydb_error is None:
+            return None
+        if self.breaker is not None:
+            self.breaker.record_failure(ydb_error)
+        # The SDK makes no retry after the last attempt: take no token for it.
+        if (
+            self.budget is not None
+            and self.retries < self.settings.max_retries
+            and check_retriable_error(
+                ydb_error, self.settings, self.retries
+            ).is_retriable
+            and not self.budget.withdraw()
+        ):
+            return None
+        self.retries += 1
+        return ydb_error
+
+    def raise_captured(self):
+        # Retries exhausted or the error was non-retriable: surface the original
+        # Django exception type, not the unwrapped SDK error.
+        if self.captured is not None:
+            raise self.captured from self.captured.__cause__
+
+
+def _settings(retry_settings, idempotent):
+    if retry_settings is not None:
+        return retry_settings
+    return ydb.RetrySettings(idempotent=idempotent)
+
+
+def _close_if_unusable(using):
+    connections[using].close_if_unusable_or_obsolete()
+
+
 def retry_ydb_operation(
     func,
     *,
@@ -68,6 +311,8 @@ def retry_ydb_operation(
     retry_settings=None,
     using=DEFAULT_DB_ALIAS,
     on_error=None,
+    budget=None,
+    breaker=None,
 ):
     """Call ``func`` and retry it under the native YDB retry policy.
 
@@ -87,55 +332,129 @@ def retry_ydb_operation(
     next attempt while a healthy pooled one is kept; pass ``using=None`` to skip
     this. ``on_error`` is called with the caught Django exception after that, for
     any extra handling.
+
+    ``budget`` (a :class:`RetryBudget`) must grant each retry, and ``breaker``
+    (a :class:`CircuitBreaker`) each attempt: a refused retry re-raises the
+    last error and a refused attempt raises :class:`CircuitOpenError`.
     """
-    settings = (
-        retry_settings
-        if retry_settings is not None
-        else ydb.RetrySettings(idempotent=idempotent)
-    )
-    captured = None
+    settings = _settings(retry_settings, idempotent)
+    attempts = _Attempts(settings, on_error, budget, breaker)
 
     def callee():
-        nonlocal captured
+        attempts.start()
         try:
-            return func()
+            result = func()
         except DjangoDatabaseError as exc:
-            captured = exc
             if using is not None:
-                connections[using].close_if_unusable_or_obsolete()
-            if on_error is not None:
-                on_error(exc)
-            ydb_error = unwrap_ydb_error(exc)
+                _close_if_unusable(using)
+            ydb_error = attempts.failed(exc)
             if ydb_error is None:
                 raise
             raise ydb_error from exc
+        attempts.succeeded()
+        return result
 
     try:
         return ydb.retry_operation_sync(callee, settings)
     except ydb.Error:
-        # Retries exhausted or the error was non-retriable: surface the original
-        # Django exception type, not the unwrapped SDK error.
-        if captured is not None:
-            raise captured from captured.__cause__
+        attempts.raise_captured()
+        raise
+
+
+async def aretry_ydb_operation(
+    func,
+    *,
+    idempotent=False,
+    retry_settings=None,
+    using=DEFAULT_DB_ALIAS,
+    on_error=None,
+    budget=None,
+    breaker=None,
+):
+    """Async :func:`retry_ydb_operation`: await ``func()`` and retry it.
+
+    ``func`` returns an awaitable, e.g. a coroutine function using the ORM's
+    ``a*`` methods or ``sync_to_async``. Retries follow
+    ``ydb.retry_operation_async``, which backs off with ``asyncio.sleep()`` and
+    so never blocks the event loop. The connection check between attempts runs
+    in the thread ``sync_to_async`` runs the ORM in, where the connection
+    lives. The other arguments are those of :func:`retry_ydb_operation`.
+    """
+    settings = _settings(retry_settings, idempotent)
+    attempts = _Attempts(settings, on_error, budget, breaker)
+
+    async def callee():
+        attempts.start()
+        try:
+            result = await func()
+        except DjangoDatabaseError as exc:
+            if using is not None:
+                await sync_to_async(_close_if_unusable)(using)
+            ydb_error = attempts.failed(exc)
+            if ydb_error is None:
+                raise
+            raise ydb_error from exc
+        attempts.succeeded()
+        return result
+
+    try:
+        return await ydb.retry_operation_async(callee, settings)
+    except ydb.Error:
+        attempts.raise_captured()
         raise
 
 
 def retry_ydb_errors(
-    *, idempotent=False, retry_settings=None, using=DEFAULT_DB_ALIAS, on_error=None
+    *,
+    idempotent=False,
+    retry_settings=None,
+    using=DEFAULT_DB_ALIAS,
+    on_error=None,
+    budget=None,
+    breaker=None,
 ):
-    """Decorator form of :func:`retry_ydb_operation`."""
+    """Decorator form of :func:`retry_ydb_operation`.
+
+    Decorating a coroutine function retries it with
+    :func:`aretry_ydb_operation` instead.
+    """
+    options = {
+        "idempotent": idempotent,
+        "retry_settings": retry_settings,
+        "using": using,
+        "on_error": on_error,
+        "budget": budget,
+        "breaker": breaker,
+    }
 
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await aretry_ydb_operation(
+                    lambda: func(*args, **kwargs), **options
+                )
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            return retry_ydb_operation(
-                lambda: func(*args, **kwargs),
-                idempotent=idempotent,
-                retry_settings=retry_settings,
-                using=using,
-                on_error=on_error,
-            )
+            return retry_ydb_operation(lambda: func(*args, **kwargs), **options)
 
         return wrapper
 
     return decorator
+
+
+def aretry_ydb_errors(**kwargs):
+    """Decorator form of :func:`aretry_ydb_operation`, for coroutine functions."""
+    decorator = retry_ydb_errors(**kwargs)
+
+    def async_decorator(func):
+        if not inspect.iscoroutinefunction(func):
+            msg = "aretry_ydb_errors() decorates coroutine functions only."
+            raise TypeError(msg)
+        return decorator(func)
+
+    return async_decorator
@@ -0,0 +1,225 @@
+"""
+Route reads to read-only aliases of the same YDB database.
+
+A second ``DATABASES`` alias pointed at the primary's database with a
+read-only ``isolation_level`` serves reads more cheaply: ``stale readonly``
+may answer from any replica, and ``online readonly`` skips the serializable
+read-write transaction. ``ReadReplicaRouter`` finds such aliases by their
+settings and sends reads to them. Reads go to the primary instead inside a
+``transaction.atomic()`` block, and after the current request has written.
+``ReadReplicaMiddleware`` scopes that read-your-writes tracking to a request,
+``read_your_writes()`` to any other unit of work (a task, a command), and
+``read_consistency()`` lets a view or block ask for a consistency level::
+
+    DATABASE_ROUTERS = ["ydb_backend.routers.ReadReplicaRouter"]
+    MIDDLEWARE = [..., "ydb_backend.routers.ReadReplicaMiddleware"]
+
+    @read_consistency("strong")
+    def checkout(request): ...
+"""
+import contextvars
+import functools
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .backend.base import Database
+from .backend.base import _normalize_isolation_level
+from .backend.base import _written_aliases
+from .backend.base import written_aliases
+
+STRONG = "strong"
+ONLINE = "online"
+STALE = "stale"
+
+# Aliases a consistency level may read from, most preferred first; the
+# primary is the last resort of every level.
+_CANDIDATES = {STALE: (STALE, ONLINE), ONLINE: (ONLINE,), STRONG: ()}
+_REPLICA_LEVELS = {
+    Database.IsolationLevel.STALE_READONLY: STALE,
+    Database.IsolationLevel.ONLINE_READONLY: ONLINE,
+}
+_SAME_DATABASE = ("ENGINE", "HOST", "PORT", "DATABASE")
+
+_consistency = contextvars.ContextVar("ydb_read_consistency", default=None)
+
+
+def discover_replicas(databases, primary=DEFAULT_DB_ALIAS):
+    """
+    Return ``{level: alias}`` of the read-only aliases in ``databases`` (a
+    ``DATABASES`` dict) that point at the same database as ``primary``.
+    """
+    primary_settings = databases[primary]
+    replicas = {}
+    for alias, settings_dict in databases.items():
+        if alias == primary or any(
+            settings_dict.get(key) != primary_settings.get(key)
+            for key in _SAME_DATABASE
+        ):
+            continue
+        isolation_level = settings_dict.get("OPTIONS", {}).get("isolation_level")
+        if isolation_level is None:
+            continue
+        level = _REPLICA_LEVELS.get(_normalize_isolation_level(isolation_level))
+        if level is not None:
+            replicas.setdefault(level, alias)
+    return replicas
+
+
+class read_consistency:  # noqa: N801
+    """
+    Set the consistency level of the reads routed by ``ReadReplicaRouter``,
+    as a decorator (sync or async views) or a context manager:
+
+    - ``"strong"``: read from the primary;
+    - ``"online"``: an ``online readonly`` alias, else the primary;
+    - ``"stale"``: a ``stale readonly`` alias, else an ``online readonly``
+      one, else the primary.
+    """
+
+    def __init__(self, level):
+        if level not in _CANDIDATES:
+            msg = f"level must be one of {', '.join(_CANDIDATES)}, not {level!r}."
+            raise ValueError(msg)
+        self.level = level
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_consistency.set(self.level))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _consistency.reset(self._tokens.pop())
+
+    def __call__(self, func):
+        if iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def inner(*args, **kwargs):
+                with read_consistency(self.level):
+                    return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def inner(*args, **kwargs):
+                with read_consistency(self.level):
+                    return func(*args, **kwargs)
+
+        return inner
+
+
+class read_your_writes:  # noqa: N801
+    """
+    Track the writes made by the ORM afresh for a unit of work, as a decorator
+    (sync or async) or a context manager: reads go to the primary after its
+    first write through the primary, and the tracking around it is restored
+    on exit. ``ReadReplicaMiddleware`` does this for every request; use it for
+    work outside requests, such as a task queue's tasks.
+
+    Without it, the tracking is scoped to the thread or task: after its first
+    write, every later read of the thread goes to the primary.
+    """
+
+    def __init__(self):
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_written_aliases.set(set()))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _written_aliases.reset(self._tokens.pop())
+
+    def __call__(self, func):
+        if iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def inner(*args, **kwargs):
+                with read_your_writes():
+                    return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def inner(*args, **kwargs):
+                with read_your_writes():
+                    return func(*args, **kwargs)
+
+        return inner
+
+
+class ReadReplicaRouter:
+    """
+    Send reads to the read-only aliases of the primary's database.
+
+    ``primary`` names the read-write alias and ``default_consistency`` the
+    level of reads outside ``read_consistency()``; subclass to change them.
+    """
+
+    primary = DEFAULT_DB_ALIAS
+    default_consistency = STALE
+
+    @cached_property
+    def replicas(self):
+        return discover_replicas(connections.settings, self.primary)
+
+    def db_for_read(self, model, **hints):
+        level = _consistency.get() or self.default_consistency
+        if (
+            level == STRONG
+            or self.primary in written_aliases()
+            or connections[self.primary].in_atomic_block
+        ):
+            return self.primary
+        for candidate in _CANDIDATES[level]:
+            if candidate in self.replicas:
+                return self.replicas[candidate]
+        return self.primary
+
+    def db_for_write(self, model, **hints):
+        # Only a write that is sent counts (see DatabaseWrapper.note_write):
+        # Django also asks here, e.g., to pick the alias of a get_or_create()
+        # that finds its row.
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {self.primary, *self.replicas.values()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replicas are the primary's database: migrate it once, there.
+        if db in self.replicas.values():
+            return False
+        return None
+
+
+class ReadReplicaMiddleware:
+    """
+    Scope ``ReadReplicaRouter``'s read-your-writes tracking to a request:
+    reads go to the primary after the request's first write, and the next
+    request starts over.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with read_your_writes():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with read_your_writes():
+            return await self.get_response(request)
@@ -0,0 +1,77 @@
+"""
+``transaction.atomic()`` with YDB transaction modes.
+
+Django's ``atomic()`` opens an interactive serializable read-write transaction,
+which takes optimistic locks on everything it reads and may abort at commit
+when another transaction touched those rows. A block that only reads can
+instead run in a snapshot read-only transaction: every statement sees the
+same consistent snapshot, nothing is locked, and the commit cannot conflict::
+
+    from ydb_backend import transaction
+
+    with transaction.atomic(read_only=True):
+        totals = Order.objects.aggregate(Sum("amount"))
+        recent = list(Order.objects.order_by("-created")[:10])
+
+A block that mostly writes can buffer its writes instead: with
+``batch_writes=True`` the inserts and upserts that read nothing back are sent
+together with the transaction's next statement, or with its commit as one
+request::
+
+    with transaction.atomic(batch_writes=True):
+        order = Order.objects.create(id=uuid4(), customer=customer)
+        OrderLine.objects.bulk_create(lines)
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+
+
+class Atomic(transaction.Atomic):
+    """
+    Django's ``Atomic`` that can open the outermost transaction in snapshot
+    read-only mode, or buffer its writes. Nested blocks join the enclosing
+    transaction, whatever its mode.
+    """
+
+    def __init__(self, using, savepoint, durable, read_only, batch_writes):
+        super().__init__(using, savepoint, durable)
+        self.read_only = read_only
+        self.batch_writes = batch_writes
+
+    def __enter__(self):
+        connection = transaction.get_connection(self.using)
+        if connection.in_atomic_block:
+            return super().__enter__()
+        connection._begin_read_only = self.read_only
+        try:
+            super().__enter__()
+        finally:
+            connection._begin_read_only = False
+        if self.batch_writes:
+            connection._write_buffer = []
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        connection = transaction.get_connection(self.using)
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            if not connection.in_atomic_block:
+                connection._write_buffer = None
+
+
+def atomic(
+    using=None, savepoint=True, durable=False, read_only=False, batch_writes=False
+):
+    """
+    Like ``django.db.transaction.atomic``; ``read_only=True`` runs the block
+    in a snapshot read-only transaction, where YDB rejects writes, and
+    ``batch_writes=True`` buffers the block's blind writes until its next
+    statement or commit.
+    """
+    # Bare decorator: @atomic. Django's atomic() accepts the same.
+    if callable(using):
+        return Atomic(
+            DEFAULT_DB_ALIAS, savepoint, durable, read_only, batch_writes
+        )(using)
+    return Atomic(using, savepoint, durable, read_only, batch_writes)